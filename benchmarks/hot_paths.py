@@ -0,0 +1,286 @@
+"""Benchmarks of the client's hot paths, run offline against the in-memory fake API.
+
+Every benchmark reports the best time per operation of several rounds. Times are compared with
+the stored baseline after normalizing both by a calibration loop, so a baseline recorded on
+another machine still gives meaningful ratios. The run fails when a benchmark is slower than
+its baseline by more than the threshold.
+
+Usage:
+    python benchmarks/hot_paths.py                   # Run and compare with the baseline
+    python benchmarks/hot_paths.py --filter models   # Only the benchmarks matching a text
+    python benchmarks/hot_paths.py --save --runs 3   # Store the results as the new baseline
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from typing import Callable, Dict, NamedTuple
+
+from facturapi import Facturapi
+from facturapi.models import (
+    CustomerList,
+    ProductList,
+    build_customer,
+    build_item_list,
+    build_product,
+)
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Maximum slowdown over the baseline, e.g. 0.3 fails benchmarks 30% slower
+DEFAULT_THRESHOLD = 0.3
+
+
+class Benchmark(NamedTuple):
+    """Benchmark function and the work done by each call"""
+
+    name: str
+    setup: Callable[[], Callable[[], None]]
+    description: str
+    # Thresholds of benchmarks with more variance, e.g. the ones that move large buffers
+    threshold: float = None
+
+
+def calibrate() -> None:
+    """Pure Python workload that measures the speed of the interpreter and the machine"""
+    data = {}
+    for number in range(2000):
+        data[f"key{number}"] = [number, str(number), number * 0.5]
+    sorted(data.items(), key=lambda item: item[1][1])
+
+
+def make_server(**kwargs) -> FakeFacturapi:
+    """Fake API with 50 customers, 50 products and 1000 invoices"""
+    server = FakeFacturapi(seed=0, **kwargs)
+    server.populate(customers=50, products=50, invoices=1000)
+    return server
+
+
+def make_api(server: FakeFacturapi) -> Facturapi:
+    """Client that sends its requests to the fake API"""
+    return Facturapi("sk_test_benchmark", transport=FakeTransport(server))
+
+
+def get_page(server: FakeFacturapi, resource: str) -> dict:
+    """List response with the first 50 records of a resource"""
+    data = list(server.records[resource].values())[:50]
+    return {"page": 1, "total_pages": 1, "total_results": len(data), "data": data}
+
+
+def setup_build_customer():
+    """Measures building a Customer from its JSON"""
+    customer = get_page(make_server(), "customers")["data"][0]
+    return lambda: build_customer(customer)
+
+
+def setup_build_product():
+    """Measures building a Product from its JSON"""
+    product = get_page(make_server(), "products")["data"][0]
+    return lambda: build_product(product)
+
+
+def setup_build_customer_list():
+    """Measures building a CustomerList from a page of 50 customers"""
+    page = get_page(make_server(), "customers")
+    return lambda: build_item_list(page, CustomerList)
+
+
+def setup_build_product_list():
+    """Measures building a ProductList from a page of 50 products"""
+    page = get_page(make_server(), "products")
+    return lambda: build_item_list(page, ProductList)
+
+
+def setup_build_product_list_lazy():
+    """Measures building a ProductList of lazy products from a page of 50"""
+    page = get_page(make_server(), "products")
+    return lambda: build_item_list(page, ProductList, lazy=True)
+
+
+def setup_request_url():
+    """Measures building the URL of an invoice download"""
+    client = make_api(FakeFacturapi()).invoices
+    return lambda: client._get_request_url(  # pylint: disable=protected-access
+        ["5f3a1c2b4d6e8f0a1b2c3d4e", "pdf"]
+    )
+
+
+def setup_list_params():
+    """Measures building the query parameters of a list request"""
+    client = make_api(FakeFacturapi()).invoices
+    return lambda: client._get_list_params(  # pylint: disable=protected-access
+        search="PÚBLICO", page=3, limit=50
+    )
+
+
+def setup_execute_request():
+    """Measures a request through the client stack, without latency"""
+    server = FakeFacturapi()
+    client = make_api(server).healthcheck
+    url = client._get_request_url()  # pylint: disable=protected-access
+    # pylint: disable-next=protected-access
+    return lambda: client._execute_request("GET", url)
+
+
+def setup_retrieve_customer():
+    """Measures retrieving a customer, from the request to the model"""
+    server = make_server()
+    api = make_api(server)
+    customer_id = next(iter(server.records["customers"]))
+    return lambda: api.customers.retrieve(customer_id)
+
+
+def setup_iter_all():
+    """Measures listing 1000 invoices page by page"""
+    api = make_api(make_server())
+    return lambda: sum(1 for _ in api.invoices.iter_all())
+
+
+def setup_iter_all_concurrent():
+    """Measures listing 1000 invoices with 8 workers and 2 ms pages"""
+    api = make_api(make_server(latency=0.002))
+    return lambda: sum(1 for _ in api.invoices.iter_all(max_workers=8))
+
+
+def setup_download_pdf():
+    """Measures downloading an 8 MiB PDF into memory"""
+    server = make_server(download_size=8 * 1024 * 1024)
+    api = make_api(server)
+    invoice_id = next(iter(server.records["invoices"]))
+    return lambda: api.invoices.download_pdf(invoice_id)
+
+
+def setup_download_to():
+    """Measures streaming an 8 MiB PDF to a file object"""
+    server = make_server(download_size=8 * 1024 * 1024)
+    api = make_api(server)
+    invoice_id = next(iter(server.records["invoices"]))
+    return lambda: api.invoices.download_to(invoice_id, "pdf", io.BytesIO())
+
+
+BENCHMARKS = (
+    Benchmark("models.build_customer", setup_build_customer, "1 customer"),
+    Benchmark("models.build_product", setup_build_product, "1 product"),
+    Benchmark("models.build_customer_list", setup_build_customer_list, "50 customers"),
+    Benchmark("models.build_product_list", setup_build_product_list, "50 products"),
+    Benchmark(
+        "models.build_product_list_lazy", setup_build_product_list_lazy, "50 products"
+    ),
+    Benchmark("http.request_url", setup_request_url, "1 URL"),
+    Benchmark("http.list_params", setup_list_params, "1 query"),
+    Benchmark("http.execute_request", setup_execute_request, "1 request, no latency"),
+    Benchmark("http.retrieve_customer", setup_retrieve_customer, "1 request and model"),
+    Benchmark("pagination.iter_all", setup_iter_all, "1000 invoices, 20 pages"),
+    Benchmark(
+        "pagination.iter_all_concurrent",
+        setup_iter_all_concurrent,
+        "1000 invoices, 20 pages of 2 ms, 8 workers",
+        threshold=0.5,
+    ),
+    Benchmark("download.pdf", setup_download_pdf, "8 MiB in memory", threshold=0.5),
+    Benchmark("download.download_to", setup_download_to, "8 MiB in 64 KiB chunks", 0.5),
+)
+
+
+def measure(function: Callable[[], None], rounds: int, min_time: float, runs: int) -> float:
+    """Returns the best seconds per call of several rounds of at least min_time seconds, or the
+    median of the best times of several runs
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    best_times = [
+        min(timer.repeat(repeat=rounds, number=number)) / number for _ in range(runs)
+    ]
+    return statistics.median(best_times)
+
+
+def format_time(seconds: float) -> str:
+    """Formats seconds with the largest unit that keeps them above 1"""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:7.2f} {unit}"
+    return f"{seconds / 1e-9:7.0f} ns"
+
+
+def load_baseline(path: str) -> dict:
+    """Reads the stored baseline, or None if there is none yet"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(path: str, calibration: float, results: Dict[str, float]) -> None:
+    """Stores the calibration and the results as the new baseline"""
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration": calibration,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+        file.write("\n")
+
+
+def main() -> int:
+    """Runs the benchmarks and compares them with the baseline
+
+    Returns:
+        int: Exit status, 1 if a benchmark regressed
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filter", default="", help="Only the benchmarks matching")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.1, help="Seconds per round")
+    parser.add_argument("--runs", type=int, default=1, help="Median of this many runs")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="Store as the baseline")
+    args = parser.parse_args()
+
+    calibration = measure(calibrate, args.rounds, args.min_time, args.runs)
+    baseline = None if args.save else load_baseline(args.baseline)
+    scale = calibration / baseline["calibration"] if baseline else 1
+    print(f"Calibration: {format_time(calibration)} ({scale:.2f}x the baseline)")
+
+    results = {}
+    regressions = []
+    for benchmark in BENCHMARKS:
+        if args.filter not in benchmark.name:
+            continue
+        seconds = measure(benchmark.setup(), args.rounds, args.min_time, args.runs)
+        results[benchmark.name] = seconds
+        line = f"{benchmark.name:<34} {format_time(seconds)}  {benchmark.description}"
+
+        expected = baseline and baseline["results"].get(benchmark.name)
+        if expected:
+            ratio = seconds / (expected * scale)
+            threshold = benchmark.threshold or args.threshold
+            status = "REGRESSION" if ratio > 1 + threshold else "ok"
+            if status != "ok":
+                regressions.append(benchmark.name)
+            line += f"  [{ratio:5.2f}x baseline, {status}]"
+        print(line)
+
+    if args.save:
+        if args.filter:
+            previous = load_baseline(args.baseline) or {"results": {}}
+            results = {**previous["results"], **results}
+        save_baseline(args.baseline, calibration, results)
+        print(f"Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"Regressions over the threshold: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
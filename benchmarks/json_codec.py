@@ -0,0 +1,106 @@
+"""Compares the installed JSON codecs on invoice list pages shaped like the API responses
+
+Usage:
+    python benchmarks/json_codec.py [--pages 200] [--page-size 50]
+"""
+import argparse
+import random
+import timeit
+
+from facturapi.codec import JSON_CODECS
+
+
+def make_invoice(number: int) -> dict:
+    """Returns an invoice object like the ones returned by the invoices list endpoint"""
+    items = [
+        {
+            "quantity": random.randint(1, 10),
+            "discount": 0,
+            "product": {
+                "description": f"Producto de prueba número {n} con descripción larga",
+                "product_key": "60131324",
+                "price": round(random.uniform(10, 5000), 2),
+                "tax_included": True,
+                "taxability": "02",
+                "taxes": [
+                    {
+                        "type": "IVA",
+                        "rate": 0.16,
+                        "factor": "Tasa",
+                        "withholding": False,
+                        "ieps_mode": "sum_before_taxes",
+                    }
+                ],
+                "local_taxes": [],
+                "unit_key": "H87",
+                "unit_name": "Pieza",
+                "sku": f"SKU-{number}-{n}",
+            },
+        }
+        for n in range(random.randint(1, 8))
+    ]
+    return {
+        "id": f"{number:024x}",
+        "created_at": "2023-06-01T18:02:33.467Z",
+        "livemode": False,
+        "status": "valid",
+        "cancellation_status": "none",
+        "verification_url": "https://verificacfdi.facturaelectronica.sat.gob.mx/",
+        "date": "2023-06-01T18:02:33.467Z",
+        "customer": {
+            "id": f"{number:024x}",
+            "legal_name": "PÚBLICO EN GENERAL",
+            "tax_id": "XAXX010101000",
+            "tax_system": "616",
+            "address": {"zip": "03000", "country": "MEX", "state": "Ciudad de México"},
+        },
+        "total": round(random.uniform(100, 50000), 2),
+        "uuid": "2B2B8B4A-8A4C-4C1D-9D5C-0B7E0E6F6A1B",
+        "folio_number": number,
+        "series": "F",
+        "payment_form": "03",
+        "payment_method": "PUE",
+        "use": "G03",
+        "currency": "MXN",
+        "exchange": 1,
+        "items": items,
+        "stamp": {
+            "signature": "x" * 344,
+            "date": "2023-06-01T18:02:34",
+            "sat_cert_number": "30001000000400002495",
+            "sat_signature": "y" * 344,
+        },
+    }
+
+
+def make_page(page_size: int) -> dict:
+    """Returns a page of the invoices list endpoint"""
+    data = [make_invoice(n) for n in range(page_size)]
+    return {"page": 1, "total_pages": 100, "total_results": 100 * page_size, "data": data}
+
+
+def main() -> None:
+    """Runs the benchmark and prints the throughput of every installed codec"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(0)
+    page = make_page(args.page_size)
+    body = JSON_CODECS["json"].dumps(page)
+    print(f"Invoice list page: {args.page_size} invoices, {len(body) / 1024:.0f} KiB")
+
+    baseline = None
+    for name, codec in JSON_CODECS.items():
+        decode = timeit.timeit(lambda c=codec: c.loads(body), number=args.pages)
+        encode = timeit.timeit(lambda c=codec: c.dumps(page), number=args.pages)
+        baseline = baseline or decode
+        print(
+            f"{name:>6}: decode {args.pages / decode:8.0f} pages/s "
+            f"({baseline / decode:4.1f}x json), encode {args.pages / encode:8.0f} pages/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Cold start benchmark: import time, wrapper construction and first client access, each measured
+in a fresh interpreter like a serverless function pays them.
+
+Every scenario runs in a new subprocess several times and reports the median. The modules each
+scenario imports are listed with --modules, to spot heavy imports that should be deferred.
+
+Usage:
+    python benchmarks/startup.py                  # Median of 15 runs of every scenario
+    python benchmarks/startup.py --runs 30        # More runs, on noisy machines
+    python benchmarks/startup.py --modules        # Also list the facturapi modules imported
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import NamedTuple
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_PATH = os.path.join(ROOT_PATH, "src")
+
+# Runs a scenario and prints its elapsed seconds and the facturapi modules it imported
+TEMPLATE = """
+import sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+modules = sorted(name for name in sys.modules if name.startswith("facturapi"))
+print(__import__("json").dumps({{"elapsed": elapsed, "modules": modules}}))
+"""
+
+
+class Scenario(NamedTuple):
+    """Code measured in a fresh interpreter"""
+
+    name: str
+    code: str
+
+
+SCENARIOS = (
+    Scenario("import facturapi", "import facturapi"),
+    Scenario("from facturapi import Facturapi", "from facturapi import Facturapi"),
+    Scenario(
+        "Facturapi()",
+        "from facturapi import Facturapi\napi = Facturapi('sk_test_startup')",
+    ),
+    Scenario(
+        "Facturapi().customers",
+        "from facturapi import Facturapi\nFacturapi('sk_test_startup').customers",
+    ),
+    Scenario(
+        "Facturapi() all clients",
+        "from facturapi import Facturapi\napi = Facturapi('sk_test_startup')\n"
+        "for name in ('customers', 'products', 'invoices', 'receipts', 'retentions',\n"
+        "             'organizations', 'healthcheck', 'tools', 'catalogs'):\n"
+        "    getattr(api, name)",
+    ),
+    Scenario(
+        "AsyncFacturapi().customers",
+        "from facturapi.aio import AsyncFacturapi\n"
+        "AsyncFacturapi('sk_test_startup').customers",
+    ),
+)
+
+
+def run_scenario(scenario: Scenario) -> dict:
+    """Runs a scenario in a new interpreter
+
+    Returns:
+        dict: Elapsed seconds and imported modules
+    """
+    env = {**os.environ, "PYTHONPATH": SRC_PATH}
+    output = subprocess.run(
+        [sys.executable, "-c", TEMPLATE.format(code=scenario.code)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> int:
+    """Runs the scenarios and prints their median times
+
+    Returns:
+        int: Exit status
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=15, help="Runs of every scenario")
+    parser.add_argument("--modules", action="store_true", help="List imported modules")
+    args = parser.parse_args()
+
+    for scenario in SCENARIOS:
+        try:
+            # The first run compiles the bytecode, so the measured runs don't pay for it
+            run_scenario(scenario)
+        except subprocess.CalledProcessError as error:
+            reason = error.stderr.strip().splitlines()[-1]
+            print(f"{scenario.name:<30} skipped: {reason}")
+            continue
+        results = [run_scenario(scenario) for _ in range(args.runs)]
+        median = statistics.median(result["elapsed"] for result in results)
+        modules = results[-1]["modules"]
+        print(f"{scenario.name:<30} {median * 1000:7.1f} ms  {len(modules)} modules")
+        if args.modules:
+            print(f"    {', '.join(modules)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,56 @@
-"""This is the main function that is used to instantiate Facturapi"""
-from . import constants
-from .wrapper import Facturapi
+"""This is the main function that is used to instantiate Facturapi.
+
+The exported names are imported on first access, so `import facturapi` stays cheap
+"""
+from typing import TYPE_CHECKING
+
+from .lazy import get_lazy_attribute
+
+_EXPORTS = {
+    "constants": (".constants", None),
+    "Facturapi": (".wrapper", "Facturapi"),
+    "DocumentArchiver": (".archive", "DocumentArchiver"),
+    "DiskCache": (".cache", "DiskCache"),
+    "MemoryCache": (".cache", "MemoryCache"),
+    "CatalogIndex": (".catalog_index", "CatalogIndex"),
+    "CircuitBreaker": (".health", "CircuitBreaker"),
+    "HealthMonitor": (".health", "HealthMonitor"),
+    "FileIdempotencyJournal": (".idempotency", "FileIdempotencyJournal"),
+    "IdempotencyJournal": (".idempotency", "IdempotencyJournal"),
+    "Instrumentation": (".instrumentation", "Instrumentation"),
+    "MetricsRegistry": (".instrumentation", "MetricsRegistry"),
+    "OpenTelemetryHook": (".instrumentation", "OpenTelemetryHook"),
+    "MirrorStore": (".mirror", "MirrorStore"),
+    "FileTokenBucket": (".ratelimit", "FileTokenBucket"),
+    "TokenBucket": (".ratelimit", "TokenBucket"),
+    "RetryPolicy": (".retry", "RetryPolicy"),
+    "Timeout": (".timeouts", "Timeout"),
+    "deadline": (".timeouts", "deadline"),
+    "BaseTransport": (".transport", "BaseTransport"),
+    "HTTPTransport": (".transport", "HTTPTransport"),
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import constants
+    from .wrapper import Facturapi
+    from .archive import DocumentArchiver
+    from .cache import DiskCache, MemoryCache
+    from .catalog_index import CatalogIndex
+    from .health import CircuitBreaker, HealthMonitor
+    from .idempotency import FileIdempotencyJournal, IdempotencyJournal
+    from .instrumentation import Instrumentation, MetricsRegistry, OpenTelemetryHook
+    from .mirror import MirrorStore
+    from .ratelimit import FileTokenBucket, TokenBucket
+    from .retry import RetryPolicy
+    from .timeouts import Timeout, deadline
+    from .transport import BaseTransport, HTTPTransport
+
+
+def __getattr__(name: str):
+    return get_lazy_attribute(__name__, _EXPORTS, globals(), name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,4 @@
+"""Command line tools. See catalog_index.main"""
+from .catalog_index import main
+
+main()
@@ -0,0 +1,26 @@
+"""Async Facturapi client. Requires the optional httpx dependency, imported on first access"""
+from typing import TYPE_CHECKING
+
+from ..lazy import get_lazy_attribute
+
+_EXPORTS = {
+    "AsyncHealthMonitor": (".health", "AsyncHealthMonitor"),
+    "AsyncBaseTransport": (".transport", "AsyncBaseTransport"),
+    "AsyncHTTPTransport": (".transport", "AsyncHTTPTransport"),
+    "AsyncFacturapi": (".wrapper", "AsyncFacturapi"),
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .health import AsyncHealthMonitor
+    from .transport import AsyncBaseTransport, AsyncHTTPTransport
+    from .wrapper import AsyncFacturapi
+
+
+def __getattr__(name: str):
+    return get_lazy_attribute(__name__, _EXPORTS, globals(), name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
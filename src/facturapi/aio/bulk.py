@@ -0,0 +1,74 @@
+"""Async bulk operations with bounded concurrency"""
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
+
+from ..bulk import BulkResult
+from ..ratelimit import TokenBucket
+
+
+async def run_bulk(
+    func: Callable[[Any], Awaitable],
+    payloads: Iterable,
+    max_concurrency: int = 10,
+    rate_limit: float = None,
+    ordered: bool = False,
+    with_index: bool = False,
+) -> AsyncIterator[BulkResult]:
+    """Awaits func with every payload keeping at most max_concurrency calls in flight. Errors
+    raised by func, from the API or otherwise, are captured in the item result, so a bad payload
+    does not abort the batch.
+
+    Args:
+        func (Callable[[Any], Awaitable]): Coroutine function to call with each payload
+        payloads (Iterable): Payloads to process
+        max_concurrency (int, optional): Maximum number of concurrent calls. Defaults to 10.
+        rate_limit (float, optional): Maximum calls per second. Defaults to None.
+        ordered (bool, optional): Yield the results in the same order as the payloads. If False,
+            results are yielded as soon as they are ready. Defaults to False.
+        with_index (bool, optional): Pass the position of the payload to func as a second
+            argument. Defaults to False.
+
+    Yields:
+        BulkResult: Result of each payload
+    """
+    limiter = TokenBucket(rate_limit) if rate_limit else None
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def call(index: int, payload: Any) -> BulkResult:
+        async with semaphore:
+            if limiter:
+                await asyncio.sleep(limiter.reserve())
+            try:
+                args = (payload, index) if with_index else (payload,)
+                return BulkResult(index, payload, await func(*args))
+            except Exception as error:  # pylint: disable=broad-except
+                return BulkResult(index, payload, error=error)
+
+    items = enumerate(payloads)
+    pending = deque()
+
+    def submit_next() -> None:
+        item = next(items, None)
+        if item is not None:
+            pending.append(asyncio.ensure_future(call(*item)))
+
+    try:
+        for _ in range(max_concurrency * 2):
+            submit_next()
+
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.remove(task)
+
+            for task in done:
+                result = await task
+                submit_next()
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,50 @@
+"""Async Catalogs API endpoint"""
+from ..catalogs import CatalogIndexMixin, CatalogsClient
+from .http import AsyncBaseClient
+
+
+class AsyncCatalogsClient(CatalogIndexMixin, AsyncBaseClient):
+    """Async Catalogs API client. Mirrors CatalogsClient"""
+
+    endpoint = CatalogsClient.endpoint
+
+    async def search_products(
+        self, search: str, page: int = None, limit: int = None
+    ) -> dict:
+        """Search in SAT's Products/Services catalog. See CatalogsClient.search_products
+
+        Returns:
+            dict: List of products or services matching the query
+        """
+        local_result = self._search_index("products", search, page, limit)
+        if local_result is not None:
+            return local_result
+        return await self.search_remote("products", search, page, limit)
+
+    async def search_units_of_measurement(
+        self, search: str, page: int = None, limit: int = None
+    ) -> dict:
+        """Search in SAT's Units of Measurement catalog.
+        See CatalogsClient.search_units_of_measurement
+
+        Returns:
+            dict: List of units of measurement
+        """
+        local_result = self._search_index("units", search, page, limit)
+        if local_result is not None:
+            return local_result
+        return await self.search_remote("units", search, page, limit)
+
+    async def search_remote(
+        self, catalog: str, search: str, page: int = None, limit: int = None
+    ) -> dict:
+        """Searches a catalog in the API without using the local index.
+        See CatalogsClient.search_remote
+
+        Returns:
+            dict: Search results
+        """
+        params = {"q": search, **self._get_list_params(page=page, limit=limit)}
+        url = self._get_request_url([catalog])
+        response = await self._get_cached_json(self.search_names[catalog], url, params)
+        return self._update_index(catalog, response)
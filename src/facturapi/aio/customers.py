@@ -0,0 +1,128 @@
+"""Async Customer API endpoint"""
+from datetime import datetime
+from typing import Union
+
+from ..constants import TaxSystem
+from ..customers import CustomersClient, _get_customer_data, _get_customer_update_data
+from ..exceptions import ValidationError
+from ..models import (
+    Customer,
+    CustomerList,
+    CustomerValidations,
+    build_customer,
+    build_customer_list,
+)
+from .http import AsyncBaseClient
+from .mirror import AsyncMirrorMixin
+from .pagination import AsyncPaginatedClientMixin
+
+
+class AsyncCustomersClient(
+    AsyncMirrorMixin, AsyncPaginatedClientMixin, AsyncBaseClient
+):
+    """Async Customers API client. Mirrors CustomersClient"""
+
+    endpoint = CustomersClient.endpoint
+
+    def _build_mirrored(self, record: dict) -> Customer:
+        return build_customer(record)
+
+    async def create(
+        self,
+        legal_name: str,
+        tax_id: str,
+        tax_system: Union[TaxSystem, str],
+        zip_code: str,
+        **kwargs
+    ) -> Customer:
+        """Creates a new customer in the organization. See CustomersClient.create
+
+        Returns:
+            Customer: Created customer
+        """
+        customer_data = _get_customer_data(
+            legal_name, tax_id, tax_system, zip_code, **kwargs
+        )
+        url = self._get_request_url()
+        response = await self._execute_request("POST", url, json_data=customer_data)
+        record = self._decode_json(response)
+        self._mirror_records([record])
+        return build_customer(record)
+
+    # pylint: disable=too-many-arguments
+    # All arguments are needed
+    async def all(
+        self,
+        search: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        page: int = None,
+        limit: int = None,
+        lazy: bool = False,
+    ) -> CustomerList:
+        """Retrieves a paginated list of customers. See CustomersClient.all
+
+        Returns:
+            CustomerList: List-like object containing the customer search results
+        """
+        params = self._get_list_params(
+            search, start_date=start_date, end_date=end_date, page=page, limit=limit
+        )
+        url = self._get_request_url()
+        response = await self._execute_request("GET", url, params)
+        records = self._decode_json(response)
+        self._mirror_records(records["data"])
+        return build_customer_list(records, lazy)
+
+    async def retrieve(self, customer_id: str) -> Customer:
+        """Retrieves a single customer object. See CustomersClient.retrieve
+
+        Returns:
+            Customer: Retrieved customer
+        """
+        url = self._get_request_url([customer_id])
+        response = await self._retrieve_mirrored(
+            customer_id,
+            lambda: self._get_cached_json("retrieve", url, refresh=self._skip_cache),
+        )
+        return build_customer(response)
+
+    async def update(self, customer_id: str, **kwargs) -> Customer:
+        """Updates an existing customer. See CustomersClient.update
+
+        Returns:
+            Customer: Updated customer
+        """
+        data = _get_customer_update_data(**kwargs)
+        url = self._get_request_url([customer_id])
+        response = await self._execute_request("PUT", url, json_data=data)
+        record = self._decode_json(response)
+        self._mirror_records([record])
+        return build_customer(record)
+
+    async def delete(self, customer_id: str) -> Customer:
+        """Delete a customer from your organization. See CustomersClient.delete
+
+        Returns:
+            Customer: Deleted customer object
+        """
+        url = self._get_request_url([customer_id])
+        response = await self._execute_request("DELETE", url)
+        self._mirror_delete(customer_id)
+        return build_customer(self._decode_json(response))
+
+    async def validate(
+        self, customer_id: str, raise_exception: bool = False
+    ) -> CustomerValidations:
+        """Validate customer's fiscal information. See CustomersClient.validate
+
+        Returns:
+            CustomerValidations: Validation result
+        """
+        url = self._get_request_url([customer_id, "tax-info-validation"])
+        response = await self._execute_request("GET", url)
+        validations = CustomerValidations(**self._decode_json(response))
+        if raise_exception:
+            raise ValidationError(validations.get_messages())
+
+        return validations
@@ -0,0 +1,60 @@
+"""Async streaming downloads of invoice and retention files"""
+import os
+from typing import AsyncIterator, BinaryIO, Union
+
+from ..download import DEFAULT_CHUNK_SIZE, check_file_format
+
+
+class AsyncDownloadMixin:
+    """Adds streaming downloads to the async clients. Mirrors DownloadMixin"""
+
+    async def iter_download(
+        self, object_id: str, file_format: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Downloads a file chunk by chunk. See DownloadMixin.iter_download
+
+        Yields:
+            bytes: File chunks
+        """
+        url = self._get_download_file_url(check_file_format(file_format), object_id)
+        response = await self._execute_request("GET", url, stream=True)
+        try:
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
+
+    async def download_to(
+        self,
+        object_id: str,
+        file_format: str,
+        destination: Union[str, BinaryIO],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """Downloads a file to a path or file object. See DownloadMixin.download_to
+
+        Returns:
+            int: Number of bytes written
+        """
+        if hasattr(destination, "write"):
+            size = 0
+            chunks = self.iter_download(object_id, file_format, chunk_size)
+            try:
+                async for chunk in chunks:
+                    destination.write(chunk)
+                    size += len(chunk)
+            finally:
+                # Close the response now if writing fails, not when the generator is collected
+                await chunks.aclose()
+            return size
+
+        temp_path = f"{os.fspath(destination)}.part"
+        try:
+            with open(temp_path, "wb") as file:
+                size = await self.download_to(object_id, file_format, file, chunk_size)
+            os.replace(temp_path, destination)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return size
@@ -0,0 +1,70 @@
+"""Background health monitoring for the async clients"""
+import asyncio
+from typing import Awaitable, Callable
+
+from ..health import CircuitBreaker, HealthMonitor, HealthStatus
+
+
+class AsyncHealthMonitor(HealthMonitor):
+    """Polls the API health check in an asyncio task and caches the last status. Mirrors
+    HealthMonitor
+
+    Args:
+        check (Callable[[], Awaitable[bool]]): Coroutine function that checks the API, e.g.
+            AsyncHealthCheck.check_status
+        interval (float, optional): Seconds between checks. Defaults to 30.
+        circuit_breaker (CircuitBreaker, optional): Circuit breaker driven by the checks.
+            Defaults to None.
+    """
+
+    def __init__(
+        self,
+        check: Callable[[], Awaitable[bool]],
+        interval: float = 30,
+        circuit_breaker: CircuitBreaker = None,
+    ) -> None:
+        super().__init__(check, interval, circuit_breaker)
+        self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # pylint: disable-next=invalid-overridden-method
+    async def check(self) -> HealthStatus:
+        """Checks the API now and caches the result
+
+        Returns:
+            HealthStatus: New status
+        """
+        try:
+            ok = bool(await self.check_function())  # pylint: disable=invalid-name
+        except Exception as error:  # pylint: disable=broad-except
+            return self._set_inconclusive(error)
+        return self._set_status(ok)
+
+    # pylint: disable-next=invalid-overridden-method
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Starts the background checks in the running event loop. The first one runs
+        immediately
+        """
+        if self.running:
+            return
+        self._task = asyncio.ensure_future(self._run())
+
+    # pylint: disable-next=invalid-overridden-method
+    async def stop(self) -> None:
+        """Stops the background checks"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,224 @@
+"""Async HTTP Base Client"""
+import asyncio
+import time
+
+import httpx
+
+from ..exceptions import DeadlineExceeded, FacturapiException
+from ..http import BaseClient
+from ..idempotency import IDEMPOTENCY_HEADER
+from ..timeouts import Timeout
+from .singleflight import AsyncSingleFlight
+from .transport import AsyncHTTPTransport
+
+
+# Phase of each event of the httpcore trace extension
+TRACE_PHASES = {
+    "connect_tcp": "connect",
+    "connect_unix_socket": "connect",
+    "start_tls": "tls",
+    "send_request_headers": "send",
+    "send_request_body": "send",
+    "receive_response_headers": "wait",
+    "receive_response_body": "transfer",
+}
+
+
+class TraceTimings:
+    """Callback of the httpx "trace" request extension that measures the phases of a request"""
+
+    def __init__(self) -> None:
+        self.timings = {}
+        self._started = {}
+
+    async def __call__(self, event_name: str, info: dict) -> None:
+        name, _, state = event_name.rpartition(".")
+        phase = TRACE_PHASES.get(name.rpartition(".")[2])
+        if phase is None:
+            return
+        if state == "started":
+            self._started[phase] = time.perf_counter()
+        elif phase in self._started:
+            elapsed = time.perf_counter() - self._started.pop(phase)
+            self.timings[phase] = self.timings.get(phase, 0.0) + elapsed
+
+
+class AsyncBaseClient(BaseClient):  # pylint:disable=too-few-public-methods
+    """BaseClient class to be inherited by specific async clients"""
+
+    BODY_ARGUMENT = "content"
+    TIMEOUT_ERRORS = (httpx.TimeoutException,)
+
+    def _create_transport(self) -> AsyncHTTPTransport:
+        return AsyncHTTPTransport()
+
+    def _get_transport_timeout(self, timeout: Timeout) -> httpx.Timeout:
+        return httpx.Timeout(timeout.read, connect=timeout.connect)
+
+    def _create_single_flight(self) -> AsyncSingleFlight:
+        return AsyncSingleFlight()
+
+    async def aclose(self) -> None:
+        """Closes the client's transport. Shared transports are left open and must be closed by
+        their owner
+        """
+        if self._owns_transport:
+            await self.transport.aclose()
+
+    # pylint: disable-next=invalid-overridden-method
+    async def _get_cached_json(
+        self, name: str, url: str, query_params: dict = None, refresh: bool = False
+    ):
+        """Executes a GET request and decodes its JSON response, using the cache if enabled
+
+        Args:
+            name (str): Name of the client method, used to look up its TTL
+            url (str): URL for the request
+            query_params (dict, optional): Dictionary object of additional query. Defaults to None.
+            refresh (bool, optional): Skip the cached response and store the new one.
+                Defaults to False.
+
+        Returns:
+            Any: Decoded response
+        """
+        if self.cache is None:
+            response = await self._execute_request("GET", url, query_params)
+            return self._decode_json(response)
+
+        key = self._get_cache_key(url, query_params)
+        value = None if refresh else self.cache.get(key)
+        if value is None:
+            response = await self._execute_request("GET", url, query_params)
+            value = self._decode_json(response)
+            ttl = self._get_cache_ttl(name)
+            if ttl != 0:
+                self.cache.set(key, value, ttl)
+        return value
+
+    # pylint: disable-next=invalid-overridden-method
+    async def _execute_request(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        url: str,
+        query_params: dict = None,
+        json_data: dict = None,
+        stream: bool = False,
+        idempotency_nonce: str = "",
+    ):
+        """Executes a HTTP request without blocking the event loop. Concurrent identical GET
+        requests share a single request and its response, unless they stream the response
+
+        Args:
+            method (str): HTTP method. GET, POST, PUT or DELETE
+            url (str): URL for the request
+            query_params (dict, optional): Dictionary object of additional query. Defaults to None.
+            json_data (dict, optional): For POST and PUT requests. Defaults to None.
+            stream (bool, optional): Defer downloading the response body. The caller must close
+                the response. Defaults to False.
+            idempotency_nonce (str, optional): Tells apart identical POST requests meant to be
+                sent more than once. Defaults to "".
+
+        Returns:
+            httpx.Response: API response
+        """
+        if self.single_flight is not None and method.upper() == "GET" and not stream:
+            return await self.single_flight.do(
+                self._get_single_flight_key(url, query_params),
+                lambda: self._send_request(method, url, query_params),
+            )
+        return await self._send_request(
+            method, url, query_params, json_data, stream, idempotency_nonce
+        )
+
+    # pylint: disable-next=invalid-overridden-method
+    async def _send_request(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        url: str,
+        query_params: dict = None,
+        json_data: dict = None,
+        stream: bool = False,
+        idempotency_nonce: str = "",
+    ):
+        """Sends a HTTP request, waiting for the rate limiter and retrying it according to the
+        retry policy. See _execute_request
+
+        Returns:
+            httpx.Response: API response
+        """
+        request_kwargs = self._get_request_kwargs(method, query_params, json_data)
+        key, fingerprint = self._begin_idempotent_request(
+            method, url, json_data, idempotency_nonce
+        )
+        if key:
+            request_kwargs["headers"] = {IDEMPOTENCY_HEADER: key}
+        if stream:
+            request_kwargs["stream"] = True
+
+        timeout = self._get_timeout(method, stream)
+        attempt = 0
+        while True:
+            rate_limit_delay = self._get_rate_limit_delay()
+            if rate_limit_delay > 0:
+                self._check_deadline(rate_limit_delay)
+                await asyncio.sleep(rate_limit_delay)
+
+            request_kwargs["timeout"], bounded = self._get_attempt_timeout(timeout)
+            # Checked before the request is instrumented, so requests rejected locally by the
+            # deadline or the open circuit are not counted as sent
+            self._check_circuit()
+            try:
+                started = self._begin_instrumented_request(method, url, attempt)
+            except BaseException:
+                self._release_circuit()
+                raise
+            trace = None
+            if started is not None:
+                trace = TraceTimings()
+                request_kwargs["extensions"] = {"trace": trace}
+            try:
+                response = await self.transport.request(
+                    method.upper(), url, **request_kwargs
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                self._record_circuit_result()
+                self._end_instrumented_request(
+                    method, url, attempt, started, request_kwargs, error=error
+                )
+                if bounded and isinstance(error, self.TIMEOUT_ERRORS):
+                    message = f"Deadline exceeded: {error}"
+                    raise DeadlineExceeded(message) from error
+                delay = self._get_retry_delay(
+                    method, url, attempt, error=error, idempotency_key=key
+                )
+                if delay is None:
+                    message = f"Request error: {error}"
+                    raise FacturapiException(message) from error
+            except BaseException:
+                self._release_circuit()
+                raise
+            else:
+                self._record_circuit_result(response)
+                self._end_instrumented_request(
+                    method,
+                    url,
+                    attempt,
+                    started,
+                    request_kwargs,
+                    response,
+                    timings=trace.timings if trace else None,
+                )
+                delay = self._get_retry_delay(
+                    method, url, attempt, response, idempotency_key=key
+                )
+                if delay is None:
+                    self._invalidate_cache(method, url)
+                    self._complete_idempotent_request(fingerprint, response)
+                    if stream and response.status_code >= self.STATUS_BAD_REQUEST:
+                        await response.aread()
+                    return self._check_response(response)
+                await response.aclose()
+
+            self._check_deadline(delay)
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,166 @@
+"""Async Invoices API endpoint"""
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Union
+
+from ..bulk import BulkResult
+from ..constants import CancellationReason
+from ..invoices import InvoicesClient
+from .bulk import run_bulk
+from .download import AsyncDownloadMixin
+from .http import AsyncBaseClient
+from .pagination import AsyncPaginatedClientMixin
+
+
+class AsyncInvoicesClient(AsyncDownloadMixin, AsyncPaginatedClientMixin, AsyncBaseClient):
+    """Async Invoices API client. Mirrors InvoicesClient"""
+
+    endpoint = InvoicesClient.endpoint
+
+    async def create(self, data: dict, idempotency_nonce: str = "") -> dict:
+        """Creates a new invoice. See InvoicesClient.create
+
+        Returns:
+            dict: Created invoice object
+        """
+        url = self._get_request_url()
+        response = await self._execute_request(
+            "POST", url, json_data=data, idempotency_nonce=idempotency_nonce
+        )
+        return self._decode_json(response)
+
+    def create_many(
+        self,
+        payloads: Iterable[dict],
+        max_concurrency: int = 10,
+        rate_limit: float = None,
+        ordered: bool = False,
+    ) -> AsyncIterator[BulkResult]:
+        """Creates many invoices concurrently. See InvoicesClient.create_many
+
+        Args:
+            payloads (Iterable[dict]): Invoice data of each invoice. Consumed lazily
+            max_concurrency (int, optional): Maximum number of concurrent requests.
+                Defaults to 10.
+            rate_limit (float, optional): Maximum requests per second. Defaults to None.
+            ordered (bool, optional): Yield the results in the same order as the payloads.
+                Defaults to False.
+
+        Returns:
+            AsyncIterator[BulkResult]: Result of each invoice
+        """
+        batch_id = uuid.uuid4().hex
+        return run_bulk(
+            lambda data, index: self.create(data, f"create_many:{batch_id}:{index}"),
+            payloads,
+            max_concurrency,
+            rate_limit,
+            ordered,
+            with_index=True,
+        )
+
+    async def all(  # pylint: disable=too-many-arguments
+        self,
+        search: str = None,
+        customer_id: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        page: int = None,
+        limit: int = None,
+    ) -> dict:
+        """Returns a paginated list of invoices. See InvoicesClient.all
+
+        Returns:
+            dict: List of invoices
+        """
+        params = self._get_list_params(
+            search, customer_id, start_date, end_date, page, limit
+        )
+        url = self._get_request_url()
+        response = await self._execute_request("GET", url, params)
+        return self._decode_json(response)
+
+    async def retrieve(self, invoice_id: str) -> dict:
+        """Retrieves a single invoice object. See InvoicesClient.retrieve
+
+        Returns:
+            dict: Invoice object
+        """
+        url = self._get_request_url([invoice_id])
+        response = await self._execute_request("GET", url)
+        return self._decode_json(response)
+
+    async def cancel(
+        self,
+        invoice_id: str,
+        reason: Union[CancellationReason, str],
+        substitution: str = None,
+    ) -> dict:
+        """Cancels an invoice. See InvoicesClient.cancel
+
+        Returns:
+            dict: Cancelled invoice object
+        """
+        params = {}
+        if reason:
+            motive = reason.value if isinstance(reason, CancellationReason) else reason
+            params.update({"motive": motive})
+
+        if substitution:
+            params.update({"substitution": substitution})
+
+        url = self._get_request_url([invoice_id])
+        response = await self._execute_request("DELETE", url, query_params=params)
+        return self._decode_json(response)
+
+    async def get_cancellation_receipt(self, invoice_id: str) -> str:
+        """Get XML cancellation receipt of an invoice as str.
+        See InvoicesClient.get_cancellation_receipt
+
+        Returns:
+            str: XML cancellation receipt
+        """
+        url = self._get_request_url([invoice_id, "cancellation_receipt", "xml"])
+        response = await self._execute_request("GET", url)
+        return response.text
+
+    async def download_pdf(self, invoice_id: str) -> bytes:
+        """Download invoice PDF file
+
+        Returns:
+            bytes: Invoice PDF file
+        """
+        url = self._get_download_file_url("pdf", invoice_id)
+        response = await self._execute_request("GET", url)
+        return response.content
+
+    async def download_xml(self, invoice_id: str) -> bytes:
+        """Download invoice XML file
+
+        Returns:
+            bytes: Invoice XML file
+        """
+        url = self._get_download_file_url("xml", invoice_id)
+        response = await self._execute_request("GET", url)
+        return response.content
+
+    async def download_zip(self, invoice_id: str) -> bytes:
+        """Download invoice ZIP file
+
+        Returns:
+            bytes: Invoice ZIP file
+        """
+        url = self._get_download_file_url("zip", invoice_id)
+        response = await self._execute_request("GET", url)
+        return response.content
+
+    async def send_by_email(self, invoice_id: str, email: str = None) -> dict:
+        """Send the invoice by email. See InvoicesClient.send_by_email
+
+        Returns:
+            dict: Response message
+        """
+        url = self._get_request_url([invoice_id, "email"])
+        data = {"email": email} if email else {}
+        response = await self._execute_request("POST", url, json_data=data)
+        return self._decode_json(response)
@@ -0,0 +1,46 @@
+"""Local mirror support for the async clients"""
+import asyncio
+from typing import Awaitable, Callable
+
+from ..exceptions import FacturapiException
+from ..mirror import MirrorMixin
+
+
+class AsyncMirrorMixin(MirrorMixin):
+    """Adds a local mirror to the async customers and products clients. Mirrors MirrorMixin"""
+
+    def __init__(self, api_key: str, **kwargs) -> None:
+        super().__init__(api_key, **kwargs)
+        self._revalidations = {}
+
+    async def _revalidate(
+        self, object_id: str, fetch: Callable[[], Awaitable[dict]]
+    ) -> None:
+        try:
+            self.mirror.put(self.endpoint, await fetch(), self._key_hash)
+        except FacturapiException:
+            pass
+        finally:
+            self._revalidations.pop(object_id, None)
+
+    # pylint: disable-next=invalid-overridden-method
+    async def _retrieve_mirrored(
+        self, object_id: str, fetch: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        """Returns a record from the mirror according to its policy, or from the API.
+        See MirrorMixin._retrieve_mirrored
+
+        Returns:
+            dict: Record
+        """
+        if self.mirror is None:
+            return await fetch()
+
+        record, revalidate = self._get_mirror_entry(object_id)
+        if revalidate and object_id not in self._revalidations:
+            task = asyncio.ensure_future(self._revalidate(object_id, fetch))
+            self._revalidations[object_id] = task
+        if record is None:
+            record = await fetch()
+            self.mirror.put(self.endpoint, record, self._key_hash)
+        return record
@@ -0,0 +1,195 @@
+"""Async Organizations API endpoint"""
+from datetime import datetime
+from typing import Union
+
+from ..constants import ReceiptPeriodicity
+from ..organizations import OrganizationsClient
+from .http import AsyncBaseClient
+from .pagination import AsyncPaginatedClientMixin
+
+
+class AsyncOrganizationsClient(AsyncPaginatedClientMixin, AsyncBaseClient):
+    """Async Organizations API client. Mirrors OrganizationsClient"""
+
+    endpoint = OrganizationsClient.endpoint
+
+    async def create(self, name: str) -> dict:
+        """Creates a new Organization on the user account. See OrganizationsClient.create
+
+        Returns:
+            dict: Created Organization object
+        """
+        url = self._get_request_url()
+        response = await self._execute_request("POST", url, json_data={"name": name})
+        return self._decode_json(response)
+
+    async def all(  # pylint: disable=too-many-arguments
+        self,
+        search: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        page: int = None,
+        limit: int = None,
+    ) -> dict:
+        """Returns a paginated list of organizations. See OrganizationsClient.all
+
+        Returns:
+            dict: List of organizations
+        """
+        params = self._get_list_params(
+            search, start_date=start_date, end_date=end_date, page=page, limit=limit
+        )
+        url = self._get_request_url()
+        response = await self._execute_request("GET", url, params)
+        return self._decode_json(response)
+
+    async def retrieve(self, organization_id: str) -> dict:
+        """Returns a single organization object. See OrganizationsClient.retrieve
+
+        Returns:
+            dict: Organization object
+        """
+        url = self._get_request_url([organization_id])
+        return await self._get_cached_json("retrieve", url)
+
+    async def update(self, organization_id: str, data: dict) -> dict:
+        """Updates the fiscal data of the organization. See OrganizationsClient.update
+
+        Returns:
+            dict: Updated organization object
+        """
+        url = self._get_request_url([organization_id, "legal"])
+        response = await self._execute_request("PUT", url, json_data=data)
+        return self._decode_json(response)
+
+    async def delete(self, organization_id: str) -> dict:
+        """Delete an organization. See OrganizationsClient.delete
+
+        Returns:
+            dict: Deleted organization object
+        """
+        url = self._get_request_url([organization_id])
+        response = await self._execute_request("DELETE", url)
+        return self._decode_json(response)
+
+    async def upload_csd(
+        self, organization_id: str, cer_file: bytes, key_file: bytes, password: str
+    ) -> dict:
+        """Uploads the files of the Digital Seal Certificate (CSD) provided by SAT.
+        See OrganizationsClient.upload_csd
+
+        Returns:
+            dict: Updated organization object
+        """
+        data = {"cerFile": cer_file, "keyFile": key_file, "password": password}
+        url = self._get_request_url([organization_id, "certificate"])
+        response = await self._execute_request("PUT", url, json_data=data)
+        return self._decode_json(response)
+
+    async def upload_logo(self, organization_id: str, file: bytes) -> dict:
+        """Uploads the organization's logo. See OrganizationsClient.upload_logo
+
+        Returns:
+            dict: Organization object
+        """
+        url = self._get_request_url([organization_id, "logo"])
+        response = await self._execute_request("PUT", url, json_data={"file": file})
+        return self._decode_json(response)
+
+    async def update_customization(  # pylint: disable=too-many-arguments
+        self,
+        organization_id: str,
+        color: str,
+        next_folio_number: int,
+        next_folio_number_test: int,
+        pdf_extra: dict,
+    ) -> dict:
+        """Updates the information related with the organization's branding.
+        See OrganizationsClient.update_customization
+
+        Returns:
+            dict: Organization object
+        """
+        url = self._get_request_url([organization_id, "customization"])
+        data = {
+            "color": color,
+            "next_folio_number": next_folio_number,
+            "next_folio_number_test": next_folio_number_test,
+            "pdf_extra": pdf_extra,
+        }
+        response = await self._execute_request("PUT", url, json_data=data)
+        return self._decode_json(response)
+
+    async def update_receipt_settings(  # pylint: disable=too-many-arguments
+        self,
+        organization_id: str,
+        periodicity: Union[ReceiptPeriodicity, str],
+        duration_days: int,
+        next_folio_number: int,
+        next_folio_number_test: int,
+    ) -> dict:
+        """Updates the receipts settings of the organization.
+        See OrganizationsClient.update_receipt_settings
+
+        Returns:
+            dict: Organization object
+        """
+        url = self._get_request_url([organization_id, "receipts"])
+        data = {
+            "periodicity": periodicity,
+            "duration_days": duration_days,
+            "next_folio_number": next_folio_number,
+            "next_folio_number_test": next_folio_number_test,
+        }
+        response = await self._execute_request("PUT", url, json_data=data)
+        return self._decode_json(response)
+
+    async def check_domain(self, domain: str) -> bool:
+        """Checks if an identifier is available as a domain for the self-billing portal
+
+        Returns:
+            bool: True if domain is available
+        """
+        url = self._get_request_url(["domain-check"])
+        response = await self._execute_request("GET", url, {"domain": domain})
+        return self._decode_json(response)["available"]
+
+    async def update_domain(self, organization_id: str, domain: str) -> dict:
+        """Choose the domain of the self-billing microsite. See OrganizationsClient.update_domain
+
+        Returns:
+            dict: Updated organization domain
+        """
+        url = self._get_request_url([organization_id, "domain"])
+        response = await self._execute_request("PUT", url, json_data={"domain": domain})
+        return self._decode_json(response)
+
+    async def get_test_api_key(self, organization_id: str) -> str:
+        """Retrieves the test environment secret API key of an organization
+
+        Returns:
+            str: Test API Key
+        """
+        url = self._get_request_url([organization_id, "apikeys", "test"])
+        response = await self._execute_request("GET", url)
+        return self._decode_json(response)
+
+    async def renew_test_api_key(self, organization_id: str) -> str:
+        """Renews the test environment secret API key of an organization
+
+        Returns:
+            str: Test API Key
+        """
+        url = self._get_request_url([organization_id, "apikeys", "test"])
+        response = await self._execute_request("PUT", url)
+        return self._decode_json(response)
+
+    async def renew_live_api_key(self, organization_id: str) -> str:
+        """Renews the live environment secret API key of an organization
+
+        Returns:
+            str: Live API Key
+        """
+        url = self._get_request_url([organization_id, "apikeys", "live"])
+        response = await self._execute_request("PUT", url)
+        return self._decode_json(response)
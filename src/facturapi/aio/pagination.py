@@ -0,0 +1,143 @@
+"""Async pagination helpers for the list endpoints"""
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from ..pagination import MAX_PAGE_SIZE, get_page_data
+
+
+async def iter_pages(
+    fetch_page: Callable[[int], Awaitable], prefetch: bool = False, first_page: int = 1
+) -> AsyncIterator:
+    """Yields the pages of a list endpoint until the last one is reached
+
+    Args:
+        fetch_page (Callable[[int], Awaitable]): Coroutine function that returns the requested
+            page number
+        prefetch (bool, optional): Request the next page while the current one is consumed.
+            Defaults to False.
+        first_page (int, optional): Page to start from. Defaults to 1.
+
+    Yields:
+        Any: Pages as returned by fetch_page
+    """
+    number = first_page
+    task = asyncio.ensure_future(fetch_page(number))
+    try:
+        while task:
+            page = await task
+            data, total_pages = get_page_data(page)
+            has_next = data and total_pages and number < total_pages
+            number += 1
+            task = None
+            if has_next and prefetch:
+                task = asyncio.ensure_future(fetch_page(number))
+            yield page
+            if has_next and not prefetch:
+                task = asyncio.ensure_future(fetch_page(number))
+    finally:
+        if task:
+            task.cancel()
+
+
+async def iter_pages_concurrently(
+    fetch_page: Callable[[int], Awaitable],
+    max_concurrency: int = 4,
+    ordered: bool = True,
+    first_page: int = 1,
+) -> AsyncIterator:
+    """Yields the pages of a list endpoint requesting them concurrently. The first page is
+    requested alone to learn the total number of pages, then the remaining ones are requested
+    with at most `max_concurrency` requests in flight.
+
+    Args:
+        fetch_page (Callable[[int], Awaitable]): Coroutine function that returns the requested
+            page number
+        max_concurrency (int, optional): Maximum number of concurrent requests. Defaults to 4.
+        ordered (bool, optional): Yield the pages in page order. If False, pages are yielded as
+            soon as they are fetched. Defaults to True.
+        first_page (int, optional): Page to start from. Defaults to 1.
+
+    Yields:
+        Any: Pages as returned by fetch_page
+    """
+    page = await fetch_page(first_page)
+    yield page
+    data, total_pages = get_page_data(page)
+    if not data or not total_pages or first_page >= total_pages:
+        return
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    numbers = iter(range(first_page + 1, total_pages + 1))
+    pending = deque()
+
+    async def bounded_fetch(number: int) -> Any:
+        async with semaphore:
+            return await fetch_page(number)
+
+    def submit_next() -> None:
+        number = next(numbers, None)
+        if number is not None:
+            pending.append(asyncio.ensure_future(bounded_fetch(number)))
+
+    try:
+        for _ in range(max_concurrency * 2):
+            submit_next()
+
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.remove(task)
+
+            for task in done:
+                page = await task
+                submit_next()
+                yield page
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class AsyncPaginatedClientMixin:  # pylint: disable=too-few-public-methods
+    """Adds auto-pagination to async clients that implement a paginated `all` method"""
+
+    async def iter_all(  # pylint: disable=too-many-arguments
+        self,
+        prefetch: bool = False,
+        page_size: int = MAX_PAGE_SIZE,
+        max_concurrency: int = None,
+        ordered: bool = True,
+        **kwargs,
+    ) -> AsyncIterator:
+        """Lazily yields every item of the list endpoint, requesting one page at a time.
+        If max_concurrency is set, the pages after the first one are requested concurrently
+
+        Args:
+            prefetch (bool, optional): Request the next page while the current one is consumed.
+                Defaults to False.
+            page_size (int, optional): Results per page. Defaults to MAX_PAGE_SIZE.
+            max_concurrency (int, optional): Number of pages to request concurrently.
+                Defaults to None.
+            ordered (bool, optional): With max_concurrency, yield the items in page order.
+                If False, pages are yielded as they arrive. Defaults to True.
+            **kwargs: Search arguments accepted by the client's `all` method
+
+        Yields:
+            Any: Items of the list, in the same form returned by `all`
+        """
+
+        async def fetch_page(number: int) -> Any:
+            return await self.all(page=number, limit=page_size, **kwargs)
+
+        if max_concurrency:
+            pages = iter_pages_concurrently(fetch_page, max_concurrency, ordered)
+        else:
+            pages = iter_pages(fetch_page, prefetch)
+
+        async for page in pages:
+            data, _ = get_page_data(page)
+            for item in data:
+                yield item
@@ -0,0 +1,95 @@
+"""Async Products API endpoint"""
+from typing import List, Union
+
+from ..models import Product, ProductList, build_product, build_product_list
+from ..products import ProductsClient, _get_product_data, _get_product_update_data
+from .http import AsyncBaseClient
+from .mirror import AsyncMirrorMixin
+from .pagination import AsyncPaginatedClientMixin
+
+
+class AsyncProductsClient(
+    AsyncMirrorMixin, AsyncPaginatedClientMixin, AsyncBaseClient
+):
+    """Async Products API client. Mirrors ProductsClient"""
+
+    endpoint = ProductsClient.endpoint
+
+    def _build_mirrored(self, record: dict) -> Product:
+        return build_product(record)
+
+    async def create(  # pylint: disable=too-many-arguments
+        self,
+        description: str,
+        product_key: str,
+        price: Union[int, float],
+        tax_included: bool = True,
+        taxes: List[dict] = None,
+        unit_key: str = "H87",
+        **kwargs,
+    ) -> Product:
+        """Creates a new product or service. See ProductsClient.create
+
+        Returns:
+            Product: Created product
+        """
+        data = _get_product_data(
+            description, product_key, price, tax_included, taxes, unit_key, **kwargs
+        )
+        url = self._get_request_url()
+        response = await self._execute_request("POST", url, json_data=data)
+        record = self._decode_json(response)
+        self._mirror_records([record])
+        return build_product(record)
+
+    async def all(
+        self, search: str = None, page: int = None, limit: int = None, lazy: bool = False
+    ) -> ProductList:
+        """Returns a paginated list of products. See ProductsClient.all
+
+        Returns:
+            ProductList: List-like object containing the product search results
+        """
+        params = self._get_list_params(search, page=page, limit=limit)
+        url = self._get_request_url()
+        response = await self._execute_request("GET", url, params)
+        records = self._decode_json(response)
+        self._mirror_records(records["data"])
+        return build_product_list(records, lazy)
+
+    async def retrieve(self, product_id: str) -> Product:
+        """Returns a single product object. See ProductsClient.retrieve
+
+        Returns:
+            Product: Retrieved product
+        """
+        url = self._get_request_url([product_id])
+        response = await self._retrieve_mirrored(
+            product_id,
+            lambda: self._get_cached_json("retrieve", url, refresh=self._skip_cache),
+        )
+        return build_product(response)
+
+    async def update(self, product_id: str, **kwargs) -> Product:
+        """Updates an existing product. See ProductsClient.update
+
+        Returns:
+            Product: Updated product object
+        """
+        data = _get_product_update_data(**kwargs)
+        url = self._get_request_url([product_id])
+        response = await self._execute_request("PUT", url, json_data=data)
+        record = self._decode_json(response)
+        self._mirror_records([record])
+        return build_product(record)
+
+    async def delete(self, product_id: str) -> Product:
+        """Deletes the product from your organization. See ProductsClient.delete
+
+        Returns:
+            Product: Deleted product object
+        """
+        url = self._get_request_url([product_id])
+        response = await self._execute_request("DELETE", url)
+        self._mirror_delete(product_id)
+        return build_product(self._decode_json(response))
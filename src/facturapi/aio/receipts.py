@@ -0,0 +1,82 @@
+"""Async Receipts API endpoint"""
+from datetime import datetime
+
+from ..receipts import ReceiptsClient
+from .http import AsyncBaseClient
+from .pagination import AsyncPaginatedClientMixin
+
+
+class AsyncReceiptsClient(AsyncPaginatedClientMixin, AsyncBaseClient):
+    """Async Receipts API client. Mirrors ReceiptsClient"""
+
+    endpoint = ReceiptsClient.endpoint
+
+    async def create(self, data: dict) -> dict:
+        """Creates a new receipt. See ReceiptsClient.create
+
+        Returns:
+            dict: Created receipt object
+        """
+        url = self._get_request_url()
+        response = await self._execute_request("POST", url, json_data=data)
+        return self._decode_json(response)
+
+    async def all(  # pylint: disable=too-many-arguments
+        self,
+        search: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        page: int = None,
+        limit: int = None,
+    ) -> dict:
+        """Returns a paginated list of receipts. See ReceiptsClient.all
+
+        Returns:
+            dict: List of receipts
+        """
+        params = self._get_list_params(
+            search, start_date=start_date, end_date=end_date, page=page, limit=limit
+        )
+        url = self._get_request_url()
+        response = await self._execute_request("GET", url, params)
+        return self._decode_json(response)
+
+    async def retrieve(self, receipt_id: str) -> dict:
+        """Retrieves a single receipt object. See ReceiptsClient.retrieve
+
+        Returns:
+            dict: Receipt object
+        """
+        url = self._get_request_url([receipt_id])
+        response = await self._execute_request("GET", url)
+        return self._decode_json(response)
+
+    async def cancel(self, receipt_id: str) -> dict:
+        """Cancels a receipt. See ReceiptsClient.cancel
+
+        Returns:
+            dict: Cancelled receipt object
+        """
+        url = self._get_request_url([receipt_id])
+        response = await self._execute_request("DELETE", url)
+        return self._decode_json(response)
+
+    async def invoice(self, receipt_id: str, invoice_data: dict) -> dict:
+        """Creates an invoice object from a receipt. See ReceiptsClient.invoice
+
+        Returns:
+            dict: Created invoice object
+        """
+        url = self._get_request_url([receipt_id, "invoice"])
+        response = await self._execute_request("POST", url, json_data=invoice_data)
+        return self._decode_json(response)
+
+    async def create_global_invoice(self, data: dict) -> dict:
+        """Creates a global invoice. See ReceiptsClient.create_global_invoice
+
+        Returns:
+            dict: Created invoice object
+        """
+        url = self._get_request_url(["global-invoice"])
+        response = await self._execute_request("POST", url, json_data=data)
+        return self._decode_json(response)
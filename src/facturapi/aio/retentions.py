@@ -0,0 +1,105 @@
+"""Async Retentions API endpoint"""
+from datetime import datetime
+
+from ..retentions import RetentionsClient
+from .download import AsyncDownloadMixin
+from .http import AsyncBaseClient
+from .pagination import AsyncPaginatedClientMixin
+
+
+class AsyncRetentionsClient(AsyncDownloadMixin, AsyncPaginatedClientMixin, AsyncBaseClient):
+    """Async Retentions API client. Mirrors RetentionsClient"""
+
+    endpoint = RetentionsClient.endpoint
+
+    async def create(self, data: dict) -> dict:
+        """Creates a new Retention. See RetentionsClient.create
+
+        Returns:
+            dict: Created retention object
+        """
+        url = self._get_request_url()
+        response = await self._execute_request("POST", url, json_data=data)
+        return self._decode_json(response)
+
+    async def all(  # pylint: disable=too-many-arguments
+        self,
+        search: str = None,
+        customer_id: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        page: int = None,
+        limit: int = None,
+    ) -> dict:
+        """Returns a paginated list of retentions. See RetentionsClient.all
+
+        Returns:
+            dict: List of retentions
+        """
+        params = self._get_list_params(
+            search, customer_id, start_date, end_date, page, limit
+        )
+        url = self._get_request_url()
+        response = await self._execute_request("GET", url, params)
+        return self._decode_json(response)
+
+    async def retrieve(self, retention_id: str) -> dict:
+        """Retrieves a single retention object. See RetentionsClient.retrieve
+
+        Returns:
+            dict: Retention object
+        """
+        url = self._get_request_url([retention_id])
+        response = await self._execute_request("GET", url)
+        return self._decode_json(response)
+
+    async def cancel(self, retention_id: str) -> dict:
+        """Cancels a retention. See RetentionsClient.cancel
+
+        Returns:
+            dict: Cancelled retention object
+        """
+        url = self._get_request_url([retention_id])
+        response = await self._execute_request("DELETE", url)
+        return self._decode_json(response)
+
+    async def download_pdf(self, retention_id: str) -> bytes:
+        """Download retention PDF file
+
+        Returns:
+            bytes: Retention PDF file
+        """
+        url = self._get_download_file_url("pdf", retention_id)
+        response = await self._execute_request("GET", url)
+        return response.content
+
+    async def download_xml(self, retention_id: str) -> bytes:
+        """Download retention XML file
+
+        Returns:
+            bytes: Retention XML file
+        """
+        url = self._get_download_file_url("xml", retention_id)
+        response = await self._execute_request("GET", url)
+        return response.content
+
+    async def download_zip(self, retention_id: str) -> bytes:
+        """Download retention ZIP file
+
+        Returns:
+            bytes: Retention ZIP file
+        """
+        url = self._get_download_file_url("zip", retention_id)
+        response = await self._execute_request("GET", url)
+        return response.content
+
+    async def send_by_email(self, retention_id: str, email: str = None) -> dict:
+        """Send the retention by email. See RetentionsClient.send_by_email
+
+        Returns:
+            dict: Response message
+        """
+        url = self._get_request_url([retention_id, "email"])
+        data = {"email": email} if email else {}
+        response = await self._execute_request("POST", url, json_data=data)
+        return self._decode_json(response)
@@ -0,0 +1,56 @@
+"""Coalescing of concurrent identical requests for the async clients"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class AsyncSingleFlight:
+    """Runs a single call at a time for each key. Tasks that ask for a key already in flight
+    await that call and receive its result or exception instead of making their own.
+    Cancelling a waiter does not cancel the shared call.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {len(self)} in flight>"
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _finish(self, key: str, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # Marks the exception as retrieved when every waiter was cancelled
+            future.exception()
+
+    async def do(self, key: str, function: Callable[[], Awaitable[Any]]) -> Any:
+        """Awaits a function, or the call of the same key that is in flight
+
+        Args:
+            key (str): Key of the call, e.g. the cache key of a GET request
+            function (Callable[[], Awaitable[Any]]): Coroutine function to call
+
+        Returns:
+            Any: Result of the function
+        """
+        future = self._calls.get(key)
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            future = asyncio.ensure_future(function())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._finish(key, f))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def forget_prefix(self, prefix: str) -> None:
+        """Stops sharing the calls in flight whose key starts with a prefix, so the next callers
+        make a new call. Used after a write, so reads never receive a response older than it
+
+        Args:
+            prefix (str): Key prefix
+        """
+        for key in [k for k in self._calls if k.startswith(prefix)]:
+            del self._calls[key]
@@ -0,0 +1,57 @@
+"""In-memory fake of the Facturapi API for the async clients. See facturapi.testing"""
+import asyncio
+
+import httpx
+
+from ..testing import FakeFacturapi
+from .transport import AsyncBaseTransport
+
+
+class AsyncFakeTransport(AsyncBaseTransport):
+    """Transport that sends the requests of the async clients to a FakeFacturapi instead of the
+    network. Latency is simulated with asyncio.sleep. Requests slower than their read timeout
+    raise httpx.ReadTimeout
+
+    Args:
+        server (FakeFacturapi, optional): Fake server. Defaults to a new empty one.
+    """
+
+    def __init__(self, server: FakeFacturapi = None) -> None:
+        self.server = server if server is not None else FakeFacturapi()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.server}>"
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        trace = kwargs.get("extensions", {}).get("trace")
+        latency = self.server.begin_request()
+        try:
+            if trace is not None:
+                await trace("http11.receive_response_headers.started", {})
+            read_timeout = kwargs["timeout"].read if kwargs.get("timeout") else None
+            if read_timeout is not None and latency > read_timeout:
+                await asyncio.sleep(read_timeout)
+                raise httpx.ReadTimeout(
+                    "Read timed out", request=httpx.Request(method, url)
+                )
+            if latency > 0:
+                await asyncio.sleep(latency)
+            if trace is not None:
+                await trace("http11.receive_response_headers.complete", {})
+            fake_response = self.server.handle(
+                method,
+                url,
+                params=kwargs.get("params"),
+                body=kwargs.get("content"),
+                headers=kwargs.get("headers"),
+                auth=kwargs.get("auth"),
+            )
+        finally:
+            self.server.end_request()
+
+        return httpx.Response(
+            fake_response.status_code,
+            headers=fake_response.headers,
+            content=fake_response.content,
+            request=httpx.Request(method, url, params=kwargs.get("params")),
+        )
@@ -0,0 +1,59 @@
+"""Async utility endpoints"""
+from ..exceptions import DeadlineExceeded, FacturapiException
+from ..health import CircuitBreaker
+from ..ratelimit import TokenBucket
+from ..retry import RetryPolicy
+from ..tools import HealthCheck, ToolsClient
+from .http import AsyncBaseClient
+
+
+class AsyncHealthCheck(AsyncBaseClient):
+    """Async healthcheck service. Mirrors HealthCheck"""
+
+    endpoint = HealthCheck.endpoint
+
+    def __init__(  # pylint: disable=unused-argument,too-many-arguments
+        self,
+        api_key: str,
+        circuit_breaker: CircuitBreaker = None,
+        rate_limiter: TokenBucket = None,
+        retry_policy: RetryPolicy = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(api_key, **kwargs)
+
+    async def check_status(self) -> bool:
+        """Checks service status. See HealthCheck.check_status
+
+        Returns:
+            bool: True if status is ok, False if the API is unreachable or answers with a 5xx
+        """
+        url = self._get_request_url()
+        self.last_status = None
+        try:
+            response = await self._execute_request("GET", url)
+        except DeadlineExceeded:
+            raise
+        except FacturapiException:
+            status = self.last_status
+            if status is None or status >= self.STATUS_INTERNAL_SERVER_ERROR:
+                return False
+            raise
+        return self._decode_json(response)["ok"]
+
+
+class AsyncToolsClient(AsyncBaseClient):
+    """Async Tools API endpoint. Mirrors ToolsClient"""
+
+    endpoint = ToolsClient.endpoint
+
+    async def validate_tax_id(self, tax_id: str) -> dict:
+        """Check the status of a tax ID (RFC) in the list of EFOS.
+        See ToolsClient.validate_tax_id
+
+        Returns:
+            dict: EFOS validation result
+        """
+        url = self._get_request_url()
+        response = await self._execute_request("GET", url, {"tax_id": tax_id})
+        return self._decode_json(response)["efos"]
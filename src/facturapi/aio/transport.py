@@ -0,0 +1,102 @@
+"""Non-blocking HTTP transport shared by the async API clients"""
+from abc import ABC, abstractmethod
+
+try:
+    import httpx
+except ImportError as error:  # pragma: no cover
+    raise ImportError(
+        "The async client requires httpx. Install it with: pip install facturapi-python[async]"
+    ) from error
+
+
+class AsyncBaseTransport(ABC):
+    """Sends the requests of the async API clients. Mirrors BaseTransport"""
+
+    closed = False
+
+    async def __aenter__(self) -> "AsyncBaseTransport":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    @abstractmethod
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Sends a HTTP request
+
+        Args:
+            method (str): HTTP method
+            url (str): URL for the request
+            **kwargs: params, content, headers, auth, stream and timeout, as accepted by
+                httpx.AsyncClient.request
+
+        Returns:
+            httpx.Response: HTTP response
+        """
+
+    async def aclose(self) -> None:
+        """Releases the resources of the transport"""
+        self.closed = True
+
+
+class AsyncHTTPTransport(AsyncBaseTransport):
+    """Connection pool shared by every async API client of an AsyncFacturapi instance.
+    The transport does not hold credentials, so it can also be shared between several API keys.
+
+    Args:
+        max_connections (int, optional): Maximum number of concurrent connections.
+            Defaults to 100.
+        max_keepalive_connections (int, optional): Maximum number of idle connections kept
+            alive. Defaults to 20.
+        keepalive_expiry (float, optional): Seconds an idle connection is kept alive.
+            Defaults to 5.0.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+    ) -> None:
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.closed = False
+
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.session = httpx.AsyncClient(
+            limits=limits, headers={"Content-Type": "application/json"}
+        )
+
+    def __repr__(self) -> str:
+        status = "closed" if self.closed else "open"
+        return f"<{self.__class__.__name__}: {status}, max_connections={self.max_connections}>"
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Sends a HTTP request through the connection pool
+
+        Args:
+            method (str): HTTP method
+            url (str): URL for the request
+            **kwargs: Keyword arguments accepted by httpx.AsyncClient.request. With
+                `stream=True` the body is not read and the response must be closed by the caller
+
+        Returns:
+            httpx.Response: HTTP response
+        """
+        stream = kwargs.pop("stream", False)
+        if not stream:
+            return await self.session.request(method, url, **kwargs)
+
+        auth = kwargs.pop("auth", httpx.USE_CLIENT_DEFAULT)
+        request = self.session.build_request(method, url, **kwargs)
+        return await self.session.send(request, auth=auth, stream=True)
+
+    async def aclose(self) -> None:
+        """Closes all the pooled connections"""
+        await self.session.aclose()
+        self.closed = True
@@ -0,0 +1,394 @@
+"""Bulk archiving of invoice and retention files"""
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import datetime
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Tuple, Union
+
+from .bulk import BulkResult, run_bulk
+from .download import DEFAULT_CHUNK_SIZE, check_file_format, write_chunks
+
+# Downloads bigger than this are spooled to disk before they are added to an archive
+SPOOL_SIZE = 1024 * 1024
+
+
+class ArchiveStats:
+    """Progress and throughput of an archiving run"""
+
+    def __init__(self) -> None:
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.files = 0
+        self.bytes = 0
+        self.skipped = 0
+        self.errors: List[BulkResult] = []
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}: {self.files} files "
+            f"({self.files_per_second:.1f}/s, {self.bytes_per_second / 1024:.0f} KiB/s) "
+            f"skipped={self.skipped} errors={len(self.errors)}>"
+        )
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the run started, or the run duration once finished"""
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def files_per_second(self) -> float:
+        """Files written per second"""
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Bytes written per second"""
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+
+class DirectoryWriter:
+    """Writes every file to a directory. Downloads are streamed straight to their path
+
+    Args:
+        path (str): Directory path. Created if it does not exist
+    """
+
+    streams_to_path = True
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def get_path(self, name: str) -> str:
+        """Returns the path of a file in the directory"""
+        return os.path.join(self.path, name)
+
+    def close(self) -> None:
+        """Nothing to close"""
+
+
+class ZipWriter:
+    """Writes every file to a ZIP archive. Appends to the archive if it already exists
+
+    Args:
+        destination (Union[str, BinaryIO]): Archive path or writable binary stream
+    """
+
+    streams_to_path = False
+
+    def __init__(self, destination: Union[str, BinaryIO]) -> None:
+        mode = "a" if isinstance(destination, str) and os.path.exists(destination) else "w"
+        self._archive = zipfile.ZipFile(destination, mode, zipfile.ZIP_DEFLATED)
+
+    def add(self, name: str, file: BinaryIO, size: int) -> None:  # pylint: disable=unused-argument
+        """Adds a file to the archive
+
+        Args:
+            name (str): Name of the file in the archive
+            file (BinaryIO): File content, positioned at the start
+            size (int): Size of the file in bytes
+        """
+        with self._archive.open(name, "w", force_zip64=True) as entry:
+            shutil.copyfileobj(file, entry, DEFAULT_CHUNK_SIZE)
+
+    def close(self) -> None:
+        """Writes the archive directory. The archive is not valid until closed"""
+        self._archive.close()
+
+
+class TarWriter:
+    """Writes every file to a tar archive. Uncompressed archives are appended to if they already
+    exist, compressed ones (.tar.gz, .tgz) are overwritten, see DocumentArchiver
+
+    Args:
+        destination (Union[str, BinaryIO]): Archive path or writable binary stream
+    """
+
+    streams_to_path = False
+
+    def __init__(self, destination: Union[str, BinaryIO]) -> None:
+        if not isinstance(destination, str):
+            self._archive = tarfile.open(fileobj=destination, mode="w|")
+        elif destination.endswith((".tar.gz", ".tgz")):
+            self._archive = tarfile.open(destination, "w:gz")
+        else:
+            mode = "a" if os.path.exists(destination) else "w"
+            self._archive = tarfile.open(destination, mode)
+
+    def add(self, name: str, file: BinaryIO, size: int) -> None:
+        """Adds a file to the archive
+
+        Args:
+            name (str): Name of the file in the archive
+            file (BinaryIO): File content, positioned at the start
+            size (int): Size of the file in bytes
+        """
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = int(time.time())
+        self._archive.addfile(info, file)
+
+    def close(self) -> None:
+        """Writes the end of the archive"""
+        self._archive.close()
+
+
+def get_archive_format(destination: Union[str, BinaryIO], archive_format: str = None) -> str:
+    """Returns the archive format of a destination. The format is guessed from the path
+    extension: .zip, .tar, .tar.gz or .tgz; any other path is a directory
+
+    Args:
+        destination (Union[str, BinaryIO]): Directory, archive path or writable binary stream
+        archive_format (str, optional): "zip" or "tar". Required for streams. Defaults to None.
+
+    Raises:
+        ValueError: If the format is unknown
+
+    Returns:
+        str: "zip" or "tar", or None for directories
+    """
+    if archive_format is None and isinstance(destination, str):
+        if destination.endswith(".zip"):
+            return "zip"
+        if destination.endswith((".tar", ".tar.gz", ".tgz")):
+            return "tar"
+        return None
+    if archive_format not in ("zip", "tar"):
+        raise ValueError("archive_format must be 'zip' or 'tar' when writing to a stream")
+    return archive_format
+
+
+def get_writer(destination: Union[str, BinaryIO], archive_format: str = None):
+    """Returns the writer of a destination. See get_archive_format
+
+    Args:
+        destination (Union[str, BinaryIO]): Directory, archive path or writable binary stream
+        archive_format (str, optional): "zip" or "tar". Required for streams. Defaults to None.
+
+    Returns:
+        Union[DirectoryWriter, ZipWriter, TarWriter]: Destination writer
+    """
+    archive_format = get_archive_format(destination, archive_format)
+    if archive_format is None:
+        return DirectoryWriter(destination)
+    writers = {"zip": ZipWriter, "tar": TarWriter}
+    return writers[archive_format](destination)
+
+
+class DocumentArchiver:
+    """Downloads the files of many invoices or retentions concurrently and writes them to a
+    directory or a ZIP or tar archive.
+
+    Every file written is recorded in a manifest, a JSON Lines file. If a run is interrupted,
+    the next run with the same manifest skips the files it already has. Archives are only valid
+    once closed, so their files are recorded when the archive is closed, with the size of the
+    closed archive. An archive that changed since, e.g. by an interrupted run, can't be resumed,
+    and neither can compressed tar archives, which can't be appended to.
+
+    Args:
+        client (Union[InvoicesClient, RetentionsClient]): Client used to download the files
+        destination (Union[str, BinaryIO]): Directory, archive path or writable binary stream
+        file_formats (Iterable[str], optional): Formats to download. Defaults to ("xml", "pdf").
+        max_workers (int, optional): Maximum number of parallel downloads. Defaults to 4.
+        rate_limit (float, optional): Maximum downloads per second. Defaults to None.
+        manifest (str, optional): Path of the manifest. Defaults to "manifest.jsonl" inside a
+            directory, or the archive path plus ".manifest.jsonl". Streams have no manifest
+            unless one is given.
+        archive_format (str, optional): "zip" or "tar", required when destination is a stream.
+            Defaults to None.
+        on_progress (Callable[[ArchiveStats], None], optional): Called after every file written.
+            Defaults to None.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        client,
+        destination: Union[str, BinaryIO],
+        file_formats: Iterable[str] = ("xml", "pdf"),
+        max_workers: int = 4,
+        rate_limit: float = None,
+        manifest: str = None,
+        archive_format: str = None,
+        on_progress: Callable[[ArchiveStats], None] = None,
+    ) -> None:
+        self.client = client
+        self.file_formats = tuple(check_file_format(f) for f in file_formats)
+        self.max_workers = max_workers
+        self.rate_limit = rate_limit
+        self.on_progress = on_progress
+        self.archive_format = get_archive_format(destination, archive_format)
+
+        if manifest is None and isinstance(destination, str):
+            if self.archive_format is None:
+                manifest = os.path.join(destination, "manifest.jsonl")
+            else:
+                manifest = f"{destination}.manifest.jsonl"
+        self.manifest = manifest
+        self.destination = destination
+        self.archived, closed_size = self._load_manifest()
+        if self.archive_format is not None:
+            self._check_resume(closed_size)
+        self._manifest_lock = threading.Lock()
+        # Files added to the archive, recorded in the manifest once it is closed
+        self._pending = []
+        self.writer = get_writer(destination, self.archive_format)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {len(self.archived)} files archived>"
+
+    def __enter__(self) -> "DocumentArchiver":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _load_manifest(self) -> Tuple[set, int]:
+        """Returns the names of the files already archived and the size of the archive when it
+        was last closed
+        """
+        names, closed_size = set(), None
+        if not self.manifest or not os.path.exists(self.manifest):
+            return names, closed_size
+        with open(self.manifest, encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if "closed_size" in entry:
+                    closed_size = entry["closed_size"]
+                else:
+                    names.add(entry["name"])
+        return names, closed_size
+
+    def _check_resume(self, closed_size: int) -> None:
+        """Checks that an archive can be resumed without losing the files it already has
+
+        Raises:
+            ValueError: If the archive can't be appended to or was not closed
+        """
+        if not isinstance(self.destination, str) or not self.archived:
+            return
+        if not os.path.exists(self.destination):
+            # The archive was removed, so its manifest is stale
+            self.archived = set()
+            os.remove(self.manifest)
+            return
+        if self.destination.endswith((".tar.gz", ".tgz")):
+            raise ValueError(
+                f"{self.destination} can't be resumed: compressed tar archives can't be "
+                "appended to. Use a new destination, or a .zip or .tar archive"
+            )
+        if os.path.getsize(self.destination) != closed_size:
+            raise ValueError(
+                f"{self.destination} can't be resumed: it changed after it was closed, e.g. "
+                "by an interrupted run. Use a new destination"
+            )
+
+    def _write_manifest(self, entries: List[dict]) -> None:
+        """Appends entries to the manifest"""
+        if not self.manifest:
+            return
+        with self._manifest_lock, open(self.manifest, "a", encoding="utf-8") as file:
+            file.writelines(json.dumps(entry) + "\n" for entry in entries)
+
+    def _record(self, name: str, size: int) -> None:
+        """Records a written file. Files of archives are added to the manifest on close"""
+        self.archived.add(name)
+        if self.archive_format is None:
+            self._write_manifest([{"name": name, "size": size}])
+        else:
+            self._pending.append({"name": name, "size": size})
+
+    def _download(self, item: Tuple[str, str]) -> tuple:
+        """Downloads a file. Directories get the file directly, archives get a spooled copy
+        that is added from the calling thread, since archive writers are not thread safe
+        """
+        object_id, file_format = item
+        name = f"{object_id}.{file_format}"
+        chunks = self.client.iter_download(object_id, file_format)
+        if self.writer.streams_to_path:
+            return name, None, write_chunks(chunks, self.writer.get_path(name))
+
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        try:
+            size = write_chunks(chunks, spool)
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        return name, spool, size
+
+    def archive(self, object_ids: Iterable[str]) -> ArchiveStats:
+        """Archives the files of the given documents
+
+        Args:
+            object_ids (Iterable[str]): Ids of the invoices or retentions. Consumed lazily
+
+        Returns:
+            ArchiveStats: Files written, skipped and failed, and the throughput of the run
+        """
+        stats = ArchiveStats()
+
+        def get_items() -> Iterator[Tuple[str, str]]:
+            for object_id in object_ids:
+                for file_format in self.file_formats:
+                    if f"{object_id}.{file_format}" in self.archived:
+                        stats.skipped += 1
+                    else:
+                        yield object_id, file_format
+
+        results = run_bulk(self._download, get_items(), self.max_workers, self.rate_limit)
+        for result in results:
+            if not result.ok:
+                stats.errors.append(result)
+                continue
+
+            name, spool, size = result.result
+            if spool is not None:
+                with spool:
+                    self.writer.add(name, spool, size)
+            self._record(name, size)
+            stats.files += 1
+            stats.bytes += size
+            if self.on_progress:
+                self.on_progress(stats)
+
+        stats.finished_at = time.monotonic()
+        return stats
+
+    def archive_range(
+        self,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        **kwargs,
+    ) -> ArchiveStats:
+        """Archives the files of every document issued in a date range
+
+        Args:
+            start_date (datetime, optional): Lower limit of the date range. Defaults to None.
+            end_date (datetime, optional): Upper limit of the date range. Defaults to None.
+            **kwargs: Other search arguments accepted by the client's `all` method
+
+        Returns:
+            ArchiveStats: Files written, skipped and failed, and the throughput of the run
+        """
+        documents = self.client.iter_all(
+            prefetch=True, start_date=start_date, end_date=end_date, **kwargs
+        )
+        return self.archive(document["id"] for document in documents)
+
+    def close(self) -> None:
+        """Finishes the destination archive and records its files in the manifest"""
+        self.writer.close()
+        if self.archive_format is None:
+            return
+        entries = self._pending
+        if isinstance(self.destination, str):
+            entries = [*entries, {"closed_size": os.path.getsize(self.destination)}]
+        self._write_manifest(entries)
+        self._pending = []
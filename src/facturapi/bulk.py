@@ -0,0 +1,93 @@
+"""Bulk operations with bounded concurrency"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+from .ratelimit import TokenBucket
+from .timeouts import submit_in_context
+
+
+class BulkResult(NamedTuple):
+    """Result of a single item of a bulk operation"""
+
+    index: int
+    payload: Any
+    result: Any = None
+    error: Exception = None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"error: {self.error}"
+        return f"<{self.__class__.__name__}: {self.index} {status}>"
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=invalid-name
+        """True if the item was processed without errors"""
+        return self.error is None
+
+
+def run_bulk(
+    func: Callable[[Any], Any],
+    payloads: Iterable,
+    max_workers: int = 4,
+    rate_limit: float = None,
+    ordered: bool = False,
+    with_index: bool = False,
+) -> Iterator[BulkResult]:
+    """Calls func with every payload over a bounded thread pool. Errors raised by func, from the
+    API or otherwise, are captured in the item result, so a bad payload does not abort the batch. Payloads are consumed
+    lazily, at most `max_workers * 2` are in flight at once. The calls share the caller's
+    deadline.
+
+    Args:
+        func (Callable[[Any], Any]): Function to call with each payload
+        payloads (Iterable): Payloads to process
+        max_workers (int, optional): Maximum number of parallel calls. Defaults to 4.
+        rate_limit (float, optional): Maximum calls per second. Defaults to None.
+        ordered (bool, optional): Yield the results in the same order as the payloads. If False,
+            results are yielded as soon as they are ready. Defaults to False.
+        with_index (bool, optional): Pass the position of the payload to func as a second
+            argument. Defaults to False.
+
+    Yields:
+        BulkResult: Result of each payload
+    """
+    limiter = TokenBucket(rate_limit) if rate_limit else None
+
+    def call(index: int, payload: Any) -> BulkResult:
+        if limiter:
+            limiter.acquire()
+        try:
+            args = (payload, index) if with_index else (payload,)
+            return BulkResult(index, payload, func(*args))
+        except Exception as error:  # pylint: disable=broad-except
+            return BulkResult(index, payload, error=error)
+
+    items = enumerate(payloads)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+
+    def submit_next() -> None:
+        item = next(items, None)
+        if item is not None:
+            pending.append(submit_in_context(executor, call, *item))
+
+    try:
+        for _ in range(max_workers * 2):
+            submit_next()
+
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+
+            for future in done:
+                result = future.result()
+                submit_next()
+                yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
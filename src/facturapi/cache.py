@@ -0,0 +1,203 @@
+"""Response cache for read-mostly endpoints"""
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+
+def get_key_namespace(api_key: str) -> str:
+    """Returns the namespace of the data stored for an API key, so the caches and the mirror
+    never serve the data of another organization and never store the key itself
+
+    Args:
+        api_key (str): Facturapi secret key
+
+    Returns:
+        str: Hash of the key
+    """
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+class BaseCache(ABC):
+    """Base class of the response caches. Values are decoded JSON responses.
+
+    Args:
+        maxsize (int, optional): Maximum number of entries. The least recently used entries are
+            evicted first. Defaults to 1024.
+        default_ttl (float, optional): Seconds an entry is valid when no TTL is given.
+            Defaults to 300.
+    """
+
+    def __init__(self, maxsize: int = 1024, default_ttl: float = 300) -> None:
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: hits={self.hits} misses={self.misses}>"
+
+    def _get_expiration(self, ttl: float = None) -> float:
+        return time.time() + (self.default_ttl if ttl is None else ttl)
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Returns a cached value
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Any: Cached value, or None if it is missing or expired
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float = None) -> None:
+        """Stores a value
+
+        Args:
+            key (str): Cache key
+            value (Any): JSON serializable value
+            ttl (float, optional): Seconds the value is valid. Defaults to default_ttl.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Removes a value
+
+        Args:
+            key (str): Cache key
+        """
+
+    @abstractmethod
+    def invalidate_prefix(self, prefix: str) -> None:
+        """Removes all the values whose key starts with prefix
+
+        Args:
+            prefix (str): Key prefix
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes all the values"""
+
+
+class MemoryCache(BaseCache):
+    """In-memory LRU cache with expiration. Safe to share between threads"""
+
+    def __init__(self, maxsize: int = 1024, default_ttl: float = 300) -> None:
+        super().__init__(maxsize, default_ttl)
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[1]
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: float = None) -> None:
+        with self._lock:
+            self._entries[key] = (self._get_expiration(ttl), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache(BaseCache):
+    """LRU cache with expiration stored in a SQLite database, so it survives restarts and can
+    be shared between processes
+
+    Args:
+        path (str): Path of the database file
+        maxsize (int, optional): Maximum number of entries. Defaults to 1024.
+        default_ttl (float, optional): Seconds an entry is valid when no TTL is given.
+            Defaults to 300.
+    """
+
+    def __init__(self, path: str, maxsize: int = 1024, default_ttl: float = 300) -> None:
+        super().__init__(maxsize, default_ttl)
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT, expires_at REAL, accessed_at REAL)"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> Any:
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float = None) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), self._get_expiration(ttl), time.time()),
+            )
+            self._connection.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries "
+                "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Closes the database connection"""
+        self._connection.close()
@@ -0,0 +1,357 @@
+"""Offline index of SAT's Products/Services and Units of Measurement catalogs
+
+The index is a SQLite database with a full-text prefix index. It can be filled from the API
+with the sync command or from a CSV export of the SAT catalogs:
+
+    python -m facturapi sync catalogs.db --catalog products --query "servicio"
+    python -m facturapi load catalogs.db --catalog units c_ClaveUnidad.csv
+"""
+import argparse
+import csv
+import math
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Iterable
+
+from .pagination import iter_pages
+
+CATALOGS = ("products", "units")
+# Maximum page size of the catalog search endpoints
+CATALOG_PAGE_SIZE = 100
+
+
+def _escape_like(value: str) -> str:
+    """Escapes the LIKE wildcards of a value, to be used with ESCAPE '\\'"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class CatalogIndex:
+    """Local, versioned store of the SAT catalogs used to answer searches without network.
+
+    Args:
+        path (str): Path of the SQLite database. Created if it does not exist
+        mmap_size (int, optional): Bytes of the database mapped in memory. Defaults to 64 MiB.
+    """
+
+    def __init__(self, path: str, mmap_size: int = 64 * 1024 * 1024) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries (catalog TEXT, key TEXT, "
+                "description TEXT, PRIMARY KEY (catalog, key))"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)"
+            )
+        self.full_text = self._create_full_text_index()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.path} version={self.version}>"
+
+    def _create_full_text_index(self) -> bool:
+        """Creates the FTS5 index. Returns False if SQLite was built without FTS5, in which case
+        searches use LIKE queries. Entries stored before the index existed are indexed when it
+        is created
+        """
+        exists = self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'entries_fts'"
+        ).fetchone()
+        try:
+            with self._connection:
+                self._connection.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5("
+                    "description, content='entries', content_rowid='rowid')"
+                )
+                self._connection.executescript(
+                    "CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN "
+                    "INSERT INTO entries_fts (rowid, description) "
+                    "VALUES (new.rowid, new.description); END;"
+                    "CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN "
+                    "INSERT INTO entries_fts (entries_fts, rowid, description) "
+                    "VALUES ('delete', old.rowid, old.description); END;"
+                    "CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE ON entries BEGIN "
+                    "INSERT INTO entries_fts (entries_fts, rowid, description) "
+                    "VALUES ('delete', old.rowid, old.description); "
+                    "INSERT INTO entries_fts (rowid, description) "
+                    "VALUES (new.rowid, new.description); END;"
+                )
+                if not exists:
+                    self._connection.execute(
+                        "INSERT INTO entries_fts (entries_fts) VALUES ('rebuild')"
+                    )
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def _get_meta(self, name: str) -> str:
+        row = self._connection.execute(
+            "SELECT value FROM meta WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    @property
+    def version(self) -> str:
+        """Version of the catalogs stored in the index"""
+        return self._get_meta("version")
+
+    @property
+    def synced_at(self) -> datetime:
+        """Date of the last sync"""
+        value = self._get_meta("synced_at")
+        return datetime.fromisoformat(value) if value else None
+
+    def is_complete(self, catalog: str) -> bool:
+        """Checks if the whole catalog was loaded, so searches can be answered from the index
+
+        Args:
+            catalog (str): "products" or "units"
+
+        Returns:
+            bool: True if the catalog was marked as complete
+        """
+        return self._get_meta(f"complete.{catalog}") is not None
+
+    def mark_complete(self, catalog: str) -> None:
+        """Marks a catalog as complete, e.g. after loading the official SAT export. Searches of
+        an incomplete catalog are sent to the API, except exact key lookups
+
+        Args:
+            catalog (str): "products" or "units"
+        """
+        if catalog not in CATALOGS:
+            raise ValueError(f"catalog must be one of {CATALOGS}")
+        now = datetime.now(timezone.utc)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                (f"complete.{catalog}", now.isoformat()),
+            )
+
+    def set_version(self, version: str = None) -> None:
+        """Stores the catalogs version and the sync date
+
+        Args:
+            version (str, optional): Version name. Defaults to the current UTC date.
+        """
+        now = datetime.now(timezone.utc)
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [
+                    ("version", version or now.strftime("%Y%m%d")),
+                    ("synced_at", now.isoformat()),
+                ],
+            )
+
+    def upsert(self, catalog: str, items: Iterable[dict]) -> int:
+        """Adds or updates catalog entries
+
+        Args:
+            catalog (str): "products" or "units"
+            items (Iterable[dict]): Entries with "key" and "description", as returned by the API
+
+        Returns:
+            int: Number of entries written
+        """
+        if catalog not in CATALOGS:
+            raise ValueError(f"catalog must be one of {CATALOGS}")
+        rows = [(catalog, str(i["key"]), i.get("description", "")) for i in items]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?) ON CONFLICT (catalog, key) "
+                "DO UPDATE SET description = excluded.description "
+                "WHERE description IS NOT excluded.description",
+                rows,
+            )
+        return len(rows)
+
+    def get(self, catalog: str, key: str) -> dict:
+        """Returns the entry of a key
+
+        Args:
+            catalog (str): "products" or "units"
+            key (str): Key of the entry
+
+        Returns:
+            dict: Entry with "key" and "description", or None if it is not in the index
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT key, description FROM entries WHERE catalog = ? AND key = ?",
+                (catalog, key),
+            ).fetchone()
+        return {"key": row[0], "description": row[1]} if row else None
+
+    def _get_match_query(self, search: str) -> str:
+        """Builds a FTS5 query that matches every word of search as a prefix"""
+        words = re.findall(r"\w+", search)
+        return " ".join(f'"{word}"*' for word in words)
+
+    def search(self, catalog: str, search: str, page: int = None, limit: int = None) -> dict:
+        """Searches the catalog by key prefix or by the words of the description. Results are
+        sorted by relevance: key matches first, then the best full-text matches
+
+        Args:
+            catalog (str): "products" or "units"
+            search (str): Text to search
+            page (int, optional): Page of results to return, beginning from page 1.
+                Defaults to None.
+            limit (int, optional): Maximum quantity of results to return. Defaults to None.
+
+        Returns:
+            dict: Search results, in the same format returned by the API
+        """
+        page = page or 1
+        limit = limit or 10
+        match = self._get_match_query(search)
+        key_prefix = f"{_escape_like(search.strip())}%"
+        source = "entries"
+        source_params = []
+        conditions = ["key LIKE ? ESCAPE '\\'"]
+        params = [key_prefix]
+        order = "key LIKE ? ESCAPE '\\' DESC, key"
+        if match and self.full_text:
+            source = (
+                "entries LEFT JOIN (SELECT rowid, rank FROM entries_fts "
+                "WHERE entries_fts MATCH ?) AS matches ON matches.rowid = entries.rowid"
+            )
+            source_params.append(match)
+            conditions.append("matches.rowid IS NOT NULL")
+            order = "key LIKE ? ESCAPE '\\' DESC, matches.rank, key"
+        elif match:
+            conditions.append("description LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(search.strip())}%")
+
+        where = f"catalog = ? AND ({' OR '.join(conditions)})"
+        offset = (page - 1) * limit
+        with self._lock:
+            total = self._connection.execute(
+                f"SELECT COUNT(*) FROM {source} WHERE {where}",
+                [*source_params, catalog, *params],
+            ).fetchone()[0]
+            rows = self._connection.execute(
+                f"SELECT key, description FROM {source} WHERE {where} "
+                f"ORDER BY {order} LIMIT ? OFFSET ?",
+                [*source_params, catalog, *params, key_prefix, limit, offset],
+            ).fetchall()
+
+        return {
+            "page": page,
+            "total_pages": math.ceil(total / limit),
+            "total_results": total,
+            "data": [{"key": key, "description": desc} for key, desc in rows],
+        }
+
+    def sync(self, catalogs_client, catalog: str, queries: Iterable[str]) -> int:
+        """Downloads the entries that match the queries from the API. The client's own index,
+        if any, is not used to answer the searches
+
+        Args:
+            catalogs_client (CatalogsClient): Client used to search the remote catalog
+            catalog (str): "products" or "units"
+            queries (Iterable[str]): Searches whose results are stored
+
+        Returns:
+            int: Number of entries written
+        """
+        if catalog not in CATALOGS:
+            raise ValueError(f"catalog must be one of {CATALOGS}")
+
+        count = 0
+        for query in queries:
+            pages = iter_pages(
+                lambda number, q=query: catalogs_client.search_remote(
+                    catalog, q, number, CATALOG_PAGE_SIZE
+                )
+            )
+            for page in pages:
+                count += self.upsert(catalog, page.get("data", []))
+        return count
+
+    def load_csv(
+        self,
+        catalog: str,
+        path: str,
+        key_column: str = "key",
+        description_column: str = "description",
+        complete: bool = False,
+    ) -> int:
+        """Loads the entries of a CSV file, e.g. an export of the official SAT catalog
+
+        Args:
+            catalog (str): "products" or "units"
+            path (str): Path of the CSV file
+            key_column (str, optional): Column with the key. Defaults to "key".
+            description_column (str, optional): Column with the description.
+                Defaults to "description".
+            complete (bool, optional): The file has the whole catalog, so it is marked as
+                complete. Defaults to False.
+
+        Returns:
+            int: Number of entries written
+        """
+        with open(path, newline="", encoding="utf-8") as file:
+            rows = csv.DictReader(file)
+            items = (
+                {"key": r[key_column], "description": r[description_column]} for r in rows
+            )
+            count = self.upsert(catalog, items)
+        if complete:
+            self.mark_complete(catalog)
+        return count
+
+    def close(self) -> None:
+        """Closes the database connection"""
+        self._connection.close()
+
+
+def main(argv: list = None) -> None:
+    """Command line entry point to sync or load the local catalogs"""
+    parser = argparse.ArgumentParser(prog="python -m facturapi")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = commands.add_parser("sync", help="Download catalog entries from the API")
+    sync_parser.add_argument("database")
+    sync_parser.add_argument("--catalog", choices=CATALOGS, required=True)
+    sync_parser.add_argument("--query", action="append", required=True)
+    sync_parser.add_argument("--version")
+    sync_parser.add_argument(
+        "--api-key", default=os.getenv("FACTURAPI_API_KEY"), help="Defaults to $FACTURAPI_API_KEY"
+    )
+
+    load_parser = commands.add_parser("load", help="Load catalog entries from a CSV file")
+    load_parser.add_argument("database")
+    load_parser.add_argument("csv_file")
+    load_parser.add_argument("--catalog", choices=CATALOGS, required=True)
+    load_parser.add_argument("--key-column", default="key")
+    load_parser.add_argument("--description-column", default="description")
+    load_parser.add_argument("--version")
+    load_parser.add_argument(
+        "--complete", action="store_true", help="The file has the whole catalog"
+    )
+
+    args = parser.parse_args(argv)
+    index = CatalogIndex(args.database)
+    if args.command == "sync":
+        from .catalogs import CatalogsClient  # pylint: disable=import-outside-toplevel
+
+        client = CatalogsClient(args.api_key)
+        count = index.sync(client, args.catalog, args.query)
+        client.close()
+    else:
+        count = index.load_csv(
+            args.catalog,
+            args.csv_file,
+            args.key_column,
+            args.description_column,
+            args.complete,
+        )
+    index.set_version(args.version)
+    print(f"{count} {args.catalog} entries stored in {args.database} ({index.version})")
+    index.close()
@@ -1,8 +1,59 @@
 """Catalogs API endpoint"""
+from .catalog_index import CatalogIndex
 from .http import BaseClient
 
 
-class CatalogsClient(BaseClient):
+class CatalogIndexMixin:
+    """Adds a local catalog index to the catalogs clients
+
+    Args:
+        api_key (str): Facturapi secret key
+        catalog_index (CatalogIndex, optional): Local index used to answer the searches without
+            network when its catalog is complete, or when the search is a key stored in it.
+            Other searches are sent to the API and their results are added to the index.
+            Defaults to None.
+    """
+
+    # Client method names of the remote searches, used to look up their cache TTLs
+    search_names = {
+        "products": "search_products",
+        "units": "search_units_of_measurement",
+    }
+
+    def __init__(self, api_key: str, catalog_index: CatalogIndex = None, **kwargs) -> None:
+        super().__init__(api_key, **kwargs)
+        self.catalog_index = catalog_index
+
+    def _search_index(self, catalog: str, search: str, page: int, limit: int) -> dict:
+        """Searches the local index. A partial index only answers exact key lookups, since its
+        totals and ranking would differ from the API
+
+        Returns:
+            dict: Search results, or None if the search must be sent to the API
+        """
+        if self.catalog_index is None:
+            return None
+        if self.catalog_index.is_complete(catalog):
+            return self.catalog_index.search(catalog, search, page, limit)
+        if (page or 1) != 1:
+            return None
+        entry = self.catalog_index.get(catalog, search.strip())
+        if entry is None:
+            return None
+        return {"page": 1, "total_pages": 1, "total_results": 1, "data": [entry]}
+
+    def _update_index(self, catalog: str, response: dict) -> dict:
+        """Adds the results of a remote search to the local index
+
+        Returns:
+            dict: The same response
+        """
+        if self.catalog_index is not None:
+            self.catalog_index.upsert(catalog, response.get("data", []))
+        return response
+
+
+class CatalogsClient(CatalogIndexMixin, BaseClient):
     """Catalogs API client"""
 
     endpoint = "catalogs"
@@ -21,15 +72,10 @@ class CatalogsClient(BaseClient):
         Returns:
             dict: List of products or services matching the query
         """
-        params = {"q": search}
-
-        if page:
-            params.update({"page": page})
-        if limit:
-            params.update({"limit": limit})
-
-        url = self._get_request_url(["products"])
-        return self._execute_request("GET", url, params).json()
+        local_result = self._search_index("products", search, page, limit)
+        if local_result is not None:
+            return local_result
+        return self.search_remote("products", search, page, limit)
 
     def search_units_of_measurement(
         self, search: str, page: int = None, limit: int = None
@@ -46,12 +92,29 @@ class CatalogsClient(BaseClient):
         Returns:
             dict: List of units of measurement
         """
-        params = {"q": search}
+        local_result = self._search_index("units", search, page, limit)
+        if local_result is not None:
+            return local_result
+        return self.search_remote("units", search, page, limit)
 
-        if page:
-            params.update({"page": page})
-        if limit:
-            params.update({"limit": limit})
+    def search_remote(
+        self, catalog: str, search: str, page: int = None, limit: int = None
+    ) -> dict:
+        """Searches a catalog in the API without using the local index. The results are added
+        to the index
+
+        Args:
+            catalog (str): "products" or "units"
+            search (str): Text to search
+            page (int, optional): Page of results to return, beginning from page 1.
+            Defaults to None.
+            limit (int, optional): Number from 1 to 100, represents the maximum quiantity of
+            results to return. Defaults to None.
 
-        url = self._get_request_url(["units"])
-        return self._execute_request("GET", url, params).json()
+        Returns:
+            dict: Search results
+        """
+        params = {"q": search, **self._get_list_params(page=page, limit=limit)}
+        url = self._get_request_url([catalog])
+        response = self._get_cached_json(self.search_names[catalog], url, params)
+        return self._update_index(catalog, response)
@@ -0,0 +1,84 @@
+"""JSON codecs used to encode request bodies and decode responses"""
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Callable, NamedTuple, Union
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+
+class JSONCodec(NamedTuple):
+    """JSON encoder and decoder pair"""
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[Union[bytes, str]], Any]
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.name}>"
+
+
+def _encode_default(obj: Any) -> Any:
+    """Encodes the types orjson supports natively, so every codec accepts the same bodies"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(
+        obj, separators=(",", ":"), ensure_ascii=False, default=_encode_default
+    ).encode("utf-8")
+
+
+def _ujson_dumps(obj: Any) -> bytes:
+    try:
+        return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+    except TypeError:
+        # Bodies with dates, enums or UUIDs are left to the standard library
+        return _json_dumps(obj)
+
+
+JSON_CODECS = {"json": JSONCodec("json", _json_dumps, json.loads)}
+if ujson is not None:
+    JSON_CODECS["ujson"] = JSONCodec("ujson", _ujson_dumps, ujson.loads)
+if orjson is not None:
+    JSON_CODECS["orjson"] = JSONCodec("orjson", orjson.dumps, orjson.loads)
+
+# Fastest codecs first
+CODEC_PREFERENCE = ("orjson", "ujson", "json")
+
+
+def get_json_codec(codec: Union[str, JSONCodec] = None) -> JSONCodec:
+    """Returns a JSON codec
+
+    Args:
+        codec (Union[str, JSONCodec], optional): Codec or name of an installed codec: "orjson",
+            "ujson" or "json". Defaults to the fastest installed codec.
+
+    Raises:
+        ValueError: If the codec is not installed
+
+    Returns:
+        JSONCodec: JSON codec
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        return next(JSON_CODECS[n] for n in CODEC_PREFERENCE if n in JSON_CODECS)
+    if codec not in JSON_CODECS:
+        raise ValueError(f"JSON codec {codec} is not installed, use one of {list(JSON_CODECS)}")
+    return JSON_CODECS[codec]
@@ -5,6 +5,7 @@ from typing import Union
 from .constants import TaxSystem
 from .exceptions import ValidationError
 from .http import BaseClient
+from .mirror import MirrorMixin
 from .models import (
     Customer,
     CustomerList,
@@ -12,13 +13,78 @@ from .models import (
     build_customer,
     build_customer_list,
 )
+from .pagination import PaginatedClientMixin
+
+
+ADDRESS_ATTRS = [
+    "street",
+    "exterior",
+    "interior",
+    "neighborhood",
+    "city",
+    "municipality",
+    "state",
+    "country",
+]
+
+
+def _get_customer_data(
+    legal_name: str,
+    tax_id: str,
+    tax_system: Union[TaxSystem, str],
+    zip_code: str,
+    **kwargs
+) -> dict:
+    """Builds the request body to create a customer. See CustomersClient.create"""
+    address = {
+        "zip": zip_code,
+        **{k: v for k, v in kwargs.items() if k in ADDRESS_ATTRS},
+    }
+
+    if isinstance(tax_system, TaxSystem):
+        tax_system = tax_system.value
+
+    customer_attrs = ["email", "phone"]
+    return {
+        "legal_name": legal_name,
+        "tax_id": tax_id,
+        "tax_system": tax_system,
+        "address": address,
+        **{k: v for k, v in kwargs.items() if k in customer_attrs},
+    }
+
+
+def _get_customer_update_data(**kwargs) -> dict:
+    """Builds the request body to update a customer. See CustomersClient.update"""
+    customer_attrs = ["legal_name", "tax_id", "email", "phone"]
+    data = {k: v for k, v in kwargs.items() if k in customer_attrs}
+
+    tax_system = kwargs.get("tax_system")
+    if tax_system:
+        if isinstance(tax_system, TaxSystem):
+            tax_system = tax_system.value
+        data["tax_system"] = tax_system
+
+    address = {k: v for k, v in kwargs.items() if k in ADDRESS_ATTRS}
+
+    zip_code = kwargs.get("zip_code")
+    if zip_code:
+        address["zip"] = zip_code
+
+    if len(address) > 0:
+        data["address"] = address
+
+    return data
 
 
-class CustomersClient(BaseClient):
+class CustomersClient(MirrorMixin, PaginatedClientMixin, BaseClient):
     """Customers API client"""
 
     endpoint = "customers"
 
+    def _build_mirrored(self, record: dict) -> Customer:
+        return build_customer(record)
+
     def create(
         self,
         legal_name: str,
@@ -54,36 +120,15 @@ class CustomersClient(BaseClient):
         Returns:
             Customer: Created customer
         """
-        address_attrs = [
-            "street",
-            "exterior",
-            "interior",
-            "neighborhood",
-            "city",
-            "municipality",
-            "state",
-            "country",
-        ]
-        address = {
-            "zip": zip_code,
-            **{k: v for k, v in kwargs.items() if k in address_attrs},
-        }
-
-        if isinstance(tax_system, TaxSystem):
-            tax_system = tax_system.value
-
-        customer_attrs = ["email", "phone"]
-        customer_data = {
-            "legal_name": legal_name,
-            "tax_id": tax_id,
-            "tax_system": tax_system,
-            "address": address,
-            **{k: v for k, v in kwargs.items() if k in customer_attrs},
-        }
+        customer_data = _get_customer_data(
+            legal_name, tax_id, tax_system, zip_code, **kwargs
+        )
 
         url = self._get_request_url()
-        response = self._execute_request("POST", url, json_data=customer_data).json()
-        return build_customer(response)
+        response = self._execute_request("POST", url, json_data=customer_data)
+        record = self._decode_json(response)
+        self._mirror_records([record])
+        return build_customer(record)
 
     # pylint: disable=too-many-arguments
     # All arguments are needed
@@ -94,6 +139,7 @@ class CustomersClient(BaseClient):
         end_date: datetime = None,
         page: int = None,
         limit: int = None,
+        lazy: bool = False,
     ) -> CustomerList:
         """Retrieves a paginated list of customers from your organization
 
@@ -103,22 +149,20 @@ class CustomersClient(BaseClient):
             end_date (datetime, optional): Limits the results by date. Defaults to None.
             page (int, optional): Page of the results list. Defaults to None.
             limit (int, optional): Maximum number of results. Defaults to None.
+            lazy (bool, optional): Return LazyCustomer objects, which parse their fields on
+                first access. Faster when only a few fields are read. Defaults to False.
 
         Returns:
             CustomerList: List-like object containing the customer search results
         """
-        kwargs = {
-            "q": search,
-            "date[gt]": start_date.astimezone().isoformat() if start_date else None,
-            "date[lt]": end_date.astimezone().isoformat() if end_date else None,
-            "page": page,
-            "limit": limit,
-        }
-        params = {k: v for k, v in kwargs.items() if v}
+        params = self._get_list_params(
+            search, start_date=start_date, end_date=end_date, page=page, limit=limit
+        )
         url = self._get_request_url()
-        response = self._execute_request("GET", url, params).json()
+        response = self._decode_json(self._execute_request("GET", url, params))
+        self._mirror_records(response["data"])
 
-        return build_customer_list(response)
+        return build_customer_list(response, lazy)
 
     def retrieve(self, customer_id: str) -> Customer:
         """Retrieves a single customer object
@@ -130,7 +174,10 @@ class CustomersClient(BaseClient):
             Customer: Retrieved customer
         """
         url = self._get_request_url([customer_id])
-        response = self._execute_request("GET", url).json()
+        response = self._retrieve_mirrored(
+            customer_id,
+            lambda: self._get_cached_json("retrieve", url, refresh=self._skip_cache),
+        )
         return build_customer(response)
 
     def update(self, customer_id: str, **kwargs) -> Customer:
@@ -161,36 +208,11 @@ class CustomersClient(BaseClient):
         Returns:
             Customer: Updated customer
         """
-        customer_attrs = ["legal_name", "tax_id", "email", "phone"]
-        data = {k: v for k, v in kwargs.items() if k in customer_attrs}
-
-        tax_system = kwargs.get("tax_system")
-        if tax_system:
-            if isinstance(tax_system, TaxSystem):
-                tax_system = tax_system.value
-            data["tax_system"] = tax_system
-
-        address_attrs = [
-            "street",
-            "exterior",
-            "interior",
-            "neighborhood",
-            "city",
-            "municipality",
-            "state",
-            "country",
-        ]
-        address = {k: v for k, v in kwargs.items() if k in address_attrs}
-
-        zip_code = kwargs.get("zip_code")
-        if zip_code:
-            address["zip"] = zip_code
-
-        if len(address) > 0:
-            data["address"] = address
+        data = _get_customer_update_data(**kwargs)
 
         url = self._get_request_url([customer_id])
-        response = self._execute_request("PUT", url, json_data=data).json()
+        response = self._decode_json(self._execute_request("PUT", url, json_data=data))
+        self._mirror_records([response])
         return build_customer(response)
 
     def delete(self, customer_id: str) -> Customer:
@@ -203,7 +225,8 @@ class CustomersClient(BaseClient):
             Customer: Deleted customer object
         """
         url = self._get_request_url([customer_id])
-        response = self._execute_request("DELETE", url).json()
+        response = self._decode_json(self._execute_request("DELETE", url))
+        self._mirror_delete(customer_id)
         return build_customer(response)
 
     def validate(self, customer_id: str, raise_exception: bool = False) -> dict:
@@ -217,7 +240,7 @@ class CustomersClient(BaseClient):
         """
 
         url = self._get_request_url([customer_id, "tax-info-validation"])
-        response = self._execute_request("GET", url).json()
+        response = self._decode_json(self._execute_request("GET", url))
         validations = CustomerValidations(**response)
         if raise_exception:
             raise ValidationError(validations.get_messages())
@@ -0,0 +1,100 @@
+"""Streaming downloads of invoice and retention files"""
+import os
+from contextlib import closing
+from typing import BinaryIO, Iterable, Iterator, Union
+
+FILE_FORMATS = ("pdf", "xml", "zip")
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def check_file_format(file_format: str) -> str:
+    """Validates the format of a downloaded file
+
+    Args:
+        file_format (str): "pdf", "xml" or "zip"
+
+    Raises:
+        ValueError: If the format is not supported
+
+    Returns:
+        str: File format in lower case
+    """
+    file_format = file_format.lower()
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"file_format must be one of {FILE_FORMATS}")
+    return file_format
+
+
+def write_chunks(chunks: Iterable[bytes], destination: Union[str, BinaryIO]) -> int:
+    """Writes chunks of bytes to a file object or to a path. Paths are written to a temporary
+    file that is renamed once complete, so an interrupted download never leaves a partial file
+
+    Args:
+        chunks (Iterable[bytes]): Chunks to write
+        destination (Union[str, BinaryIO]): Path or file object opened in binary mode
+
+    Returns:
+        int: Number of bytes written
+    """
+    if hasattr(destination, "write"):
+        size = 0
+        for chunk in chunks:
+            destination.write(chunk)
+            size += len(chunk)
+        return size
+
+    temp_path = f"{os.fspath(destination)}.part"
+    try:
+        with open(temp_path, "wb") as file:
+            size = write_chunks(chunks, file)
+        os.replace(temp_path, destination)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return size
+
+
+class DownloadMixin:
+    """Adds streaming downloads to the clients of documents with PDF, XML and ZIP files"""
+
+    def iter_download(
+        self, object_id: str, file_format: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Downloads a file chunk by chunk, without loading it whole in memory
+
+        Args:
+            object_id (str): Id of the document
+            file_format (str): "pdf", "xml" or "zip"
+            chunk_size (int, optional): Maximum size of each chunk in bytes. Defaults to 64 KiB.
+
+        Yields:
+            bytes: File chunks
+        """
+        url = self._get_download_file_url(check_file_format(file_format), object_id)
+        response = self._execute_request("GET", url, stream=True)
+        try:
+            yield from response.iter_content(chunk_size)
+        finally:
+            response.close()
+
+    def download_to(
+        self,
+        object_id: str,
+        file_format: str,
+        destination: Union[str, BinaryIO],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """Downloads a file to a path or file object, writing it chunk by chunk
+
+        Args:
+            object_id (str): Id of the document
+            file_format (str): "pdf", "xml" or "zip"
+            destination (Union[str, BinaryIO]): Path or file object opened in binary mode
+            chunk_size (int, optional): Maximum size of each chunk in bytes. Defaults to 64 KiB.
+
+        Returns:
+            int: Number of bytes written
+        """
+        with closing(self.iter_download(object_id, file_format, chunk_size)) as chunks:
+            return write_chunks(chunks, destination)
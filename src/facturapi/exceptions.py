@@ -7,3 +7,11 @@ class FacturapiException(Exception):
 
 class ValidationError(Exception):
     """Validation error"""
+
+
+class ServiceUnavailable(FacturapiException):
+    """Raised without sending the request while the circuit breaker is open"""
+
+
+class DeadlineExceeded(FacturapiException):
+    """Raised when the deadline of the current context passes before a request finishes"""
@@ -0,0 +1,400 @@
+"""Columnar export of list results for analytics: CSV, Arrow record batches and Parquet.
+
+Records are consumed lazily, e.g. from `iter_all`, and converted in batches of rows, so memory
+stays bounded by the batch size no matter how many records are exported. Nested objects are
+flattened to a fixed schema: one row per invoice, one row per invoice item with its tax rates
+as columns, or one row per customer.
+"""
+import csv
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, TextIO, Tuple, Union
+
+from .models import LazyCustomer, parse_date
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+DEFAULT_BATCH_SIZE = 10_000
+
+
+class Column(NamedTuple):
+    """Column of an export schema. type is one of "string", "int", "float", "bool" or
+    "timestamp"
+    """
+
+    name: str
+    type: str
+
+
+class ExportSchema(NamedTuple):
+    """Fixed set of columns and the function that flattens a record into rows"""
+
+    name: str
+    columns: Tuple[Column, ...]
+    get_rows: Callable[[Any], Iterable[tuple]]
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.name} ({len(self.columns)} columns)>"
+
+    @property
+    def column_names(self) -> List[str]:
+        """Names of the columns"""
+        return [column.name for column in self.columns]
+
+
+def _get_tax_rates(taxes: List[dict]) -> tuple:
+    """Flattens the taxes of a product to the rates of IVA, IVA withheld, ISR withheld and
+    IEPS. Rates of the same kind are added up
+    """
+    rates = {}
+    for tax in taxes or []:
+        kind = (tax.get("type", "IVA"), bool(tax.get("withholding")))
+        rates[kind] = rates.get(kind, 0) + tax.get("rate", 0)
+    return (
+        rates.get(("IVA", False)),
+        rates.get(("IVA", True)),
+        rates.get(("ISR", True)),
+        rates.get(("IEPS", False)),
+    )
+
+
+def _get_invoice_rows(invoice: dict) -> Iterator[tuple]:
+    customer = invoice.get("customer") or {}
+    yield (
+        invoice.get("id"),
+        parse_date(invoice.get("created_at")),
+        invoice.get("livemode"),
+        invoice.get("status"),
+        invoice.get("type"),
+        parse_date(invoice.get("date")),
+        customer.get("id"),
+        customer.get("legal_name"),
+        customer.get("tax_id"),
+        invoice.get("total"),
+        invoice.get("currency"),
+        invoice.get("exchange"),
+        invoice.get("payment_form"),
+        invoice.get("payment_method"),
+        invoice.get("use"),
+        invoice.get("uuid"),
+        invoice.get("series"),
+        invoice.get("folio_number"),
+        invoice.get("cancellation_status"),
+        len(invoice.get("items", [])),
+    )
+
+
+def _get_invoice_item_rows(invoice: dict) -> Iterator[tuple]:
+    date = parse_date(invoice.get("date"))
+    for line, item in enumerate(invoice.get("items", []), 1):
+        product = item.get("product")
+        if not isinstance(product, dict):
+            product = {"id": product}
+        yield (
+            invoice.get("id"),
+            date,
+            line,
+            product.get("id"),
+            product.get("description"),
+            product.get("product_key"),
+            item.get("quantity", 1),
+            product.get("price"),
+            item.get("discount", 0),
+            product.get("tax_included"),
+            product.get("unit_key"),
+            product.get("sku"),
+            *_get_tax_rates(product.get("taxes")),
+        )
+
+
+def _get_customer_rows(customer: Any) -> Iterator[tuple]:
+    if isinstance(customer, dict):
+        customer = LazyCustomer(customer)
+    address = customer.address
+    tax_system = customer.tax_system
+    yield (
+        customer.id,
+        customer.created_at,
+        customer.livemode,
+        customer.legal_name,
+        customer.tax_id,
+        tax_system.value if isinstance(tax_system, Enum) else tax_system,
+        customer.email,
+        None if customer.phone is None else str(customer.phone),
+        address.zip if address else None,
+        address.country if address else None,
+        address.state if address else None,
+        address.municipality if address else None,
+    )
+
+
+INVOICES = ExportSchema(
+    "invoices",
+    (
+        Column("id", "string"),
+        Column("created_at", "timestamp"),
+        Column("livemode", "bool"),
+        Column("status", "string"),
+        Column("type", "string"),
+        Column("date", "timestamp"),
+        Column("customer_id", "string"),
+        Column("customer_legal_name", "string"),
+        Column("customer_tax_id", "string"),
+        Column("total", "float"),
+        Column("currency", "string"),
+        Column("exchange", "float"),
+        Column("payment_form", "string"),
+        Column("payment_method", "string"),
+        Column("use", "string"),
+        Column("uuid", "string"),
+        Column("series", "string"),
+        Column("folio_number", "int"),
+        Column("cancellation_status", "string"),
+        Column("item_count", "int"),
+    ),
+    _get_invoice_rows,
+)
+
+INVOICE_ITEMS = ExportSchema(
+    "invoice_items",
+    (
+        Column("invoice_id", "string"),
+        Column("invoice_date", "timestamp"),
+        Column("line", "int"),
+        Column("product_id", "string"),
+        Column("description", "string"),
+        Column("product_key", "string"),
+        Column("quantity", "float"),
+        Column("price", "float"),
+        Column("discount", "float"),
+        Column("tax_included", "bool"),
+        Column("unit_key", "string"),
+        Column("sku", "string"),
+        Column("iva_rate", "float"),
+        Column("iva_withholding_rate", "float"),
+        Column("isr_withholding_rate", "float"),
+        Column("ieps_rate", "float"),
+    ),
+    _get_invoice_item_rows,
+)
+
+CUSTOMERS = ExportSchema(
+    "customers",
+    (
+        Column("id", "string"),
+        Column("created_at", "timestamp"),
+        Column("livemode", "bool"),
+        Column("legal_name", "string"),
+        Column("tax_id", "string"),
+        Column("tax_system", "string"),
+        Column("email", "string"),
+        Column("phone", "string"),
+        Column("zip", "string"),
+        Column("country", "string"),
+        Column("state", "string"),
+        Column("municipality", "string"),
+    ),
+    _get_customer_rows,
+)
+
+SCHEMAS = {schema.name: schema for schema in (INVOICES, INVOICE_ITEMS, CUSTOMERS)}
+
+
+def get_schema(schema: Union[str, ExportSchema]) -> ExportSchema:
+    """Returns an export schema
+
+    Args:
+        schema (Union[str, ExportSchema]): Schema or its name: "invoices", "invoice_items" or
+            "customers"
+
+    Returns:
+        ExportSchema: Export schema
+    """
+    if isinstance(schema, ExportSchema):
+        return schema
+    if schema not in SCHEMAS:
+        raise ValueError(f"schema must be one of {list(SCHEMAS)}")
+    return SCHEMAS[schema]
+
+
+def iter_batches(
+    records: Iterable,
+    schema: Union[str, ExportSchema],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[List[tuple]]:
+    """Flattens the records into batches of rows
+
+    Args:
+        records (Iterable): API objects, e.g. the items yielded by `iter_all`
+        schema (Union[str, ExportSchema]): Export schema or its name
+        batch_size (int, optional): Rows per batch. Defaults to 10,000.
+
+    Yields:
+        List[tuple]: Rows with the values of the schema columns
+    """
+    get_rows = get_schema(schema).get_rows
+    batch = []
+    for record in records:
+        batch.extend(get_rows(record))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _format_csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def export_csv(
+    records: Iterable,
+    schema: Union[str, ExportSchema],
+    destination: Union[str, TextIO],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    rows_per_file: int = None,
+) -> int:
+    """Writes the records to CSV, one batch at a time
+
+    Args:
+        records (Iterable): API objects, e.g. the items yielded by `iter_all`
+        schema (Union[str, ExportSchema]): Export schema or its name
+        destination (Union[str, TextIO]): Path or text file object. With rows_per_file, a path
+            with a `{part}` field, e.g. "invoices-{part:04d}.csv"
+        batch_size (int, optional): Rows per batch. Defaults to 10,000.
+        rows_per_file (int, optional): Start a new file after this many rows. Rounded up to
+            whole batches. Defaults to None.
+
+    Returns:
+        int: Number of rows written. Without records, a single file with the header row is
+            still written
+    """
+    schema = get_schema(schema)
+    if rows_per_file and "{part" not in str(destination):
+        raise ValueError("destination must have a {part} field to split the CSV files")
+
+    total = 0
+    part = 0
+    file = writer = None
+    rows_in_file = 0
+
+    def open_part():
+        nonlocal file, writer, part, rows_in_file
+        if file is not None and file is not destination:
+            file.close()
+        part += 1
+        if hasattr(destination, "write"):
+            file = destination
+        else:
+            path = destination.format(part=part)
+            file = open(path, "w", newline="", encoding="utf-8")
+        writer = csv.writer(file)
+        writer.writerow(schema.column_names)
+        rows_in_file = 0
+
+    try:
+        for batch in iter_batches(records, schema, batch_size):
+            if file is None or (rows_per_file and rows_in_file >= rows_per_file):
+                open_part()
+            writer.writerows([_format_csv_value(v) for v in row] for row in batch)
+            rows_in_file += len(batch)
+            total += len(batch)
+        if file is None:
+            # Without records, the export is still a file with the header row
+            open_part()
+    finally:
+        if file is not None and file is not destination:
+            file.close()
+    return total
+
+
+def _import_pyarrow():
+    if pyarrow is None:
+        raise ImportError(
+            "Arrow and Parquet exports require pyarrow. "
+            "Install it with: pip install facturapi-python[export]"
+        )
+    return pyarrow
+
+
+def get_arrow_schema(schema: Union[str, ExportSchema]):
+    """Returns the Arrow schema of an export schema
+
+    Args:
+        schema (Union[str, ExportSchema]): Export schema or its name
+
+    Returns:
+        pyarrow.Schema: Arrow schema
+    """
+    arrow = _import_pyarrow()
+    types = {
+        "string": arrow.string(),
+        "int": arrow.int64(),
+        "float": arrow.float64(),
+        "bool": arrow.bool_(),
+        "timestamp": arrow.timestamp("ms", tz="UTC"),
+    }
+    fields = [arrow.field(c.name, types[c.type]) for c in get_schema(schema).columns]
+    return arrow.schema(fields)
+
+
+def iter_record_batches(
+    records: Iterable,
+    schema: Union[str, ExportSchema],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator:
+    """Converts the records to Arrow record batches
+
+    Args:
+        records (Iterable): API objects, e.g. the items yielded by `iter_all`
+        schema (Union[str, ExportSchema]): Export schema or its name
+        batch_size (int, optional): Rows per batch. Defaults to 10,000.
+
+    Yields:
+        pyarrow.RecordBatch: Batches with the schema columns
+    """
+    arrow = _import_pyarrow()
+    arrow_schema = get_arrow_schema(schema)
+    for batch in iter_batches(records, schema, batch_size):
+        columns = zip(*batch)
+        arrays = [
+            arrow.array(column, type=field.type)
+            for column, field in zip(columns, arrow_schema)
+        ]
+        yield arrow.RecordBatch.from_arrays(arrays, schema=arrow_schema)
+
+
+def export_parquet(
+    records: Iterable,
+    schema: Union[str, ExportSchema],
+    path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    compression: str = "zstd",
+) -> int:
+    """Writes the records to a Parquet file, one row group per batch
+
+    Args:
+        records (Iterable): API objects, e.g. the items yielded by `iter_all`
+        schema (Union[str, ExportSchema]): Export schema or its name
+        path (str): Path of the Parquet file
+        batch_size (int, optional): Rows per batch. Defaults to 10,000.
+        compression (str, optional): Parquet compression codec. Defaults to "zstd".
+
+    Returns:
+        int: Number of rows written
+    """
+    arrow = _import_pyarrow()
+    total = 0
+    with arrow.parquet.ParquetWriter(
+        path, get_arrow_schema(schema), compression=compression
+    ) as writer:
+        for batch in iter_record_batches(records, schema, batch_size):
+            writer.write_batch(batch)
+            total += batch.num_rows
+    return total
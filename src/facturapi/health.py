@@ -0,0 +1,214 @@
+"""Background health monitoring and a circuit breaker that fails requests fast while the API is
+down
+"""
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, NamedTuple
+
+# Requests are sent normally
+CLOSED = "closed"
+# Requests fail fast without being sent
+OPEN = "open"
+# A single trial request is sent to find out if the API recovered
+HALF_OPEN = "half_open"
+
+
+class HealthStatus(NamedTuple):
+    """Last known status of the API"""
+
+    ok: bool  # pylint: disable=invalid-name
+    checked_at: datetime
+    error: str = None
+
+
+class CircuitBreaker:
+    """Stops sending requests after several consecutive failures, i.e. connection errors and
+    5xx responses, so workers fail fast instead of waiting out timeouts. After recovery_timeout
+    seconds a single trial request is let through, closing the circuit if it succeeds.
+    A HealthMonitor opens and closes it according to the health check too. Safe to share
+    between threads and clients.
+
+    Args:
+        failure_threshold (int, optional): Consecutive failures that open the circuit.
+            Defaults to 5.
+        recovery_timeout (float, optional): Seconds the circuit stays open before a trial
+            request. Defaults to 30.
+    """
+
+    def __init__(
+        self, failure_threshold: int = 5, recovery_timeout: float = 30
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.state}>"
+
+    def _get_state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at < self.recovery_timeout:
+            return OPEN
+        return HALF_OPEN
+
+    @property
+    def state(self) -> str:
+        """CLOSED, OPEN or HALF_OPEN"""
+        with self._lock:
+            return self._get_state()
+
+    def get_retry_after(self) -> float:
+        """Returns the seconds until the next trial request
+
+        Returns:
+            float: Seconds, 0 if requests are allowed
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return 0
+            return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Checks if a request can be sent. In the HALF_OPEN state only the first caller is
+        allowed, as the trial request
+
+        Returns:
+            bool: True if the request can be sent
+        """
+        with self._lock:
+            state = self._get_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Records a request that reached the API, closing the circuit"""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Records a failed request, opening the circuit after failure_threshold consecutive
+        failures or a failed trial request
+        """
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Gives back the trial request of the HALF_OPEN state when a request that was allowed
+        finished without a result, e.g. it was cancelled
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def trip(self) -> None:
+        """Opens the circuit, e.g. when the health check fails"""
+        with self._lock:
+            if self._get_state() != OPEN:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def reset(self) -> None:
+        """Closes the circuit, e.g. when the health check succeeds"""
+        self.record_success()
+
+
+class HealthMonitor:
+    """Polls the API health check in a background thread and caches the last status, so reading
+    it never blocks. Drives a circuit breaker: failed checks count as failed requests, so the
+    circuit opens after failure_threshold of them, and a successful check closes it. A check that
+    raises, e.g. on a 429 or 401 response, is inconclusive and leaves the circuit as it is.
+
+    Args:
+        check (Callable[[], bool]): Function that checks the API, e.g. HealthCheck.check_status.
+            It returns False if the API is down
+        interval (float, optional): Seconds between checks. Defaults to 30.
+        circuit_breaker (CircuitBreaker, optional): Circuit breaker driven by the checks.
+            Defaults to None.
+    """
+
+    def __init__(
+        self,
+        check: Callable[[], bool],
+        interval: float = 30,
+        circuit_breaker: CircuitBreaker = None,
+    ) -> None:
+        self.check_function = check
+        self.interval = interval
+        self.circuit_breaker = circuit_breaker
+        self.status = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.status}>"
+
+    @property
+    def running(self) -> bool:
+        """True while the background checks are running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    # pylint: disable-next=invalid-name
+    def _set_status(self, ok: bool, error: str = None) -> HealthStatus:
+        """Caches the result of a check and updates the circuit breaker"""
+        self.status = HealthStatus(ok, datetime.now(timezone.utc), error)
+        if self.circuit_breaker is not None:
+            if ok:
+                self.circuit_breaker.reset()
+            else:
+                self.circuit_breaker.record_failure()
+        return self.status
+
+    def _set_inconclusive(self, error: Exception) -> HealthStatus:
+        """Caches a check that raised, keeping the last known availability. The circuit
+        breaker is not updated
+        """
+        ok = self.status.ok if self.status is not None else True  # pylint: disable=invalid-name
+        self.status = HealthStatus(ok, datetime.now(timezone.utc), str(error))
+        return self.status
+
+    def check(self) -> HealthStatus:
+        """Checks the API now and caches the result
+
+        Returns:
+            HealthStatus: New status
+        """
+        try:
+            ok = bool(self.check_function())  # pylint: disable=invalid-name
+        except Exception as error:  # pylint: disable=broad-except
+            return self._set_inconclusive(error)
+        return self._set_status(ok)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self.check()
+            self._stopped.wait(self.interval)
+
+    def start(self) -> None:
+        """Starts the background checks. The first one runs immediately"""
+        if self.running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="facturapi-health", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the background checks and waits for the one in progress"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
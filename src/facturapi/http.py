@@ -1,8 +1,34 @@
 """HTTP Base Client"""
+import time
+import uuid
 from abc import ABC, abstractmethod
-from requests import Session, Response
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Union
+from urllib.parse import urlencode
 
-from .exceptions import FacturapiException
+from requests import Response
+from requests.exceptions import Timeout as RequestTimeout
+
+from .cache import BaseCache, get_key_namespace
+from .exceptions import DeadlineExceeded, FacturapiException, ServiceUnavailable
+from .health import CircuitBreaker
+from .idempotency import IDEMPOTENCY_HEADER, IdempotencyJournal, get_fingerprint
+from .ratelimit import TokenBucket
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .timeouts import (
+    DEFAULT_TIMEOUT,
+    DEFAULT_TIMEOUTS,
+    Timeout,
+    get_deadline,
+    get_remaining_time,
+    to_timeout,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .codec import JSONCodec
+    from .instrumentation import Instrumentation
+    from .transport import BaseTransport
 
 
 class BaseClient(ABC):  # pylint:disable=too-few-public-methods
@@ -16,8 +42,14 @@ class BaseClient(ABC):  # pylint:disable=too-few-public-methods
     STATUS_NOT_AUTHENTICATED = 401
     STATUS_NOT_FOUND = 404
     STATUS_CONFLICT = 409
+    STATUS_TOO_MANY_REQUESTS = 429
     STATUS_INTERNAL_SERVER_ERROR = 500
 
+    # Transport keyword argument that takes the encoded request body
+    BODY_ARGUMENT = "data"
+    # Errors raised by the transport when a timeout expires
+    TIMEOUT_ERRORS = (RequestTimeout,)
+
     @property
     @abstractmethod
     def endpoint(self) -> None:
@@ -25,14 +57,64 @@ class BaseClient(ABC):  # pylint:disable=too-few-public-methods
         (e.g.: the customers API sets the value to 'customers')
         """
 
-    def __init__(self, api_key: str, api_version="v2") -> None:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        api_key: str,
+        api_version="v2",
+        transport: "BaseTransport" = None,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: TokenBucket = None,
+        idempotency_journal: IdempotencyJournal = None,
+        cache: BaseCache = None,
+        cache_ttls: dict = None,
+        json_codec: Union[str, "JSONCodec"] = None,
+        coalesce_requests: bool = True,
+        instrumentation: "Instrumentation" = None,
+        circuit_breaker: CircuitBreaker = None,
+        timeout: Union[float, tuple, Timeout] = DEFAULT_TIMEOUT,
+        timeouts: dict = None,
+    ) -> None:
         self.api_key = api_key
         self.api_version = api_version
         self.last_status = None
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.idempotency_journal = idempotency_journal
+        self.cache = cache
+        self.cache_ttls = cache_ttls or {}
+        # Imported on first use, so importing the clients doesn't load orjson or ujson
+        from .codec import get_json_codec  # pylint: disable=import-outside-toplevel
+
+        self.json_codec = get_json_codec(json_codec)
+        self.single_flight = self._create_single_flight() if coalesce_requests else None
+        self.instrumentation = instrumentation
+        self.circuit_breaker = circuit_breaker
+        self.timeout = to_timeout(timeout)
+        self.timeouts = {
+            key: to_timeout(value)
+            for key, value in {**DEFAULT_TIMEOUTS, **(timeouts or {})}.items()
+        }
+
+        self._owns_transport = transport is None
+        self.transport = transport if transport else self._create_transport()
+        self.session = getattr(self.transport, "session", None)
 
-        self.session = Session()
-        self.session.auth = (self.api_key, "")
-        self.session.headers.update({"Content-Type": "application/json"})
+    def _create_transport(self) -> "BaseTransport":
+        """Creates the transport used when the client does not receive a shared one"""
+        from .transport import HTTPTransport  # pylint: disable=import-outside-toplevel
+
+        return HTTPTransport()
+
+    def _create_single_flight(self) -> SingleFlight:
+        """Creates the group that coalesces concurrent identical GET requests"""
+        return SingleFlight()
+
+    def close(self) -> None:
+        """Closes the client's transport. Shared transports are left open and must be closed by
+        their owner
+        """
+        if self._owns_transport:
+            self.transport.close()
 
     def _get_endpoint(self) -> str:
         """Returns specific endpoint set by API clients"""
@@ -69,55 +151,603 @@ class BaseClient(ABC):  # pylint:disable=too-few-public-methods
         endpoint = self._get_endpoint()
         return f"{url}{version}/{endpoint}/{param_string}"
 
-    def _execute_request(
-        self, method: str, url: str, query_params: dict = None, json_data: dict = None
-    ) -> Response:
-        """Executes a HTTP request
+    def _get_list_params(  # pylint: disable=too-many-arguments
+        self,
+        search: str = None,
+        customer_id: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        page: int = None,
+        limit: int = None,
+    ) -> dict:
+        """Builds the query parameters of a paginated list request
+
+        Args:
+            search (str, optional): Text to search. Defaults to None.
+            customer_id (str, optional): Id of the customer. Defaults to None.
+            start_date (datetime, optional): Lower limit of a date range. Defaults to None.
+            end_date (datetime, optional): Upper limit of a date range. Defaults to None.
+            page (int, optional): Result page to return, beginning with 1. Defaults to None.
+            limit (int, optional): Maximum quantity of results to return. Defaults to None.
+
+        Returns:
+            dict: Query parameters
+        """
+        params = {
+            "q": search,
+            "customer": customer_id,
+            "date[gt]": start_date.astimezone().isoformat() if start_date else None,
+            "date[lt]": end_date.astimezone().isoformat() if end_date else None,
+            "page": page,
+            "limit": limit,
+        }
+        return {k: v for k, v in params.items() if v}
+
+    def _get_request_kwargs(
+        self, method: str, query_params: dict = None, json_data: dict = None
+    ) -> dict:
+        """Builds the keyword arguments sent to the transport for a HTTP method
 
         Args:
             method (str): HTTP method. GET, POST, PUT or DELETE
-            url (str): URL for the request
             query_params (dict, optional): Dictionary object of additional query. Defaults to None.
             json_data (dict, optional): For POST and PUT requests. Defaults to None.
 
+        Raises:
+            FacturapiException: If the method is not supported or the body can't be encoded
+
         Returns:
-            Response: API response
+            dict: Transport keyword arguments
         """
+        try:
+            body = None if json_data is None else self.json_codec.dumps(json_data)
+        except (TypeError, ValueError, OverflowError) as error:
+            message = f"Request error: {error}"
+            raise FacturapiException(message) from error
+
         method_switch = {
-            "GET": (self.session.get, {"params": query_params}),
-            "POST": (self.session.post, {"json": json_data}),
-            "PUT": (self.session.put, {"json": json_data}),
-            "DELETE": (self.session.delete, {"params": query_params}),
+            "GET": {"params": query_params},
+            "POST": {self.BODY_ARGUMENT: body},
+            "PUT": {self.BODY_ARGUMENT: body},
+            "DELETE": {"params": query_params},
         }
 
-        request = method_switch.get(method.upper(), None)
+        request_kwargs = method_switch.get(method.upper(), None)
 
-        if not request:
+        if request_kwargs is None:
             message = f"Method {method} not defined"
             raise FacturapiException(message)
 
+        return {"auth": (self.api_key, ""), **request_kwargs}
+
+    def _begin_idempotent_request(
+        self, method: str, url: str, json_data: dict, nonce: str = ""
+    ) -> tuple:
+        """Gets the idempotency key of a POST request. With a journal, the key of an identical
+        request that is still in flight is reused
+
+        Args:
+            method (str): HTTP method
+            url (str): URL for the request
+            json_data (dict): Request body
+            nonce (str, optional): Tells apart identical requests meant to be sent more than
+                once, so they don't share a key. Defaults to "".
+
+        Returns:
+            tuple: Idempotency key and request fingerprint. Both are None for other methods
+        """
+        if method.upper() != "POST":
+            return None, None
+        if self.idempotency_journal is None:
+            return str(uuid.uuid4()), None
+        fingerprint = get_fingerprint(method, url, json_data, self.api_key, nonce)
+        return self.idempotency_journal.begin(fingerprint), fingerprint
+
+    def _complete_idempotent_request(self, fingerprint: str, response: Response) -> None:
+        """Removes the idempotency key from the journal once the API gave a definitive answer.
+        Keys of requests without answer or rejected by throttling or server errors are kept
+
+        Args:
+            fingerprint (str): Request fingerprint
+            response (Response): API response
+        """
+        if not fingerprint:
+            return
+        status = response.status_code
+        if status == self.STATUS_TOO_MANY_REQUESTS:
+            return
+        if status < self.STATUS_INTERNAL_SERVER_ERROR:
+            self.idempotency_journal.complete(fingerprint)
+
+    def _decode_json(self, response: Response) -> Any:
+        """Decodes the JSON body of a response with the client's codec
+
+        Args:
+            response (Response): API response
+
+        Returns:
+            Any: Decoded body
+        """
+        return self.json_codec.loads(response.content)
+
+    def _get_error_message(self, response: Response) -> str:
+        """Returns the message of an error response. Responses that aren't API errors, e.g. the
+        HTML page of a gateway, get a generic message
+
+        Args:
+            response (Response): API response
+
+        Returns:
+            str: Error message
+        """
         try:
-            response = request[0](url, **request[1])
-        except Exception as error:
-            message = f"Request error: {error}"
-            raise FacturapiException(message) from error
+            json_response = self._decode_json(response)
+        except ValueError:
+            json_response = None
+        if isinstance(json_response, dict) and json_response.get("message"):
+            return json_response["message"]
+        return f"HTTP error {response.status_code}"
 
-        self.last_status = response.status_code
-        error_status_codes = [
-            self.STATUS_BAD_REQUEST,
-            self.STATUS_NOT_FOUND,
-            self.STATUS_INTERNAL_SERVER_ERROR,
-            self.STATUS_CONFLICT,
-        ]
+    def _check_response(self, response: Response) -> Response:
+        """Stores the response status and raises the API errors, including the 5xx responses
+        left after the retries
+
+        Args:
+            response (Response): API response
+
+        Raises:
+            FacturapiException
 
-        if response.status_code in error_status_codes:
-            json_response = response.json()
-            raise FacturapiException(json_response["message"])
+        Returns:
+            Response: API response
+        """
+        self.last_status = response.status_code
 
         if response.status_code == self.STATUS_NOT_AUTHENTICATED:
             raise FacturapiException("Wrong API KEY")
 
+        if response.status_code == self.STATUS_TOO_MANY_REQUESTS:
+            raise FacturapiException("Too many requests")
+
+        if response.status_code >= self.STATUS_BAD_REQUEST:
+            raise FacturapiException(self._get_error_message(response))
+
         return response
 
+    def _get_cache_key(self, url: str, query_params: dict = None) -> str:
+        """Returns the cache key of a GET request. Keys are namespaced by API key
+
+        Args:
+            url (str): URL for the request
+            query_params (dict, optional): Dictionary object of additional query. Defaults to None.
+
+        Returns:
+            str: Cache key
+        """
+        namespace = get_key_namespace(self.api_key)
+        query = f"?{urlencode(sorted(query_params.items()))}" if query_params else ""
+        return f"{namespace}:{url}{query}"
+
+    def _get_single_flight_key(self, url: str, query_params: dict = None) -> str:
+        """Returns the key of a GET request shared by concurrent callers. Callers with different
+        deadlines don't share requests, so none waits past its own deadline or fails by another's
+
+        Args:
+            url (str): URL for the request
+            query_params (dict, optional): Dictionary object of additional query. Defaults to None.
+
+        Returns:
+            str: Single-flight key
+        """
+        key = self._get_cache_key(url, query_params)
+        expires_at = get_deadline()
+        return key if expires_at is None else f"{key} deadline={expires_at!r}"
+
+    def _get_cache_ttl(self, name: str) -> float:
+        """Returns the TTL configured for a client method, e.g. "customers.retrieve"
+
+        Args:
+            name (str): Method name
+
+        Returns:
+            float: TTL in seconds, or None to use the cache default
+        """
+        return self.cache_ttls.get(f"{self._get_endpoint()}.{name}")
+
+    def _invalidate_cache(self, method: str, url: str) -> None:
+        """Removes the cached responses of the object modified by a request and stops sharing
+        the GET requests of the endpoint that are in flight
+
+        Args:
+            method (str): HTTP method
+            url (str): URL for the request
+        """
+        if method.upper() == "GET":
+            return
+        base_url = self._get_request_url()
+        if self.single_flight is not None:
+            self.single_flight.forget_prefix(self._get_cache_key(base_url))
+        if self.cache is None:
+            return
+        object_id = url[len(base_url) :].split("/")[0] if url.startswith(base_url) else ""
+        if object_id:
+            self.cache.invalidate_prefix(self._get_cache_key(f"{base_url}{object_id}"))
+
+    def _get_cached_json(
+        self, name: str, url: str, query_params: dict = None, refresh: bool = False
+    ):
+        """Executes a GET request and decodes its JSON response, using the cache if enabled
+
+        Args:
+            name (str): Name of the client method, used to look up its TTL
+            url (str): URL for the request
+            query_params (dict, optional): Dictionary object of additional query. Defaults to None.
+            refresh (bool, optional): Skip the cached response and store the new one.
+                Defaults to False.
+
+        Returns:
+            Any: Decoded response
+        """
+        if self.cache is None:
+            return self._decode_json(self._execute_request("GET", url, query_params))
+
+        key = self._get_cache_key(url, query_params)
+        value = None if refresh else self.cache.get(key)
+        if value is None:
+            value = self._decode_json(self._execute_request("GET", url, query_params))
+            ttl = self._get_cache_ttl(name)
+            if ttl != 0:
+                self.cache.set(key, value, ttl)
+        return value
+
+    def _get_rate_limit_delay(self) -> float:
+        """Takes a token from the rate limiter
+
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        if not self.rate_limiter:
+            return 0
+        return self.rate_limiter.reserve()
+
+    def _get_retry_delay(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        url: str,
+        attempt: int,
+        response=None,
+        error=None,
+        idempotency_key: str = None,
+    ) -> float:
+        """Returns the seconds to wait before retrying a failed request
+
+        Args:
+            method (str): HTTP method
+            url (str): URL for the request
+            attempt (int): Number of retries already made
+            response (Response, optional): Response received. Defaults to None.
+            error (Exception, optional): Error raised sending the request. Defaults to None.
+            idempotency_key (str, optional): Idempotency key sent. Defaults to None.
+
+        Returns:
+            float: Seconds to wait, or None if the request must not be retried
+        """
+        if not self.retry_policy:
+            return None
+        return self.retry_policy.get_retry_delay(
+            method, url, attempt, response, error, idempotency_key
+        )
+
+    def _get_timeout(self, method: str, stream: bool = False) -> Timeout:
+        """Returns the timeout of a request: the one of "download" for streamed downloads, then
+        the ones of "METHOD endpoint" or endpoint in the timeouts, or the client timeout
+
+        Args:
+            method (str): HTTP method
+            stream (bool, optional): Whether the request downloads a file. Defaults to False.
+
+        Returns:
+            Timeout: Connect and read timeouts
+        """
+        endpoint = self._get_endpoint()
+        keys = (f"{method.upper()} {endpoint}", endpoint)
+        if stream:
+            keys = ("download", *keys)
+        for key in keys:
+            if key in self.timeouts:
+                return self.timeouts[key]
+        return self.timeout
+
+    def _get_transport_timeout(self, timeout: Timeout) -> Any:
+        """Converts a timeout to the value taken by the transport"""
+        return tuple(timeout)
+
+    def _check_deadline(self, delay: float = 0) -> float:
+        """Checks that the deadline of the current context leaves time for a request
+
+        Args:
+            delay (float, optional): Seconds to wait before the request. Defaults to 0.
+
+        Raises:
+            DeadlineExceeded: If the deadline passes before the request could be sent
+
+        Returns:
+            float: Seconds left after the delay, or None without a deadline
+        """
+        remaining = get_remaining_time()
+        if remaining is None:
+            return None
+        if remaining <= delay:
+            raise DeadlineExceeded("Deadline exceeded before the request could finish")
+        return remaining - delay
+
+    def _get_attempt_timeout(self, timeout: Timeout) -> tuple:
+        """Shortens the timeout of an attempt to the time left before the deadline
+
+        Args:
+            timeout (Timeout): Timeout of the request
+
+        Raises:
+            DeadlineExceeded: If the deadline passed
+
+        Returns:
+            tuple: Transport timeout and whether the deadline shortened it
+        """
+        remaining = self._check_deadline()
+        bounded = remaining is not None and remaining < max(timeout)
+        if bounded:
+            connect, read = (min(value, remaining) for value in timeout)
+            timeout = Timeout(connect, read)
+        return self._get_transport_timeout(timeout), bounded
+
+    def _check_circuit(self) -> None:
+        """Fails fast while the circuit breaker is open
+
+        Raises:
+            ServiceUnavailable: If the request must not be sent
+        """
+        if self.circuit_breaker is None or self.circuit_breaker.allow_request():
+            return
+        retry_after = self.circuit_breaker.get_retry_after()
+        raise ServiceUnavailable(
+            f"Facturapi is unavailable, requests are paused for {retry_after:.1f} seconds"
+        )
+
+    def _release_circuit(self) -> None:
+        """Gives back the trial request of the circuit breaker when the request was interrupted
+        before its result was known
+        """
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.release()
+
+    def _record_circuit_result(self, response=None) -> None:
+        """Records the result of a request in the circuit breaker. Errors sending the request
+        and 5xx responses are failures
+
+        Args:
+            response (Response, optional): API response, or None if the request failed.
+                Defaults to None.
+        """
+        if self.circuit_breaker is None:
+            return
+        failed = response is None
+        if failed or response.status_code >= self.STATUS_INTERNAL_SERVER_ERROR:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def _begin_instrumented_request(self, method: str, url: str, attempt: int) -> tuple:
+        """Calls the before-request hooks
+
+        Args:
+            method (str): HTTP method
+            url (str): URL for the request
+            attempt (int): Number of retries already made
+
+        Returns:
+            tuple: Wall clock and performance counter start times, or None without
+                instrumentation
+        """
+        if self.instrumentation is None:
+            return None
+        from .instrumentation import RequestInfo  # pylint: disable=import-outside-toplevel
+
+        info = RequestInfo(method.upper(), self._get_endpoint(), url, attempt)
+        self.instrumentation.before_request(info)
+        return time.time(), time.perf_counter()
+
+    def _get_request_timings(self, response, elapsed: float, stream: bool) -> dict:
+        """Returns the durations of the phases of a request that the transport measured
+
+        Args:
+            response (Response): API response, or None if the request failed
+            elapsed (float): Seconds the request took
+            stream (bool): Whether the response body was left unread
+
+        Returns:
+            dict: Seconds by phase. requests only measures the wait for the response headers
+        """
+        if response is None:
+            return {}
+        wait = response.elapsed.total_seconds()
+        if stream:
+            return {"wait": wait}
+        return {"wait": wait, "transfer": max(0.0, elapsed - wait)}
+
+    def _end_instrumented_request(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        url: str,
+        attempt: int,
+        started: tuple,
+        request_kwargs: dict,
+        response=None,
+        error: Exception = None,
+        timings: dict = None,
+    ) -> None:
+        """Records the measurements of a request and calls the after-request hooks
+
+        Args:
+            method (str): HTTP method
+            url (str): URL for the request
+            attempt (int): Number of retries already made
+            started (tuple): Start times returned by _begin_instrumented_request
+            request_kwargs (dict): Transport keyword arguments
+            response (Response, optional): API response. Defaults to None.
+            error (Exception, optional): Error raised sending the request. Defaults to None.
+            timings (dict, optional): Seconds by phase. Defaults to the ones measured by the
+                transport.
+        """
+        if started is None:
+            return
+        started_at, start = started
+        elapsed = time.perf_counter() - start
+        stream = request_kwargs.get("stream", False)
+        body = request_kwargs.get(self.BODY_ARGUMENT)
+
+        status_code = response_bytes = None
+        if response is not None:
+            status_code = response.status_code
+            if stream:
+                response_bytes = int(response.headers.get("Content-Length", 0)) or None
+            else:
+                response_bytes = len(response.content)
+        if timings is None:
+            timings = self._get_request_timings(response, elapsed, stream)
+
+        from .instrumentation import RequestMetrics  # pylint: disable=import-outside-toplevel
+
+        metrics = RequestMetrics(
+            method.upper(),
+            self._get_endpoint(),
+            url,
+            attempt,
+            status_code,
+            error,
+            started_at,
+            elapsed,
+            len(body) if body else 0,
+            response_bytes,
+            timings,
+        )
+        self.instrumentation.after_request(metrics)
+
+    def _execute_request(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        url: str,
+        query_params: dict = None,
+        json_data: dict = None,
+        stream: bool = False,
+        idempotency_nonce: str = "",
+    ) -> Response:
+        """Executes a HTTP request. Concurrent identical GET requests share a single request
+        and its response, unless they stream the response
+
+        Args:
+            method (str): HTTP method. GET, POST, PUT or DELETE
+            url (str): URL for the request
+            query_params (dict, optional): Dictionary object of additional query. Defaults to None.
+            json_data (dict, optional): For POST and PUT requests. Defaults to None.
+            stream (bool, optional): Defer downloading the response body. The caller must close
+                the response. Defaults to False.
+            idempotency_nonce (str, optional): Tells apart identical POST requests meant to be
+                sent more than once. Defaults to "".
+
+        Returns:
+            Response: API response
+        """
+        if self.single_flight is not None and method.upper() == "GET" and not stream:
+            return self.single_flight.do(
+                self._get_single_flight_key(url, query_params),
+                lambda: self._send_request(method, url, query_params),
+            )
+        return self._send_request(
+            method, url, query_params, json_data, stream, idempotency_nonce
+        )
+
+    def _send_request(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        url: str,
+        query_params: dict = None,
+        json_data: dict = None,
+        stream: bool = False,
+        idempotency_nonce: str = "",
+    ) -> Response:
+        """Sends a HTTP request, waiting for the rate limiter and retrying it according to the
+        retry policy. See _execute_request
+
+        Returns:
+            Response: API response
+        """
+        # Encoded before the idempotency key is journaled, so invalid bodies leave no key
+        request_kwargs = self._get_request_kwargs(method, query_params, json_data)
+        key, fingerprint = self._begin_idempotent_request(
+            method, url, json_data, idempotency_nonce
+        )
+        if key:
+            request_kwargs["headers"] = {IDEMPOTENCY_HEADER: key}
+        if stream:
+            request_kwargs["stream"] = True
+
+        timeout = self._get_timeout(method, stream)
+        attempt = 0
+        while True:
+            rate_limit_delay = self._get_rate_limit_delay()
+            if rate_limit_delay > 0:
+                self._check_deadline(rate_limit_delay)
+                time.sleep(rate_limit_delay)
+
+            request_kwargs["timeout"], bounded = self._get_attempt_timeout(timeout)
+            # Checked before the request is instrumented, so requests rejected locally by the
+            # deadline or the open circuit are not counted as sent
+            self._check_circuit()
+            try:
+                started = self._begin_instrumented_request(method, url, attempt)
+            except BaseException:
+                self._release_circuit()
+                raise
+            try:
+                response = self.transport.request(
+                    method.upper(), url, **request_kwargs
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                self._record_circuit_result()
+                self._end_instrumented_request(
+                    method, url, attempt, started, request_kwargs, error=error
+                )
+                if bounded and isinstance(error, self.TIMEOUT_ERRORS):
+                    message = f"Deadline exceeded: {error}"
+                    raise DeadlineExceeded(message) from error
+                delay = self._get_retry_delay(
+                    method, url, attempt, error=error, idempotency_key=key
+                )
+                if delay is None:
+                    message = f"Request error: {error}"
+                    raise FacturapiException(message) from error
+            except BaseException:
+                self._release_circuit()
+                raise
+            else:
+                self._record_circuit_result(response)
+                self._end_instrumented_request(
+                    method, url, attempt, started, request_kwargs, response
+                )
+                delay = self._get_retry_delay(
+                    method, url, attempt, response, idempotency_key=key
+                )
+                if delay is None:
+                    self._invalidate_cache(method, url)
+                    self._complete_idempotent_request(fingerprint, response)
+                    if stream and response.status_code >= self.STATUS_BAD_REQUEST:
+                        response.content  # pylint: disable=pointless-statement
+                    return self._check_response(response)
+                response.close()
+
+            self._check_deadline(delay)
+            time.sleep(delay)
+            attempt += 1
+
     def _get_download_file_url(self, file_format: str, object_id: str):
         return self._get_request_url([object_id, file_format])
@@ -0,0 +1,141 @@
+"""Idempotency keys for POST requests"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def get_fingerprint(
+    method: str,
+    url: str,
+    json_data: dict = None,
+    api_key: str = "",
+    nonce: str = "",
+) -> str:
+    """Returns a fingerprint that identifies a request by its API key, method, URL and body
+
+    Args:
+        method (str): HTTP method
+        url (str): URL for the request
+        json_data (dict, optional): Request body. Defaults to None.
+        api_key (str, optional): API key that sends the request. Defaults to "".
+        nonce (str, optional): Tells apart identical requests that are meant to be sent more
+            than once. Defaults to "".
+
+    Returns:
+        str: SHA-256 hex digest of the request
+    """
+    body = json.dumps(json_data, sort_keys=True, separators=(",", ":"), default=str)
+    request = f"{api_key} {method.upper()} {url} {body} {nonce}"
+    return hashlib.sha256(request.encode()).hexdigest()
+
+
+class IdempotencyJournal:
+    """In-memory journal of in-flight idempotency keys.
+
+    A key is recorded before a request is sent and removed once the API gives a definitive
+    answer. If the same request is sent again while its key is still in the journal (e.g.
+    after a timeout), the same key is reused, so the API can discard the duplicate. Keys expire
+    after ttl seconds, so a request sent again much later is treated as a new one.
+
+    Args:
+        ttl (float, optional): Seconds a key is reused. Defaults to 24 hours.
+    """
+
+    def __init__(self, ttl: float = 24 * 60 * 60) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {len(self._entries)} in flight>"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _save(self) -> None:
+        """Persists the journal. The in-memory journal does nothing"""
+
+    def _remove_expired(self, now: float) -> bool:
+        """Removes the expired keys. Must be called with the lock held
+
+        Returns:
+            bool: True if any key was removed
+        """
+        expired = [
+            k for k, v in self._entries.items() if now - v["created_at"] > self.ttl
+        ]
+        for fingerprint in expired:
+            del self._entries[fingerprint]
+        return bool(expired)
+
+    def begin(self, fingerprint: str) -> str:
+        """Returns the idempotency key of a request, reusing the in-flight key if the same
+        request was already sent and the key has not expired
+
+        Args:
+            fingerprint (str): Request fingerprint
+
+        Returns:
+            str: Idempotency key
+        """
+        now = time.time()
+        with self._lock:
+            changed = self._remove_expired(now)
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                entry = {"key": str(uuid.uuid4()), "created_at": now}
+                self._entries[fingerprint] = entry
+                changed = True
+            if changed:
+                self._save()
+            return entry["key"]
+
+    def complete(self, fingerprint: str) -> None:
+        """Removes the key of a request that got a definitive answer
+
+        Args:
+            fingerprint (str): Request fingerprint
+        """
+        with self._lock:
+            if self._entries.pop(fingerprint, None) is not None:
+                self._save()
+
+    def pending(self) -> Dict[str, str]:
+        """Returns the keys still in flight
+
+        Returns:
+            Dict[str, str]: Idempotency keys by request fingerprint
+        """
+        with self._lock:
+            if self._remove_expired(time.time()):
+                self._save()
+            return {k: v["key"] for k, v in self._entries.items()}
+
+
+class FileIdempotencyJournal(IdempotencyJournal):
+    """Journal of in-flight idempotency keys persisted to a JSON file, so a request interrupted
+    by a crash is resent with the same key after a restart
+
+    Args:
+        path (str): Path of the journal file
+        ttl (float, optional): Seconds a key is reused. Defaults to 24 hours.
+    """
+
+    def __init__(self, path: str, ttl: float = 24 * 60 * 60) -> None:
+        super().__init__(ttl)
+        self.path = path
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self._entries = json.load(file)
+
+    def _save(self) -> None:
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self._entries, file)
+        os.replace(temp_path, self.path)
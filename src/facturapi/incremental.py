@@ -0,0 +1,298 @@
+"""Incremental sync of API resources into a local store, driven by high-water marks.
+
+Each run only fetches the records created after the watermark of the previous run. The list
+endpoints return the newest records first, so the run stops at the first page that reaches the
+watermark; resources with date filters (customers, invoices, receipts and retentions) also send
+it as `start_date`. Records created in the same instant as the watermark are fetched again and
+de-duplicated with the ids stored in the watermark.
+"""
+import inspect
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple
+
+from .models import parse_date
+from .pagination import MAX_PAGE_SIZE
+
+# Records this close to the watermark are fetched again in the next run, to catch records
+# created in the same instant or stored by the API out of order
+BOUNDARY_MARGIN = timedelta(seconds=1)
+
+INSERT = "insert"
+UPDATE = "update"
+
+
+class Watermark(NamedTuple):
+    """Creation date of the newest record synced and the ids of the records at that boundary"""
+
+    date: datetime
+    ids: FrozenSet[str] = frozenset()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.date.isoformat()}>"
+
+
+class SyncEvent(NamedTuple):
+    """Record to insert or update in the sink"""
+
+    kind: str
+    resource: str
+    id: str
+    record: Any
+
+
+class SyncStats(NamedTuple):
+    """Result of a sync run"""
+
+    resource: str
+    inserted: int
+    updated: int
+    skipped: int
+    watermark: Watermark
+    elapsed: float
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}: {self.resource} inserted={self.inserted} "
+            f"updated={self.updated} skipped={self.skipped}>"
+        )
+
+
+class WatermarkStore:
+    """In-memory store of the watermark of every resource"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._watermarks: Dict[str, Watermark] = {}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {sorted(self._watermarks)}>"
+
+    def _save(self) -> None:
+        """Persists the watermarks. The in-memory store does nothing"""
+
+    def get(self, resource: str) -> Watermark:
+        """Returns the watermark of a resource
+
+        Args:
+            resource (str): Resource name
+
+        Returns:
+            Watermark: Watermark, or None if the resource was never synced
+        """
+        with self._lock:
+            return self._watermarks.get(resource)
+
+    def set(self, resource: str, watermark: Watermark) -> None:
+        """Stores the watermark of a resource
+
+        Args:
+            resource (str): Resource name
+            watermark (Watermark): New watermark
+        """
+        with self._lock:
+            self._watermarks[resource] = watermark
+            self._save()
+
+
+class FileWatermarkStore(WatermarkStore):
+    """Store of watermarks persisted to a JSON file
+
+    Args:
+        path (str): Path of the watermarks file
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+            self._watermarks = {
+                resource: Watermark(parse_date(value["date"]), frozenset(value["ids"]))
+                for resource, value in data.items()
+            }
+
+    def _save(self) -> None:
+        data = {
+            resource: {"date": w.date.isoformat(), "ids": sorted(w.ids)}
+            for resource, w in self._watermarks.items()
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temp_path, self.path)
+
+
+class BaseSink(ABC):
+    """Destination of the synced records"""
+
+    @abstractmethod
+    def write(self, events: List[SyncEvent]) -> None:
+        """Inserts or updates a batch of records. Records may be delivered again after an
+        interrupted run, so writes should be idempotent (upserts by id)
+
+        Args:
+            events (List[SyncEvent]): Records to write
+        """
+
+    def commit(self, resource: str, watermark: Watermark) -> None:
+        """Called once every record of a run was written, before the watermark is stored,
+        e.g. to commit a database transaction
+
+        Args:
+            resource (str): Resource name
+            watermark (Watermark): New watermark
+        """
+
+
+class CallbackSink(BaseSink):
+    """Sink that passes every batch of events to a function
+
+    Args:
+        callback (Callable[[List[SyncEvent]], None]): Function called with each batch
+    """
+
+    def __init__(self, callback: Callable[[List[SyncEvent]], None]) -> None:
+        self.callback = callback
+
+    def write(self, events: List[SyncEvent]) -> None:
+        self.callback(events)
+
+
+class MemorySink(BaseSink):
+    """Sink that keeps the records in a dictionary by resource and id"""
+
+    def __init__(self) -> None:
+        self.records: Dict[str, Dict[str, Any]] = {}
+
+    def __repr__(self) -> str:
+        counts = {resource: len(r) for resource, r in self.records.items()}
+        return f"<{self.__class__.__name__}: {counts}>"
+
+    def write(self, events: List[SyncEvent]) -> None:
+        for event in events:
+            self.records.setdefault(event.resource, {})[event.id] = event.record
+
+
+def _get_field(record: Any, name: str) -> Any:
+    """Reads a field of a decoded API object or of a model"""
+    if isinstance(record, dict):
+        return record.get(name)
+    return getattr(record, name, None)
+
+
+def _get_record_date(record: Any, date_field: str) -> datetime:
+    value = _get_field(record, date_field)
+    return parse_date(value) if isinstance(value, str) else value
+
+
+class IncrementalSync:
+    """Syncs the records created since the last run of each resource into a sink
+
+    Args:
+        store (WatermarkStore): Store of the watermarks
+        sink (BaseSink): Destination of the records
+        lookback (timedelta, optional): Also fetch the records created in this period before
+            the watermark and emit them as updates, to pick up changes such as cancellations.
+            Defaults to None.
+        batch_size (int, optional): Events per sink write. Defaults to MAX_PAGE_SIZE.
+        date_field (str, optional): Creation date field of the records.
+            Defaults to "created_at".
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        store: WatermarkStore,
+        sink: BaseSink,
+        lookback: timedelta = None,
+        batch_size: int = MAX_PAGE_SIZE,
+        date_field: str = "created_at",
+    ) -> None:
+        self.store = store
+        self.sink = sink
+        self.lookback = lookback or timedelta(0)
+        self.batch_size = batch_size
+        self.date_field = date_field
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.store} -> {self.sink}>"
+
+    def _get_event_kind(self, record_id: str, date: datetime, watermark: Watermark) -> str:
+        """Returns INSERT for new records, UPDATE for the records of the lookback period and
+        None for the duplicates of the boundary
+        """
+        if watermark is None or date > watermark.date:
+            return INSERT
+        if record_id in watermark.ids:
+            return UPDATE if self.lookback else None
+        if date >= watermark.date - BOUNDARY_MARGIN:
+            return INSERT
+        return UPDATE
+
+    def sync(self, resource: str, client, **kwargs) -> SyncStats:
+        """Syncs the records created since the watermark of a resource
+
+        Args:
+            resource (str): Resource name, used as the watermark key
+            client: Client with `iter_all`, e.g. `Facturapi.invoices`
+            **kwargs: Other search arguments accepted by the client's `all` method
+
+        Returns:
+            SyncStats: Records inserted, updated and skipped and the new watermark
+        """
+        started_at = time.monotonic()
+        watermark = self.store.get(resource)
+        since = None
+        if watermark is not None:
+            since = watermark.date - self.lookback - BOUNDARY_MARGIN
+            if "start_date" in inspect.signature(client.all).parameters:
+                kwargs["start_date"] = since
+
+        counts = {INSERT: 0, UPDATE: 0, None: 0}
+        newest = watermark.date if watermark else None
+        boundary = {}
+        events = []
+        for record in client.iter_all(prefetch=True, **kwargs):
+            date = _get_record_date(record, self.date_field)
+            if since is not None and date < since:
+                # Results are sorted from newest to oldest, the rest were already synced
+                break
+
+            record_id = _get_field(record, "id")
+            kind = self._get_event_kind(record_id, date, watermark)
+            counts[kind] += 1
+            if kind is not None:
+                events.append(SyncEvent(kind, resource, record_id, record))
+            if len(events) >= self.batch_size:
+                self.sink.write(events)
+                events = []
+
+            if newest is None or date > newest:
+                newest = date
+            if date >= newest - BOUNDARY_MARGIN:
+                boundary[record_id] = date
+
+        if events:
+            self.sink.write(events)
+
+        if newest is not None:
+            if watermark is not None:
+                boundary.update(dict.fromkeys(watermark.ids, watermark.date))
+            ids = {i for i, date in boundary.items() if date >= newest - BOUNDARY_MARGIN}
+            watermark = Watermark(newest, frozenset(ids))
+            self.sink.commit(resource, watermark)
+            self.store.set(resource, watermark)
+
+        return SyncStats(
+            resource,
+            counts[INSERT],
+            counts[UPDATE],
+            counts[None],
+            watermark,
+            time.monotonic() - started_at,
+        )
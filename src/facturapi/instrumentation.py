@@ -0,0 +1,371 @@
+"""Per-request instrumentation: hooks, latency histograms, Prometheus and OpenTelemetry output"""
+import bisect
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+from urllib.parse import urlsplit
+
+try:
+    from opentelemetry import trace
+except ImportError:  # pragma: no cover
+    trace = None
+
+# Upper bounds in seconds of the latency histogram buckets, like the Prometheus clients
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Phases of a request, measured where the transport exposes them: "connect" (DNS
+# resolution and TCP connection), "tls", "send", "wait" (until the response headers
+# arrive) and "transfer" (response body)
+PHASES = ("connect", "tls", "send", "wait", "transfer")
+
+
+class RequestInfo(NamedTuple):
+    """Request about to be sent. Every retry is a new request"""
+
+    method: str
+    endpoint: str
+    url: str
+    attempt: int
+
+
+class RequestMetrics(NamedTuple):
+    """Measurements of a request sent to the API"""
+
+    method: str
+    endpoint: str
+    url: str
+    attempt: int
+    status_code: int
+    error: Exception
+    started_at: float
+    elapsed: float
+    request_bytes: int
+    response_bytes: int
+    timings: Dict[str, float]
+
+    def __repr__(self) -> str:
+        status = self.status_code or type(self.error).__name__
+        return (
+            f"<{self.__class__.__name__}: {self.method} {self.endpoint} {status} "
+            f"{self.elapsed * 1000:.1f}ms>"
+        )
+
+
+class LatencyHistogram:
+    """Histogram of durations with cumulative buckets, like a Prometheus histogram. Not
+    thread-safe, MetricsRegistry serializes the observations
+
+    Args:
+        buckets (Iterable[float], optional): Upper bounds of the buckets in seconds.
+            Defaults to DEFAULT_BUCKETS.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: count={self.count} sum={self.sum:.3f}>"
+
+    def observe(self, value: float) -> None:
+        """Adds a duration
+
+        Args:
+            value (float): Seconds
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, quantile: float) -> float:
+        """Estimates a quantile by linear interpolation inside its bucket
+
+        Args:
+            quantile (float): Quantile between 0 and 1, e.g. 0.95
+
+        Returns:
+            float: Estimated seconds, or None without observations. Quantiles in the last
+                bucket return the largest bound
+        """
+        if not self.count:
+            return None
+        rank = quantile * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def get_cumulative_counts(self) -> List[Tuple[str, int]]:
+        """Returns the cumulative count of every bucket, labeled by its upper bound
+
+        Returns:
+            List[Tuple[str, int]]: Bound, "+Inf" for the last bucket, and count
+        """
+        result = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            result.append(("+Inf" if bound == float("inf") else f"{bound:g}", cumulative))
+        return result
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    values = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        values.append(f'{name}="{value}"')
+    return "{" + ",".join(values) + "}"
+
+
+class MetricsRegistry:
+    """Aggregates the request metrics by endpoint and method. Safe to share between threads.
+
+    Args:
+        buckets (Iterable[float], optional): Upper bounds of the latency histogram buckets.
+            Defaults to DEFAULT_BUCKETS.
+        prefix (str, optional): Prefix of the Prometheus metric names.
+            Defaults to "facturapi".
+    """
+
+    def __init__(
+        self, buckets: Iterable[float] = DEFAULT_BUCKETS, prefix: str = "facturapi"
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.phases: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        self.requests = Counter()
+        self.request_bytes = Counter()
+        self.response_bytes = Counter()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {sum(self.requests.values())} requests>"
+
+    def _get_histogram(self, histograms: dict, key: tuple) -> LatencyHistogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = LatencyHistogram(self.buckets)
+        return histogram
+
+    def record(self, metrics: RequestMetrics) -> None:
+        """Adds the measurements of a request
+
+        Args:
+            metrics (RequestMetrics): Request measurements
+        """
+        key = (metrics.endpoint, metrics.method)
+        status = metrics.status_code or "error"
+        with self._lock:
+            self._get_histogram(self.latency, key).observe(metrics.elapsed)
+            for phase, seconds in metrics.timings.items():
+                self._get_histogram(self.phases, key + (phase,)).observe(seconds)
+            self.requests[key + (str(status),)] += 1
+            self.request_bytes[key] += metrics.request_bytes or 0
+            self.response_bytes[key] += metrics.response_bytes or 0
+
+    def get_error_rate(self, endpoint: str, method: str) -> float:
+        """Returns the fraction of the requests of an endpoint answered with a status of 400 or
+        more or that failed without response
+
+        Args:
+            endpoint (str): Endpoint, e.g. "customers"
+            method (str): HTTP method
+
+        Returns:
+            float: Error rate, or None without requests
+        """
+        with self._lock:
+            counts = {
+                status: count
+                for (e, m, status), count in self.requests.items()
+                if (e, m) == (endpoint, method)
+            }
+        total = sum(counts.values())
+        if not total:
+            return None
+        errors = sum(c for s, c in counts.items() if s == "error" or int(s) >= 400)
+        return errors / total
+
+    def to_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format
+
+        Returns:
+            str: Metrics text, e.g. to serve on a /metrics endpoint
+        """
+        prefix = self.prefix
+        lines = []
+
+        def add_histograms(name: str, description: str, histograms: dict, labels: tuple):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in sorted(histograms.items()):
+                values = dict(zip(labels, key))
+                for bound, count in histogram.get_cumulative_counts():
+                    bucket_labels = _format_labels({**values, "le": bound})
+                    lines.append(f"{name}_bucket{bucket_labels} {count}")
+                lines.append(f"{name}_sum{_format_labels(values)} {histogram.sum!r}")
+                lines.append(f"{name}_count{_format_labels(values)} {histogram.count}")
+
+        def add_counter(name: str, description: str, counter: Counter, labels: tuple):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(counter.items()):
+                lines.append(f"{name}{_format_labels(dict(zip(labels, key)))} {value}")
+
+        with self._lock:
+            add_histograms(
+                f"{prefix}_request_duration_seconds",
+                "Duration of the requests to the Facturapi API",
+                self.latency,
+                ("endpoint", "method"),
+            )
+            add_histograms(
+                f"{prefix}_request_phase_duration_seconds",
+                "Duration of the request phases measured by the transport",
+                self.phases,
+                ("endpoint", "method", "phase"),
+            )
+            add_counter(
+                f"{prefix}_requests_total",
+                "Requests sent to the Facturapi API by response status",
+                self.requests,
+                ("endpoint", "method", "status"),
+            )
+            add_counter(
+                f"{prefix}_request_bytes_total",
+                "Bytes of the request bodies",
+                self.request_bytes,
+                ("endpoint", "method"),
+            )
+            add_counter(
+                f"{prefix}_response_bytes_total",
+                "Bytes of the response bodies",
+                self.response_bytes,
+                ("endpoint", "method"),
+            )
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryHook:
+    """After-request hook that exports every request as an OpenTelemetry client span.
+    Requires the opentelemetry-api package
+
+    Args:
+        tracer (opentelemetry.trace.Tracer, optional): Tracer of the spans. Defaults to the
+            "facturapi" tracer of the global tracer provider.
+    """
+
+    def __init__(self, tracer=None) -> None:
+        if trace is None:
+            raise ImportError(
+                "OpenTelemetry spans require opentelemetry-api. "
+                "Install it with: pip install facturapi-python[telemetry]"
+            )
+        self.tracer = tracer or trace.get_tracer("facturapi")
+
+    def __call__(self, metrics: RequestMetrics) -> None:
+        url = urlsplit(metrics.url)
+        attributes = {
+            "http.request.method": metrics.method,
+            "url.full": url._replace(query="").geturl(),
+            "server.address": url.hostname,
+            "facturapi.endpoint": metrics.endpoint,
+            "http.request.resend_count": metrics.attempt,
+        }
+        if metrics.status_code is not None:
+            attributes["http.response.status_code"] = metrics.status_code
+        if metrics.request_bytes is not None:
+            attributes["http.request.body.size"] = metrics.request_bytes
+        if metrics.response_bytes is not None:
+            attributes["http.response.body.size"] = metrics.response_bytes
+
+        start_time = int(metrics.started_at * 1e9)
+        span = self.tracer.start_span(
+            f"{metrics.method} {metrics.endpoint}",
+            kind=trace.SpanKind.CLIENT,
+            attributes=attributes,
+            start_time=start_time,
+        )
+        if metrics.error is not None:
+            span.record_exception(metrics.error)
+            span.set_attribute("error.type", type(metrics.error).__name__)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, str(metrics.error)))
+        elif metrics.status_code >= 400:
+            span.set_attribute("error.type", str(metrics.status_code))
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+        span.end(end_time=start_time + int(metrics.elapsed * 1e9))
+
+
+class Instrumentation:
+    """Instrumentation shared by the API clients. Calls the before-request hooks before every
+    request is sent, retries included, and records the measurements of every response or
+    transport error in the metrics registry before calling the after-request hooks
+
+    Args:
+        before_request (Iterable[Callable[[RequestInfo], None]], optional): Functions called
+            before sending each request. Defaults to None.
+        after_request (Iterable[Callable[[RequestMetrics], None]], optional): Functions called
+            with the measurements of each request, e.g. OpenTelemetryHook(). Defaults to None.
+        metrics (MetricsRegistry, optional): Registry of the metrics. Defaults to a new one.
+    """
+
+    def __init__(
+        self,
+        before_request: Iterable[Callable[[RequestInfo], None]] = None,
+        after_request: Iterable[Callable[[RequestMetrics], None]] = None,
+        metrics: MetricsRegistry = None,
+    ) -> None:
+        self.before_hooks = list(before_request) if before_request else []
+        self.after_hooks = list(after_request) if after_request else []
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.metrics}>"
+
+    def add_before_hook(self, hook: Callable[[RequestInfo], None]) -> None:
+        """Registers a function to be called before each request
+
+        Args:
+            hook (Callable[[RequestInfo], None]): Function that receives the request
+        """
+        self.before_hooks.append(hook)
+
+    def add_after_hook(self, hook: Callable[[RequestMetrics], None]) -> None:
+        """Registers a function to be called after each request
+
+        Args:
+            hook (Callable[[RequestMetrics], None]): Function that receives the measurements
+        """
+        self.after_hooks.append(hook)
+
+    def before_request(self, info: RequestInfo) -> None:
+        """Calls the before-request hooks
+
+        Args:
+            info (RequestInfo): Request about to be sent
+        """
+        for hook in self.before_hooks:
+            hook(info)
+
+    def after_request(self, metrics: RequestMetrics) -> None:
+        """Records the measurements of a request and calls the after-request hooks
+
+        Args:
+            metrics (RequestMetrics): Request measurements
+        """
+        self.metrics.record(metrics)
+        for hook in self.after_hooks:
+            hook(metrics)
+
+    def to_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format. See MetricsRegistry"""
+        return self.metrics.to_prometheus()
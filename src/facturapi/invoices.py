@@ -1,27 +1,68 @@
 """Invoices API endpoint"""
+import uuid
 from datetime import datetime
-from typing import Union
+from typing import Iterable, Iterator, Union
 
+from .bulk import BulkResult, run_bulk
 from .constants import CancellationReason
+from .download import DownloadMixin
 from .http import BaseClient
+from .pagination import PaginatedClientMixin
 
 
-class InvoicesClient(BaseClient):
+class InvoicesClient(DownloadMixin, PaginatedClientMixin, BaseClient):
     """Products API client"""
 
     endpoint = "invoices"
 
-    def create(self, data: dict) -> dict:
+    def create(self, data: dict, idempotency_nonce: str = "") -> dict:
         """Creates a new invoice
 
         Args:
             data (dict): Invoice data
+            idempotency_nonce (str, optional): Tells apart identical invoices created on
+                purpose, which would otherwise share an idempotency key while in flight and be
+                discarded as duplicates. Defaults to "".
 
         Returns:
             dict: Created invoice object
         """
         url = self._get_request_url()
-        return self._execute_request("POST", url, json_data=data).json()
+        response = self._execute_request(
+            "POST", url, json_data=data, idempotency_nonce=idempotency_nonce
+        )
+        return self._decode_json(response)
+
+    def create_many(
+        self,
+        payloads: Iterable[dict],
+        max_workers: int = 4,
+        rate_limit: float = None,
+        ordered: bool = False,
+    ) -> Iterator[BulkResult]:
+        """Creates many invoices in parallel. A failed invoice does not stop the batch, its error
+        is returned in the corresponding result. Identical payloads create one invoice each: the
+        idempotency nonce of a payload is a random id of the batch and its position
+
+        Args:
+            payloads (Iterable[dict]): Invoice data of each invoice. Consumed lazily
+            max_workers (int, optional): Maximum number of parallel requests. Defaults to 4.
+            rate_limit (float, optional): Maximum requests per second. Defaults to None.
+            ordered (bool, optional): Yield the results in the same order as the payloads.
+                Defaults to False.
+
+        Yields:
+            BulkResult: Result of each invoice, with the created invoice object or the error
+        """
+        batch_id = uuid.uuid4().hex
+        return run_bulk(
+            lambda data, index: self.create(data, f"create_many:{batch_id}:{index}"),
+            payloads,
+            max_workers,
+            rate_limit,
+            ordered,
+            with_index=True,
+        )
 
     def all(
         self,
@@ -48,27 +89,12 @@ class InvoicesClient(BaseClient):
         Returns:
             dict: List of invoices
         """
-        params = {}
-        if search:
-            params.update({"q": search})
-
-        if customer_id:
-            params.update({"customer": customer_id})
-
-        if start_date:
-            params.update({"date[gt]": start_date.astimezone().isoformat()})
-
-        if end_date:
-            params.update({"date[lt]": end_date.astimezone().isoformat()})
-
-        if page:
-            params.update({"page": page})
-
-        if limit:
-            params.update({"limit": limit})
+        params = self._get_list_params(
+            search, customer_id, start_date, end_date, page, limit
+        )
 
         url = self._get_request_url()
-        return self._execute_request("GET", url, params).json()
+        return self._decode_json(self._execute_request("GET", url, params))
 
     def retrieve(self, invoice_id: str) -> dict:
         """Retrieves a single invoice object
@@ -80,7 +106,7 @@ class InvoicesClient(BaseClient):
             dict: Invoice object
         """
         url = self._get_request_url([invoice_id])
-        return self._execute_request("GET", url).json()
+        return self._decode_json(self._execute_request("GET", url))
 
     def cancel(
         self,
@@ -108,7 +134,8 @@ class InvoicesClient(BaseClient):
             params.update({"substitution": substitution})
 
         url = self._get_request_url([invoice_id])
-        return self._execute_request("DELETE", url, query_params=params).json()
+        response = self._execute_request("DELETE", url, query_params=params)
+        return self._decode_json(response)
 
     def get_cancellation_receipt(self, invoice_id: str) -> str:
         """Get XML cancellation receipt of an invoice as str
@@ -173,4 +200,4 @@ class InvoicesClient(BaseClient):
         """
         url = self._get_request_url([invoice_id, "email"])
         data = {"email": email} if email else {}
-        return self._execute_request("POST", url, json_data=data).json()
+        return self._decode_json(self._execute_request("POST", url, json_data=data))
@@ -0,0 +1,81 @@
+"""Deferred imports and instantiation, so that startup only pays for the clients in use"""
+import importlib
+import threading
+from typing import Any, Dict, Tuple
+
+
+class LazyClient:
+    """Descriptor that imports and creates an API client on first attribute access. The owner
+    creates the clients with its `_create_client` method and each one is created once per owner
+    instance, even when several threads access it at the same time.
+
+    A descriptor assigned to several names, e.g. `withholdings = retentions`, shares a single
+    client between them.
+
+    Args:
+        module (str): Module of the client, relative to the package of the owner class
+        class_name (str): Name of the client class
+        *options (str): Names of the owner attributes passed to the client as keyword
+            arguments, e.g. "mirror"
+    """
+
+    def __init__(self, module: str, class_name: str, *options: str) -> None:
+        self.module = module
+        self.class_name = class_name
+        self.options = options
+        self.name = None
+        self.package = None
+        self._lock = threading.Lock()
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        # Aliases keep the first name, so all of them store the same client
+        if self.name is None:
+            self.name = name
+            self.package = owner.__module__.rpartition(".")[0]
+
+    def __get__(self, instance: Any, owner: type = None) -> Any:
+        if instance is None:
+            return self
+        client = instance.__dict__.get(self.name)
+        if client is None:
+            with self._lock:
+                client = instance.__dict__.get(self.name)
+                if client is None:
+                    client = self._create(instance)
+                    instance.__dict__[self.name] = client
+        return client
+
+    def _create(self, instance: Any) -> Any:
+        module = importlib.import_module(f".{self.module}", self.package)
+        client_class = getattr(module, self.class_name)
+        kwargs = {option: getattr(instance, option) for option in self.options}
+        # pylint: disable-next=protected-access
+        return instance._create_client(client_class, **kwargs)
+
+
+def get_lazy_attribute(
+    package: str, exports: Dict[str, Tuple[str, str]], namespace: dict, name: str
+) -> Any:
+    """Imports an attribute of a package on first access. Used by the module `__getattr__` of
+    the packages
+
+    Args:
+        package (str): Name of the package
+        exports (Dict[str, Tuple[str, str]]): Relative module and attribute name of every
+            exported name. An attribute name of None exports the module itself
+        namespace (dict): Globals of the package, where the imported value is stored
+        name (str): Name of the attribute
+
+    Raises:
+        AttributeError: If the name is not exported
+
+    Returns:
+        Any: Imported attribute
+    """
+    if name not in exports:
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+    module_name, attribute = exports[name]
+    module = importlib.import_module(module_name, package)
+    value = module if attribute is None else getattr(module, attribute)
+    namespace[name] = value
+    return value
@@ -0,0 +1,303 @@
+"""Local mirror of customers and products that answers retrieve() without network"""
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Tuple
+
+from .cache import get_key_namespace
+from .exceptions import FacturapiException
+
+# Serve mirrored records of any age, only misses go to the API
+READ_THROUGH = "read_through"
+# Serve mirrored records of any age, refreshing the stale ones in the background
+STALE_WHILE_REVALIDATE = "stale_while_revalidate"
+# Never serve records older than max_age, refresh them before returning
+STRICT = "strict"
+POLICIES = (READ_THROUGH, STALE_WHILE_REVALIDATE, STRICT)
+
+# Fields matched by the local searches
+SEARCH_FIELDS = {
+    "customers": ("legal_name", "tax_id", "email"),
+    "products": ("description", "sku", "product_key"),
+}
+
+
+class MirrorStore:
+    """SQLite store of API records, kept up to date by the clients' create, update, delete,
+    list and retrieve calls. Safe to share between threads and clients. Records are namespaced
+    by a hash of the API key, so clients of different organizations never see each other's.
+
+    Args:
+        path (str, optional): Path of the database. Defaults to ":memory:".
+        policy (str, optional): READ_THROUGH, STALE_WHILE_REVALIDATE or STRICT.
+            Defaults to READ_THROUGH.
+        max_age (float, optional): Seconds a record is fresh. Defaults to 300.
+    """
+
+    def __init__(
+        self, path: str = ":memory:", policy: str = READ_THROUGH, max_age: float = 300
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}")
+        self.path = path
+        self.policy = policy
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._executor = None
+        self._refreshing = set()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            columns = [
+                row[1] for row in self._connection.execute("PRAGMA table_info(records)")
+            ]
+            if columns and "key_hash" not in columns:
+                # Records mirrored without namespace can't be told apart by API key
+                self._connection.execute("DROP TABLE records")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS records (key_hash TEXT, resource TEXT, "
+                "id TEXT, data TEXT, search_text TEXT, synced_at REAL, "
+                "PRIMARY KEY (key_hash, resource, id))"
+            )
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.path} {self.policy}>"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def get(
+        self, resource: str, object_id: str, key_hash: str = ""
+    ) -> Tuple[dict, float]:
+        """Returns a mirrored record and its age
+
+        Args:
+            resource (str): Resource name, e.g. "customers"
+            object_id (str): Id of the record
+            key_hash (str, optional): Namespace of the API key, see cache.get_key_namespace.
+                Defaults to "".
+
+        Returns:
+            Tuple[dict, float]: Record and seconds since it was stored, or None if it is not
+                mirrored
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data, synced_at FROM records "
+                "WHERE key_hash = ? AND resource = ? AND id = ?",
+                (key_hash, resource, object_id),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), time.time() - row[1]
+
+    def put_many(
+        self, resource: str, records: Iterable[dict], key_hash: str = ""
+    ) -> None:
+        """Adds or replaces records
+
+        Args:
+            resource (str): Resource name
+            records (Iterable[dict]): Records as returned by the API
+            key_hash (str, optional): Namespace of the API key. Defaults to "".
+        """
+        fields = SEARCH_FIELDS.get(resource, ())
+        now = time.time()
+        rows = [
+            (
+                key_hash,
+                resource,
+                record["id"],
+                json.dumps(record),
+                " ".join(str(record.get(f) or "") for f in fields).lower(),
+                now,
+            )
+            for record in records
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def put(self, resource: str, record: dict, key_hash: str = "") -> None:
+        """Adds or replaces a record
+
+        Args:
+            resource (str): Resource name
+            record (dict): Record as returned by the API
+            key_hash (str, optional): Namespace of the API key. Defaults to "".
+        """
+        self.put_many(resource, [record], key_hash)
+
+    def delete(self, resource: str, object_id: str, key_hash: str = "") -> None:
+        """Removes a record
+
+        Args:
+            resource (str): Resource name
+            object_id (str): Id of the record
+            key_hash (str, optional): Namespace of the API key. Defaults to "".
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM records WHERE key_hash = ? AND resource = ? AND id = ?",
+                (key_hash, resource, object_id),
+            )
+
+    def search(
+        self, resource: str, search: str, limit: int = 10, key_hash: str = ""
+    ) -> List[dict]:
+        """Searches the mirrored records by the words of their search fields, e.g. the legal
+        name, tax id or email of customers
+
+        Args:
+            resource (str): Resource name
+            search (str): Text to search
+            limit (int, optional): Maximum quantity of results. Defaults to 10.
+            key_hash (str, optional): Namespace of the API key. Defaults to "".
+
+        Returns:
+            List[dict]: Matching records
+        """
+        words = search.lower().split()
+        conditions = " AND ".join(["search_text LIKE ?"] * len(words)) or "1"
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT data FROM records WHERE key_hash = ? AND resource = ? "
+                f"AND {conditions} ORDER BY id LIMIT ?",
+                [key_hash, resource, *[f"%{word}%" for word in words], limit],
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def revalidate(
+        self,
+        resource: str,
+        object_id: str,
+        fetch: Callable[[], dict],
+        key_hash: str = "",
+    ) -> None:
+        """Refreshes a record in a background thread. Refreshes of a record already in progress
+        are ignored and errors keep the stale record
+
+        Args:
+            resource (str): Resource name
+            object_id (str): Id of the record
+            fetch (Callable[[], dict]): Function that gets the record from the API
+            key_hash (str, optional): Namespace of the API key. Defaults to "".
+        """
+        key = (key_hash, resource, object_id)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="facturapi-mirror"
+                )
+
+        def refresh() -> None:
+            try:
+                self.put(resource, fetch(), key_hash)
+            except FacturapiException:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(refresh)
+
+    def close(self) -> None:
+        """Waits for the background refreshes and closes the database connection"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._connection.close()
+
+
+class MirrorMixin:
+    """Adds a local mirror to the customers and products clients
+
+    Args:
+        api_key (str): Facturapi secret key
+        mirror (MirrorStore, optional): Local mirror used to answer retrieve without network.
+            Defaults to None.
+    """
+
+    def __init__(self, api_key: str, mirror: MirrorStore = None, **kwargs) -> None:
+        super().__init__(api_key, **kwargs)
+        self.mirror = mirror
+        self._key_hash = get_key_namespace(api_key)
+
+    @property
+    def _skip_cache(self) -> bool:
+        """Records fetched for a mirror that bounds their age must not come from the response
+        cache, which could be older than max_age
+        """
+        return self.mirror is not None and self.mirror.policy != READ_THROUGH
+
+    def _build_mirrored(self, record: dict) -> Any:
+        """Builds the model of a mirrored record. Clients return their model"""
+        return record
+
+    def _mirror_records(self, records: Iterable[dict]) -> None:
+        """Stores records returned by the API in the mirror"""
+        if self.mirror is not None:
+            self.mirror.put_many(self.endpoint, records, self._key_hash)
+
+    def _mirror_delete(self, object_id: str) -> None:
+        """Removes a deleted record from the mirror"""
+        if self.mirror is not None:
+            self.mirror.delete(self.endpoint, object_id, self._key_hash)
+
+    def _get_mirror_entry(self, object_id: str) -> Tuple[dict, bool]:
+        """Looks up a record in the mirror
+
+        Returns:
+            Tuple[dict, bool]: Record, or None if it must be fetched, and whether it must be
+                refreshed in the background
+        """
+        entry = self.mirror.get(self.endpoint, object_id, self._key_hash)
+        if entry is None:
+            return None, False
+        record, age = entry
+        if age <= self.mirror.max_age or self.mirror.policy == READ_THROUGH:
+            return record, False
+        if self.mirror.policy == STALE_WHILE_REVALIDATE:
+            return record, True
+        return None, False
+
+    def _retrieve_mirrored(self, object_id: str, fetch: Callable[[], dict]) -> dict:
+        """Returns a record from the mirror according to its policy, or from the API
+
+        Args:
+            object_id (str): Id of the record
+            fetch (Callable[[], dict]): Function that gets the record from the API
+
+        Returns:
+            dict: Record
+        """
+        if self.mirror is None:
+            return fetch()
+
+        record, revalidate = self._get_mirror_entry(object_id)
+        if revalidate:
+            self.mirror.revalidate(self.endpoint, object_id, fetch, self._key_hash)
+        if record is None:
+            record = fetch()
+            self.mirror.put(self.endpoint, record, self._key_hash)
+        return record
+
+    def search_mirror(self, search: str, limit: int = 10) -> list:
+        """Searches the local mirror without network
+
+        Args:
+            search (str): Text to search
+            limit (int, optional): Maximum quantity of results. Defaults to 10.
+
+        Returns:
+            list: Matching objects, or an empty list if the client has no mirror
+        """
+        if self.mirror is None:
+            return []
+        records = self.mirror.search(self.endpoint, search, limit, self._key_hash)
+        return [self._build_mirrored(record) for record in records]
@@ -1,11 +1,29 @@
 """FacturAPI object models"""
 from collections.abc import Sequence
 from datetime import datetime
-from typing import Iterator, List, NamedTuple, Type
-
-from dateutil.parser import isoparse
-
-from .constants import IEPSMode, TaxFactor, Taxability, TaxSystem, TaxType
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from .constants import (
+    IEPSMode,
+    InvoiceUse,
+    PaymentForm,
+    PaymentMethod,
+    TaxFactor,
+    Taxability,
+    TaxSystem,
+    TaxType,
+)
 
 # The maximum number of items to display in a CustomerList.__repr__
 REPR_OUTPUT_SIZE = 20
@@ -39,6 +57,101 @@ class BaseList(Sequence):
         return f"<{self.__class__.__name__} {data} Total: {qty}>"
 
 
+def parse_date(value: str) -> datetime:
+    """Parses an ISO 8601 date of an API response
+
+    Args:
+        value (str): ISO 8601 date, or None
+
+    Returns:
+        datetime: Parsed date, or None
+    """
+    if not value:
+        return None
+    # Imported on first use, so importing the models stays cheap
+    from dateutil.parser import isoparse  # pylint: disable=import-outside-toplevel
+
+    return isoparse(value)
+
+
+class LazyField:
+    """Model attribute read from the raw API response and parsed on first access. The parsed
+    value is stored in the instance, so later reads skip the descriptor
+
+    Args:
+        parse (Callable[[Any], Any], optional): Function that converts the raw value. It is not
+            called for missing or null values. Defaults to None.
+        default_factory (Callable[[], Any], optional): Returns the value of missing fields.
+            Defaults to None.
+    """
+
+    def __init__(
+        self, parse: Callable[[Any], Any] = None, default_factory: Callable[[], Any] = None
+    ) -> None:
+        self.parse = parse
+        self.default_factory = default_factory
+        self.name = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance, owner: type = None) -> Any:
+        if instance is None:
+            return self
+        value = instance.raw.get(self.name)
+        if value is None and self.default_factory is not None:
+            value = self.default_factory()
+        elif self.parse is not None and value is not None:
+            value = self.parse(value)
+        instance.__dict__[self.name] = value
+        return value
+
+
+class LazyModel:
+    """Model that wraps the decoded API response without copying it. Fields are parsed only
+    when they are read. Assigning a field replaces its value on that instance only. Subclasses set
+    model to the eager NamedTuple with the same fields.
+
+    Args:
+        raw (dict): Decoded API response
+    """
+
+    # Set by the subclasses
+    model: Optional[Type[tuple]]
+
+    def __init__(self, raw: dict) -> None:
+        self.raw = raw
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self}>"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyModel):
+            return self.raw == other.raw
+        return NotImplemented
+
+    __hash__ = None
+
+    def _asdict(self) -> dict:
+        """Returns every field parsed, like NamedTuple._asdict
+
+        Raises:
+            TypeError: If the subclass doesn't set model
+        """
+        if getattr(self, "model", None) is None:
+            raise TypeError(f"{self.__class__.__name__}.model is not set")
+        return {name: getattr(self, name) for name in self.model._fields}
+
+    def to_model(self) -> tuple:
+        """Returns the eager model object with every field parsed
+
+        Raises:
+            TypeError: If the subclass doesn't set model
+        """
+        fields = self._asdict()
+        return self.model(**fields)
+
+
 class Address(NamedTuple):
     """Customer address"""
 
@@ -76,6 +189,25 @@ class Customer(NamedTuple):
         return self.legal_name
 
 
+class LazyCustomer(LazyModel):
+    """Customer object that parses its fields on first access. Mirrors Customer"""
+
+    model = Customer
+
+    id = LazyField()  # pylint: disable=invalid-name
+    created_at = LazyField(parse_date)
+    livemode = LazyField()
+    legal_name = LazyField()
+    tax_id = LazyField()
+    tax_system = LazyField(TaxSystem)
+    address = LazyField(lambda address: Address(**address))
+    email = LazyField()
+    phone = LazyField()
+
+    def __str__(self) -> str:
+        return self.legal_name
+
+
 class CustomerList(BaseList):
     """Customer list object"""
 
@@ -124,6 +256,23 @@ class CustomerValidations:
         return "; ".join([e.message for e in self.errors])
 
 
+def get_enum(enum_class: Type[Enum], value: Any) -> Union[Enum, Any]:
+    """Returns the member of an enum with the given value. Values unknown to this library, e.g.
+    codes added by the SAT after its release, are returned unchanged
+
+    Args:
+        enum_class (Type[Enum]): Enum class
+        value (Any): Value of the member
+
+    Returns:
+        Union[Enum, Any]: Enum member, or value if there is no member with it
+    """
+    try:
+        return enum_class(value)
+    except ValueError:
+        return value
+
+
 class ProductTax(NamedTuple):
     """Tax object of a product"""
 
@@ -158,6 +307,50 @@ class Product(NamedTuple):
         return self.description
 
 
+def build_product_taxes(taxes: List[dict]) -> List[ProductTax]:
+    """Build the ProductTax objects of a product
+
+    Args:
+        taxes (List[dict]): Taxes of the API response
+
+    Returns:
+        List[ProductTax]: Product taxes
+    """
+    return [
+        ProductTax(
+            tax["rate"],
+            get_enum(TaxType, tax.get("type")),
+            get_enum(TaxFactor, tax.get("factor")),
+            tax.get("withholding", False),
+            get_enum(IEPSMode, tax.get("ieps_mode")),
+        )
+        for tax in taxes
+    ]
+
+
+class LazyProduct(LazyModel):
+    """Product object that parses its fields on first access. Mirrors Product"""
+
+    model = Product
+
+    id = LazyField()  # pylint: disable=invalid-name
+    created_at = LazyField(parse_date)
+    livemode = LazyField()
+    description = LazyField()
+    product_key = LazyField()
+    price = LazyField()
+    tax_included = LazyField()
+    taxes = LazyField(build_product_taxes)
+    local_taxes = LazyField(default_factory=list)
+    unit_key = LazyField()
+    unit_name = LazyField()
+    sku = LazyField()
+    taxability = LazyField(lambda taxability: Taxability(taxability) if taxability else None)
+
+    def __str__(self) -> str:
+        return self.description
+
+
 class ProductList(BaseList):
     """List of products"""
 
@@ -167,25 +360,37 @@ class ProductList(BaseList):
         super().__init__(page, total_pages, total_results, data)
 
 
-def build_item_list(api_response: dict, list_class: Type[BaseList]) -> Type[BaseList]:
+def _build_list(
+    api_response: dict, list_class: Type[BaseList], build_function: Callable
+) -> Type[BaseList]:
+    """Builds a list object, building every item with build_function"""
+    return list_class(
+        page=api_response.get("page"),
+        total_pages=api_response.get("total_pages"),
+        total_results=api_response.get("total_results"),
+        data=[build_function(item) for item in api_response["data"]],
+    )
+
+
+def build_item_list(
+    api_response: dict, list_class: Type[BaseList], lazy: bool = False
+) -> Type[BaseList]:
     """Build a “ItemList” object from the API response.
 
     Args:
         api_response (dict): API response
         list_class (Type[BaseList]): List class to build
+        lazy (bool, optional): Wrap every item in a lazy model that parses its fields on first
+            access, instead of building them upfront. Defaults to False.
 
     Returns:
         Type[BaseList]: Item list object instance
     """
-    build_function_map = {CustomerList: build_customer, ProductList: build_product}
-    data = [build_function_map[list_class](item) for item in api_response["data"]]
-    list_kwargs = {
-        "page": api_response.get("page"),
-        "total_pages": api_response.get("total_pages"),
-        "total_results": api_response.get("total_results"),
-        "data": data,
-    }
-    return list_class(**list_kwargs)
+    if lazy:
+        build_function_map = {CustomerList: LazyCustomer, ProductList: LazyProduct}
+    else:
+        build_function_map = {CustomerList: build_customer, ProductList: build_product}
+    return _build_list(api_response, list_class, build_function_map[list_class])
 
 
 def build_customer(api_response: dict) -> Customer:
@@ -199,7 +404,7 @@ def build_customer(api_response: dict) -> Customer:
     """
     return Customer(
         api_response.get("id"),
-        isoparse(api_response.get("created_at")),
+        parse_date(api_response.get("created_at")),
         api_response.get("livemode"),
         api_response.get("legal_name"),
         api_response.get("tax_id"),
@@ -210,16 +415,17 @@ def build_customer(api_response: dict) -> Customer:
     )
 
 
-def build_customer_list(api_response: dict) -> CustomerList:
+def build_customer_list(api_response: dict, lazy: bool = False) -> CustomerList:
     """Build a CustomerList from an API response
 
     Args:
         api_response (dict): API response
+        lazy (bool, optional): Build LazyCustomer objects. Defaults to False.
 
     Returns:
         CustomerList: List of customers
     """
-    return build_item_list(api_response, CustomerList)
+    return build_item_list(api_response, CustomerList, lazy)
 
 
 def build_product(api_response: dict) -> Product:
@@ -233,20 +439,11 @@ def build_product(api_response: dict) -> Product:
     """
 
     taxability = api_response.get("taxability")
-    taxes = api_response["taxes"]
-
-    product_taxes = []
-    for tax in taxes:
-        tax_type = TaxType(tax["type"])
-        factor = TaxFactor(tax["factor"])
-        ieps_mode = IEPSMode(tax["ieps_mode"])
-        product_taxes.append(
-            ProductTax(tax["rate"], tax_type, factor, tax["withholding"], ieps_mode)
-        )
+    product_taxes = build_product_taxes(api_response["taxes"])
 
     return Product(
         api_response.get("id"),
-        isoparse(api_response.get("created_at")),
+        parse_date(api_response.get("created_at")),
         api_response.get("livemode"),
         api_response.get("description"),
         api_response.get("product_key"),
@@ -261,13 +458,391 @@ def build_product(api_response: dict) -> Product:
     )
 
 
-def build_product_list(api_response: dict) -> ProductList:
+def build_product_list(api_response: dict, lazy: bool = False) -> ProductList:
     """Build a ProductList object from an API response
 
     Args:
         api_response (dict): API response
+        lazy (bool, optional): Build LazyProduct objects. Defaults to False.
 
     Returns:
         ProductList: List of products
     """
-    return build_item_list(api_response, ProductList)
+    return build_item_list(api_response, ProductList, lazy)
+
+
+class InvoiceItem(NamedTuple):
+    """Concept of an invoice or receipt"""
+
+    quantity: float
+    description: str
+    product_key: str
+    price: float
+    discount: float = 0
+    product_id: str = None
+    unit_key: str = None
+    unit_name: str = None
+    sku: str = None
+    taxes: Tuple[ProductTax, ...] = ()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.quantity} x {self.description}>"
+
+
+class Invoice(NamedTuple):
+    """Invoice object. raw holds the API response when the invoice is built with keep_raw"""
+
+    id: str
+    created_at: datetime
+    livemode: bool
+    status: str
+    type: str
+    date: datetime
+    customer_id: str
+    customer_legal_name: str
+    customer_tax_id: str
+    total: float
+    currency: str
+    exchange: float
+    payment_form: Union[PaymentForm, str]
+    payment_method: Union[PaymentMethod, str]
+    use: Union[InvoiceUse, str]
+    uuid: str
+    series: str
+    folio_number: int
+    cancellation_status: str
+    verification_url: str
+    items: Tuple[InvoiceItem, ...] = ()
+    raw: dict = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self}>"
+
+    def __str__(self) -> str:
+        return f"{self.series or ''}{self.folio_number} {self.customer_legal_name}"
+
+
+class InvoiceList(BaseList):
+    """List of invoices"""
+
+    def __init__(
+        self, page: int, total_pages: int, total_results: int, data: List[Invoice]
+    ) -> None:
+        super().__init__(page, total_pages, total_results, data)
+
+
+class Receipt(NamedTuple):
+    """Receipt object. raw holds the API response when the receipt is built with keep_raw"""
+
+    id: str
+    created_at: datetime
+    livemode: bool
+    status: str
+    date: datetime
+    total: float
+    currency: str
+    exchange: float
+    payment_form: Union[PaymentForm, str]
+    folio_number: int
+    branch: str
+    key: str
+    self_invoice_url: str
+    invoice_id: str = None
+    items: Tuple[InvoiceItem, ...] = ()
+    raw: dict = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self}>"
+
+    def __str__(self) -> str:
+        return f"{self.folio_number} {self.status}"
+
+
+class ReceiptList(BaseList):
+    """List of receipts"""
+
+    def __init__(
+        self, page: int, total_pages: int, total_results: int, data: List[Receipt]
+    ) -> None:
+        super().__init__(page, total_pages, total_results, data)
+
+
+class Retention(NamedTuple):
+    """Retention object. raw holds the API response when the retention is built with
+    keep_raw
+    """
+
+    id: str
+    created_at: datetime
+    livemode: bool
+    status: str
+    date: datetime
+    customer_id: str
+    customer_legal_name: str
+    customer_tax_id: str
+    uuid: str
+    series: str
+    folio_number: int
+    cancellation_status: str
+    raw: dict = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self}>"
+
+    def __str__(self) -> str:
+        return f"{self.series or ''}{self.folio_number} {self.customer_legal_name}"
+
+
+class RetentionList(BaseList):
+    """List of retentions"""
+
+    def __init__(
+        self, page: int, total_pages: int, total_results: int, data: List[Retention]
+    ) -> None:
+        super().__init__(page, total_pages, total_results, data)
+
+
+class Organization(NamedTuple):
+    """Organization object. raw holds the API response when the organization is built with
+    keep_raw
+    """
+
+    id: str
+    created_at: datetime
+    is_production_ready: bool
+    pending_steps: Tuple[str, ...]
+    name: str
+    legal_name: str
+    tax_id: str
+    tax_system: Union[TaxSystem, str]
+    certificate_expires_at: datetime = None
+    raw: dict = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self}>"
+
+    def __str__(self) -> str:
+        return self.legal_name or self.name or self.id
+
+
+class OrganizationList(BaseList):
+    """List of organizations"""
+
+    def __init__(
+        self,
+        page: int,
+        total_pages: int,
+        total_results: int,
+        data: List[Organization],
+    ) -> None:
+        super().__init__(page, total_pages, total_results, data)
+
+
+def build_invoice_item(api_response: dict) -> InvoiceItem:
+    """Build an InvoiceItem object from an item of an invoice or receipt
+
+    Args:
+        api_response (dict): Item of the API response
+
+    Returns:
+        InvoiceItem: Invoice item object
+    """
+    product = api_response.get("product")
+    if not isinstance(product, dict):
+        # The product may be just the id of a product of the catalog
+        product = {"id": product}
+
+    return InvoiceItem(
+        api_response.get("quantity", 1),
+        product.get("description"),
+        product.get("product_key"),
+        product.get("price"),
+        api_response.get("discount", 0),
+        product.get("id"),
+        product.get("unit_key"),
+        product.get("unit_name"),
+        product.get("sku"),
+        tuple(build_product_taxes(product.get("taxes", []))),
+    )
+
+
+def build_invoice(api_response: dict, keep_raw: bool = False) -> Invoice:
+    """Build an Invoice object from an API response
+
+    Args:
+        api_response (dict): API response
+        keep_raw (bool, optional): Keep the API response in the raw field. Defaults to False.
+
+    Returns:
+        Invoice: Invoice object
+    """
+    customer = api_response.get("customer") or {}
+    return Invoice(
+        api_response.get("id"),
+        parse_date(api_response.get("created_at")),
+        api_response.get("livemode"),
+        api_response.get("status"),
+        api_response.get("type"),
+        parse_date(api_response.get("date")),
+        customer.get("id"),
+        customer.get("legal_name"),
+        customer.get("tax_id"),
+        api_response.get("total"),
+        api_response.get("currency"),
+        api_response.get("exchange"),
+        get_enum(PaymentForm, api_response.get("payment_form")),
+        get_enum(PaymentMethod, api_response.get("payment_method")),
+        get_enum(InvoiceUse, api_response.get("use")),
+        api_response.get("uuid"),
+        api_response.get("series"),
+        api_response.get("folio_number"),
+        api_response.get("cancellation_status"),
+        api_response.get("verification_url"),
+        tuple(build_invoice_item(i) for i in api_response.get("items", [])),
+        api_response if keep_raw else None,
+    )
+
+
+def build_invoice_list(api_response: dict, keep_raw: bool = False) -> InvoiceList:
+    """Build an InvoiceList object from an API response
+
+    Args:
+        api_response (dict): API response
+        keep_raw (bool, optional): Keep the API response of every invoice. Defaults to False.
+
+    Returns:
+        InvoiceList: List of invoices
+    """
+    return _build_list(api_response, InvoiceList, lambda i: build_invoice(i, keep_raw))
+
+
+def build_receipt(api_response: dict, keep_raw: bool = False) -> Receipt:
+    """Build a Receipt object from an API response
+
+    Args:
+        api_response (dict): API response
+        keep_raw (bool, optional): Keep the API response in the raw field. Defaults to False.
+
+    Returns:
+        Receipt: Receipt object
+    """
+    invoice = api_response.get("invoice")
+    return Receipt(
+        api_response.get("id"),
+        parse_date(api_response.get("created_at")),
+        api_response.get("livemode"),
+        api_response.get("status"),
+        parse_date(api_response.get("date")),
+        api_response.get("total"),
+        api_response.get("currency"),
+        api_response.get("exchange"),
+        get_enum(PaymentForm, api_response.get("payment_form")),
+        api_response.get("folio_number"),
+        api_response.get("branch"),
+        api_response.get("key"),
+        api_response.get("self_invoice_url"),
+        invoice.get("id") if isinstance(invoice, dict) else invoice,
+        tuple(build_invoice_item(i) for i in api_response.get("items", [])),
+        api_response if keep_raw else None,
+    )
+
+
+def build_receipt_list(api_response: dict, keep_raw: bool = False) -> ReceiptList:
+    """Build a ReceiptList object from an API response
+
+    Args:
+        api_response (dict): API response
+        keep_raw (bool, optional): Keep the API response of every receipt. Defaults to False.
+
+    Returns:
+        ReceiptList: List of receipts
+    """
+    return _build_list(api_response, ReceiptList, lambda i: build_receipt(i, keep_raw))
+
+
+def build_retention(api_response: dict, keep_raw: bool = False) -> Retention:
+    """Build a Retention object from an API response
+
+    Args:
+        api_response (dict): API response
+        keep_raw (bool, optional): Keep the API response in the raw field. Defaults to False.
+
+    Returns:
+        Retention: Retention object
+    """
+    customer = api_response.get("customer") or {}
+    return Retention(
+        api_response.get("id"),
+        parse_date(api_response.get("created_at")),
+        api_response.get("livemode"),
+        api_response.get("status"),
+        parse_date(api_response.get("date")),
+        customer.get("id"),
+        customer.get("legal_name"),
+        customer.get("tax_id"),
+        api_response.get("uuid"),
+        api_response.get("series"),
+        api_response.get("folio_number"),
+        api_response.get("cancellation_status"),
+        api_response if keep_raw else None,
+    )
+
+
+def build_retention_list(api_response: dict, keep_raw: bool = False) -> RetentionList:
+    """Build a RetentionList object from an API response
+
+    Args:
+        api_response (dict): API response
+        keep_raw (bool, optional): Keep the API response of every retention. Defaults to False.
+
+    Returns:
+        RetentionList: List of retentions
+    """
+    return _build_list(
+        api_response, RetentionList, lambda i: build_retention(i, keep_raw)
+    )
+
+
+def build_organization(api_response: dict, keep_raw: bool = False) -> Organization:
+    """Build an Organization object from an API response
+
+    Args:
+        api_response (dict): API response
+        keep_raw (bool, optional): Keep the API response in the raw field. Defaults to False.
+
+    Returns:
+        Organization: Organization object
+    """
+    legal = api_response.get("legal") or {}
+    certificate = api_response.get("certificate") or {}
+    pending_steps = api_response.get("pending_steps", [])
+    return Organization(
+        api_response.get("id"),
+        parse_date(api_response.get("created_at")),
+        api_response.get("is_production_ready"),
+        tuple(s.get("type") if isinstance(s, dict) else s for s in pending_steps),
+        legal.get("name"),
+        legal.get("legal_name"),
+        legal.get("tax_id"),
+        get_enum(TaxSystem, legal.get("tax_system")),
+        parse_date(certificate.get("expires_at")),
+        api_response if keep_raw else None,
+    )
+
+
+def build_organization_list(
+    api_response: dict, keep_raw: bool = False
+) -> OrganizationList:
+    """Build an OrganizationList object from an API response
+
+    Args:
+        api_response (dict): API response
+        keep_raw (bool, optional): Keep the API response of every organization.
+            Defaults to False.
+
+    Returns:
+        OrganizationList: List of organizations
+    """
+    return _build_list(
+        api_response, OrganizationList, lambda i: build_organization(i, keep_raw)
+    )
@@ -4,9 +4,10 @@ from typing import Union
 
 from .constants import ReceiptPeriodicity
 from .http import BaseClient
+from .pagination import PaginatedClientMixin
 
 
-class OrganizationsClient(BaseClient):
+class OrganizationsClient(PaginatedClientMixin, BaseClient):
     """Organizations API client"""
 
     endpoint = "organizations"
@@ -21,7 +22,8 @@ class OrganizationsClient(BaseClient):
             dict: Created Organization object
         """
         url = self._get_request_url()
-        return self._execute_request("POST", url, json_data={"name": name}).json()
+        response = self._execute_request("POST", url, json_data={"name": name})
+        return self._decode_json(response)
 
     def all(
         self,
@@ -47,24 +49,12 @@ class OrganizationsClient(BaseClient):
             dict: List of organizations
         """
 
-        params = {}
-        if search:
-            params.update({"q": search})
-
-        if start_date:
-            params.update({"date[gt]": start_date.astimezone().isoformat()})
-
-        if end_date:
-            params.update({"date[lt]": end_date.astimezone().isoformat()})
-
-        if page:
-            params.update({"page": page})
-
-        if limit:
-            params.update({"limit": limit})
+        params = self._get_list_params(
+            search, start_date=start_date, end_date=end_date, page=page, limit=limit
+        )
 
         url = self._get_request_url()
-        return self._execute_request("GET", url, params).json()
+        return self._decode_json(self._execute_request("GET", url, params))
 
     def retrieve(self, organization_id) -> dict:
         """Returns a single organization object
@@ -76,7 +66,7 @@ class OrganizationsClient(BaseClient):
             dict: Organization object
         """
         url = self._get_request_url([organization_id])
-        return self._execute_request("GET", url).json()
+        return self._get_cached_json("retrieve", url)
 
     def update(self, organization_id: str, data: dict) -> dict:
         """Updates the fiscal data of the organization
@@ -89,7 +79,7 @@ class OrganizationsClient(BaseClient):
             dict: Updated organization object
         """
         url = self._get_request_url([organization_id, "legal"])
-        return self._execute_request("PUT", url, json_data=data).json()
+        return self._decode_json(self._execute_request("PUT", url, json_data=data))
 
     def delete(self, organization_id: str) -> dict:
         """Delete an organization
@@ -101,7 +91,7 @@ class OrganizationsClient(BaseClient):
             dict: Deleted organization object
         """
         url = self._get_request_url([organization_id])
-        return self._execute_request("DELETE", url).json()
+        return self._decode_json(self._execute_request("DELETE", url))
 
     def upload_csd(
         self, organization_id: str, cer_file: bytes, key_file: bytes, password: str
@@ -121,7 +111,7 @@ class OrganizationsClient(BaseClient):
 
         data = {"cerFile": cer_file, "keyFile": key_file, "password": password}
         url = self._get_request_url([organization_id, "certificate"])
-        return self._execute_request("PUT", url, json_data=data).json()
+        return self._decode_json(self._execute_request("PUT", url, json_data=data))
 
     def upload_logo(self, organization_id: str, file: bytes) -> dict:
         """Uploads the organization's logo thet will be used for the PDF invoices and emails sent
@@ -135,7 +125,8 @@ class OrganizationsClient(BaseClient):
             dict: Organization object
         """
         url = self._get_request_url([organization_id, "logo"])
-        return self._execute_request("PUT", url, json_data={"file": file}).json()
+        response = self._execute_request("PUT", url, json_data={"file": file})
+        return self._decode_json(response)
 
     def update_customization(
         self,
@@ -165,7 +156,7 @@ class OrganizationsClient(BaseClient):
             "next_folio_number_test": next_folio_number_test,
             "pdf_extra": pdf_extra,
         }
-        return self._execute_request("PUT", url, json_data=data).json()
+        return self._decode_json(self._execute_request("PUT", url, json_data=data))
 
     def update_receipt_settings(
         self,
@@ -199,7 +190,7 @@ class OrganizationsClient(BaseClient):
             "next_folio_number": next_folio_number,
             "next_folio_number_test": next_folio_number_test,
         }
-        return self._execute_request("PUT", url, json_data=data).json()
+        return self._decode_json(self._execute_request("PUT", url, json_data=data))
 
     def check_domain(self, domain: str) -> bool:
         """Checks if an identifier is available to choose as a domain for the self-billing portal
@@ -211,8 +202,8 @@ class OrganizationsClient(BaseClient):
             bool: True if domain is available
         """
         url = self._get_request_url(["domain-check"])
-        response = self._execute_request("GET", url, {"domain": domain}).json()
-        return response["available"]
+        response = self._execute_request("GET", url, {"domain": domain})
+        return self._decode_json(response)["available"]
 
     def update_domain(self, organization_id: str, domain: str) -> dict:
         """Choose the domain that this organization will use on its self-billing microsite.
@@ -226,7 +217,8 @@ class OrganizationsClient(BaseClient):
             dict: Updated organization domain
         """
         url = self._get_request_url([organization_id, "domain"])
-        return self._execute_request("PUT", url, json_data={"domain": domain}).json()
+        response = self._execute_request("PUT", url, json_data={"domain": domain})
+        return self._decode_json(response)
 
     def get_test_api_key(self, organization_id: str) -> str:
         """Retrieves the test environment secret API key of an organization
@@ -238,7 +230,7 @@ class OrganizationsClient(BaseClient):
             str: Test API Key
         """
         url = self._get_request_url([organization_id, "apikeys", "test"])
-        return self._execute_request("GET", url).json()
+        return self._decode_json(self._execute_request("GET", url))
 
     def renew_test_api_key(self, organization_id: str) -> str:
         """Renews the test environment secret API key of an organization
@@ -250,7 +242,7 @@ class OrganizationsClient(BaseClient):
             str: Test API Key
         """
         url = self._get_request_url([organization_id, "apikeys", "test"])
-        return self._execute_request("PUT", url).json()
+        return self._decode_json(self._execute_request("PUT", url))
 
     def renew_live_api_key(self, organization_id: str) -> str:
         """Renews the live environment secret API key of an organization
@@ -262,4 +254,4 @@ class OrganizationsClient(BaseClient):
             str: Live API Key
         """
         url = self._get_request_url([organization_id, "apikeys", "live"])
-        return self._execute_request("PUT", url).json()
+        return self._decode_json(self._execute_request("PUT", url))
@@ -0,0 +1,166 @@
+"""Pagination helpers for the list endpoints"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterator, Tuple
+
+from .timeouts import submit_in_context
+
+# The maximum number of results the API returns per page
+MAX_PAGE_SIZE = 50
+
+
+def get_page_data(page: Any) -> Tuple[list, int]:
+    """Returns the items and the total number of pages of a list endpoint response
+
+    Args:
+        page (Any): Page returned by an `all` method, either a BaseList or a dict
+
+    Returns:
+        Tuple[list, int]: Items of the page and total pages
+    """
+    if isinstance(page, dict):
+        return page.get("data", []), page.get("total_pages")
+    return page.data, page.total_pages
+
+
+def iter_pages(
+    fetch_page: Callable[[int], Any], prefetch: bool = False, first_page: int = 1
+) -> Iterator:
+    """Yields the pages of a list endpoint until the last one is reached. Background fetches run
+    in a copy of the caller's context, so they share its deadline
+
+    Args:
+        fetch_page (Callable[[int], Any]): Function that returns the requested page number
+        prefetch (bool, optional): Fetch the next page in a background thread while the current
+            one is consumed. Defaults to False.
+        first_page (int, optional): Page to start from. Defaults to 1.
+
+    Yields:
+        Any: Pages as returned by fetch_page
+    """
+    if not prefetch:
+        number = first_page
+        while True:
+            page = fetch_page(number)
+            yield page
+            data, total_pages = get_page_data(page)
+            if not data or not total_pages or number >= total_pages:
+                return
+            number += 1
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        number = first_page
+        future = submit_in_context(executor, fetch_page, number)
+        while future:
+            page = future.result()
+            data, total_pages = get_page_data(page)
+            has_next = data and total_pages and number < total_pages
+            number += 1
+            future = None
+            if has_next:
+                future = submit_in_context(executor, fetch_page, number)
+            yield page
+    finally:
+        if future:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_pages_concurrently(
+    fetch_page: Callable[[int], Any],
+    max_workers: int = 4,
+    ordered: bool = True,
+    first_page: int = 1,
+) -> Iterator:
+    """Yields the pages of a list endpoint fetching them in parallel. The first page is requested
+    alone to learn the total number of pages, then the remaining ones are requested over a
+    bounded thread pool. At most `max_workers * 2` pages are held in memory at once. The pages
+    are fetched in copies of the caller's context, so they share its deadline.
+
+    Args:
+        fetch_page (Callable[[int], Any]): Function that returns the requested page number
+        max_workers (int, optional): Maximum number of parallel requests. Defaults to 4.
+        ordered (bool, optional): Yield the pages in page order. If False, pages are yielded as
+            soon as they are fetched. Defaults to True.
+        first_page (int, optional): Page to start from. Defaults to 1.
+
+    Yields:
+        Any: Pages as returned by fetch_page
+    """
+    page = fetch_page(first_page)
+    yield page
+    data, total_pages = get_page_data(page)
+    if not data or not total_pages or first_page >= total_pages:
+        return
+
+    numbers = iter(range(first_page + 1, total_pages + 1))
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+
+    def submit_next() -> None:
+        number = next(numbers, None)
+        if number is not None:
+            pending.append(submit_in_context(executor, fetch_page, number))
+
+    try:
+        for _ in range(max_workers * 2):
+            submit_next()
+
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+
+            for future in done:
+                page = future.result()
+                submit_next()
+                yield page
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+class PaginatedClientMixin:  # pylint: disable=too-few-public-methods
+    """Adds auto-pagination to clients that implement a paginated `all` method"""
+
+    def iter_all(  # pylint: disable=too-many-arguments
+        self,
+        prefetch: bool = False,
+        page_size: int = MAX_PAGE_SIZE,
+        max_workers: int = None,
+        ordered: bool = True,
+        **kwargs,
+    ) -> Iterator:
+        """Lazily yields every item of the list endpoint, requesting one page at a time.
+        If max_workers is set, the pages after the first one are requested in parallel
+
+        Args:
+            prefetch (bool, optional): Fetch the next page in the background while the current
+                one is consumed. Defaults to False.
+            page_size (int, optional): Results per page. Defaults to MAX_PAGE_SIZE.
+            max_workers (int, optional): Number of pages to request in parallel. Defaults to
+                None.
+            ordered (bool, optional): With max_workers, yield the items in page order. If False,
+                pages are yielded as they arrive. Defaults to True.
+            **kwargs: Search arguments accepted by the client's `all` method
+
+        Yields:
+            Any: Items of the list, in the same form returned by `all`
+        """
+
+        def fetch_page(number: int) -> Any:
+            return self.all(page=number, limit=page_size, **kwargs)
+
+        if max_workers:
+            pages = iter_pages_concurrently(fetch_page, max_workers, ordered)
+        else:
+            pages = iter_pages(fetch_page, prefetch)
+
+        for page in pages:
+            data, _ = get_page_data(page)
+            yield from data
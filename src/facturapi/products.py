@@ -3,14 +3,72 @@ from typing import List, Union
 
 from .constants import Taxability
 from .http import BaseClient
+from .mirror import MirrorMixin
 from .models import Product, ProductList, build_product, build_product_list
-
-
-class ProductsClient(BaseClient):
+from .pagination import PaginatedClientMixin
+
+
+def _get_taxability(taxability: Union[Taxability, str, None]) -> dict:
+    """Returns the taxability entry of a product request body"""
+    if isinstance(taxability, Taxability):
+        taxability = taxability.value
+    return {"taxability": taxability} if taxability else {}
+
+
+def _get_product_data(  # pylint: disable=too-many-arguments
+    description: str,
+    product_key: str,
+    price: Union[int, float],
+    tax_included: bool = True,
+    taxes: List[dict] = None,
+    unit_key: str = "H87",
+    **kwargs,
+) -> dict:
+    """Builds the request body to create a product. See ProductsClient.create"""
+    data = {
+        "description": description,
+        "product_key": product_key,
+        "price": price,
+        "tax_included": tax_included,
+        "unit_key": unit_key,
+        **{k: v for k, v in kwargs.items() if k in ["unit_name", "sku"]},
+    }
+
+    if taxes is not None:
+        data.update({"taxes": taxes})
+
+    data.update(_get_taxability(kwargs.get("taxability")))
+    return data
+
+
+def _get_product_update_data(**kwargs) -> dict:
+    """Builds the request body to update a product. See ProductsClient.update"""
+    allowed_args = [
+        "description",
+        "product_key",
+        "price",
+        "tax_included",
+        "unit_key",
+        "sku",
+    ]
+    data = {k: v for k, v in kwargs.items() if k in allowed_args}
+
+    taxes = kwargs.get("taxes")
+    if taxes is not None:
+        data.update({"taxes": taxes})
+
+    data.update(_get_taxability(kwargs.get("taxability")))
+    return data
+
+
+class ProductsClient(MirrorMixin, PaginatedClientMixin, BaseClient):
     """Products API client"""
 
     endpoint = "products"
 
+    def _build_mirrored(self, record: dict) -> Product:
+        return build_product(record)
+
     def create(  # pylint: disable=too-many-arguments
         self,
         description: str,
@@ -53,30 +111,17 @@ class ProductsClient(BaseClient):
         Returns:
             Product: Created product
         """
-        data = {
-            "description": description,
-            "product_key": product_key,
-            "price": price,
-            "tax_included": tax_included,
-            "unit_key": unit_key,
-            **{k: v for k, v in kwargs.items() if k in ["unit_name", "sku"]},
-        }
-
-        if taxes is not None:
-            data.update({"taxes": taxes})
-
-        taxability = kwargs.get("taxability")
-        if isinstance(taxability, Taxability):
-            taxability = taxability.value
-        if taxability:
-            data.update({"taxability": taxability})
+        data = _get_product_data(
+            description, product_key, price, tax_included, taxes, unit_key, **kwargs
+        )
 
         url = self._get_request_url()
-        response = self._execute_request("POST", url, json_data=data).json()
+        response = self._decode_json(self._execute_request("POST", url, json_data=data))
+        self._mirror_records([response])
         return build_product(response)
 
     def all(
-        self, search: str = None, page: int = None, limit: int = None
+        self, search: str = None, page: int = None, limit: int = None, lazy: bool = False
     ) -> ProductList:
         """Returns a paginated list of all products of an organization or search by parameters
         recieved
@@ -86,15 +131,17 @@ class ProductsClient(BaseClient):
             Defaults to None.
             page (int, optional): Page of the result list. Defaults to None.
             limit (int, optional): Number of maximum quantity of results. Defaults to None.
+            lazy (bool, optional): Return LazyProduct objects, which parse their fields on
+                first access. Faster when only a few fields are read. Defaults to False.
 
         Returns:
             ProductList: List-like object containing the product search results
         """
-        kwargs = {"q": search, "page": page, "limit": limit}
-        params = {k: v for k, v in kwargs.items() if v}
+        params = self._get_list_params(search, page=page, limit=limit)
         url = self._get_request_url()
-        response = self._execute_request("GET", url, params).json()
-        return build_product_list(response)
+        response = self._decode_json(self._execute_request("GET", url, params))
+        self._mirror_records(response["data"])
+        return build_product_list(response, lazy)
 
     def retrieve(self, product_id: str) -> Product:
         """Returns a single product object
@@ -106,7 +153,10 @@ class ProductsClient(BaseClient):
             Product: Retrieved product
         """
         url = self._get_request_url([product_id])
-        response = self._execute_request("GET", url).json()
+        response = self._retrieve_mirrored(
+            product_id,
+            lambda: self._get_cached_json("retrieve", url, refresh=self._skip_cache),
+        )
         return build_product(response)
 
     def update(self, product_id: str, **kwargs) -> Product:
@@ -142,28 +192,11 @@ class ProductsClient(BaseClient):
         Returns:
             Product: Updated product object
         """
-        allowed_args = [
-            "description",
-            "product_key",
-            "price",
-            "tax_included",
-            "unit_key",
-            "sku",
-        ]
-        data = {k: v for k, v in kwargs.items() if k in allowed_args}
-
-        taxes = kwargs.get("taxes")
-        if taxes is not None:
-            data.update({"taxes": taxes})
-
-        taxability = kwargs.get("taxability")
-        if isinstance(taxability, Taxability):
-            taxability = taxability.value
-        if taxability:
-            data.update({"taxability": taxability})
+        data = _get_product_update_data(**kwargs)
 
         url = self._get_request_url([product_id])
-        response = self._execute_request("PUT", url, json_data=data).json()
+        response = self._decode_json(self._execute_request("PUT", url, json_data=data))
+        self._mirror_records([response])
         return build_product(response)
 
     def delete(self, product_id: str) -> Product:
@@ -176,5 +209,6 @@ class ProductsClient(BaseClient):
             Product: Deleted product object
         """
         url = self._get_request_url([product_id])
-        response = self._execute_request("DELETE", url).json()
+        response = self._decode_json(self._execute_request("DELETE", url))
+        self._mirror_delete(product_id)
         return build_product(response)
@@ -0,0 +1,154 @@
+"""Client side rate limiting"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+_shared_limiters = {}
+_shared_limiters_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Token bucket rate limiter. Safe to share between threads.
+
+    The bucket holds up to `burst` tokens and refills `rate` tokens per second. Each request
+    takes a token; when the bucket is empty the request waits until a token is available.
+
+    Args:
+        rate (float): Tokens added per second, that is the sustained requests per second
+        burst (int, optional): Maximum tokens in the bucket. Defaults to 1.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.rate}/s burst={self.burst}>"
+
+    def _take(self, tokens: float, updated_at: float, now: float) -> tuple:
+        """Refills the bucket and takes a token. The bucket may go into debt, the debt is the
+        time the caller must wait
+
+        Returns:
+            tuple: Remaining tokens and seconds to wait
+        """
+        elapsed = max(0.0, now - updated_at)
+        tokens = min(float(self.burst), tokens + elapsed * self.rate) - 1
+        delay = -tokens / self.rate if tokens < 0 else 0.0
+        return tokens, delay
+
+    def reserve(self) -> float:
+        """Takes a token from the bucket
+
+        Returns:
+            float: Seconds to wait before making the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, delay = self._take(self._tokens, self._updated_at, now)
+            self._updated_at = now
+            return delay
+
+    def acquire(self) -> None:
+        """Takes a token from the bucket, blocking until it is available"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket shared by several processes on the same host. The bucket state is kept in a
+    file and access is serialized with an exclusive file lock. Only available on POSIX systems,
+    elsewhere use a TokenBucket per process with a share of the rate.
+
+    Args:
+        path (str): Path of the state file
+        rate (float): Tokens added per second
+        burst (int, optional): Maximum tokens in the bucket. Defaults to 1.
+
+    Raises:
+        OSError: If the system doesn't support file locks, e.g. on Windows
+    """
+
+    def __init__(self, path: str, rate: float, burst: int = 1) -> None:
+        if fcntl is None:
+            raise OSError("FileTokenBucket requires a POSIX system with fcntl file locks")
+        super().__init__(rate, burst)
+        self.path = path
+
+    @classmethod
+    def for_key(
+        cls, api_key: str, rate: float, burst: int = 1, directory: str = None
+    ) -> "FileTokenBucket":
+        """Creates a bucket whose state file is derived from an API key, so every process
+        using the same key on this host shares the bucket
+
+        Args:
+            api_key (str): Facturapi secret key
+            rate (float): Tokens added per second
+            burst (int, optional): Maximum tokens in the bucket. Defaults to 1.
+            directory (str, optional): Directory of the state file. Defaults to the system
+                temporary directory.
+
+        Returns:
+            FileTokenBucket: Bucket for the API key
+        """
+        digest = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        directory = directory or tempfile.gettempdir()
+        return cls(os.path.join(directory, f"facturapi-{digest}.bucket"), rate, burst)
+
+    def reserve(self) -> float:
+        with self._lock, open(self.path, "a+", encoding="utf-8") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                file.seek(0)
+                try:
+                    state = json.loads(file.read())
+                    tokens, updated_at = state["tokens"], state["updated_at"]
+                except (ValueError, KeyError):
+                    tokens, updated_at = float(self.burst), time.time()
+
+                # Wall clock time, monotonic clocks are not comparable between processes
+                now = time.time()
+                tokens, delay = self._take(tokens, updated_at, now)
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps({"tokens": tokens, "updated_at": now}))
+                file.flush()
+                return delay
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def get_shared_rate_limiter(api_key: str, rate: float, burst: int = 1) -> TokenBucket:
+    """Returns the in-process token bucket of an API key, creating it on first use. All the
+    Facturapi instances of this process that use the same key should share it
+
+    Args:
+        api_key (str): Facturapi secret key
+        rate (float): Tokens added per second. Only used when the bucket is created
+        burst (int, optional): Maximum tokens in the bucket. Only used when the bucket is
+            created. Defaults to 1.
+
+    Returns:
+        TokenBucket: Bucket of the API key
+    """
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(api_key)
+        if limiter is None:
+            limiter = TokenBucket(rate, burst)
+            _shared_limiters[api_key] = limiter
+        return limiter
@@ -1,9 +1,10 @@
 """Receipts API endpoint"""
 from datetime import datetime
 from .http import BaseClient
+from .pagination import PaginatedClientMixin
 
 
-class ReceiptsClient(BaseClient):
+class ReceiptsClient(PaginatedClientMixin, BaseClient):
     """Receipts API client"""
 
     endpoint = "receipts"
@@ -19,7 +20,7 @@ class ReceiptsClient(BaseClient):
             dict: Created receipt object
         """
         url = self._get_request_url()
-        return self._execute_request("POST", url, json_data=data).json()
+        return self._decode_json(self._execute_request("POST", url, json_data=data))
 
     def all(
         self,
@@ -44,24 +45,12 @@ class ReceiptsClient(BaseClient):
         Returns:
             dict: List of receipts
         """
-        params = {}
-        if search:
-            params.update({"q": search})
-
-        if start_date:
-            params.update({"date[gt]": start_date.astimezone().isoformat()})
-
-        if end_date:
-            params.update({"date[lt]": end_date.astimezone().isoformat()})
-
-        if page:
-            params.update({"page": page})
-
-        if limit:
-            params.update({"limit": limit})
+        params = self._get_list_params(
+            search, start_date=start_date, end_date=end_date, page=page, limit=limit
+        )
 
         url = self._get_request_url()
-        return self._execute_request("GET", url, params).json()
+        return self._decode_json(self._execute_request("GET", url, params))
 
     def retrieve(self, receipt_id: str) -> dict:
         """Retrieves a single receipt object
@@ -73,7 +62,7 @@ class ReceiptsClient(BaseClient):
             dict: Receipt object
         """
         url = self._get_request_url([receipt_id])
-        return self._execute_request("GET", url).json()
+        return self._decode_json(self._execute_request("GET", url))
 
     def cancel(self, receipt_id: str) -> dict:
         """Cancels a receipt, changing its status property to "canceled".
@@ -86,7 +75,7 @@ class ReceiptsClient(BaseClient):
             dict: Cancelled receipt object
         """
         url = self._get_request_url([receipt_id])
-        return self._execute_request("DELETE", url).json()
+        return self._decode_json(self._execute_request("DELETE", url))
 
     def invoice(self, receipt_id: str, invoice_data: dict) -> dict:
         """Creates an invoice object from a receipt
@@ -112,4 +101,4 @@ class ReceiptsClient(BaseClient):
             dict: Created invoice object
         """
         url = self._get_request_url(["global-invoice"])
-        return self._execute_request("POST", url, json_data=data).json()
+        return self._decode_json(self._execute_request("POST", url, json_data=data))
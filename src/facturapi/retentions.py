@@ -1,9 +1,12 @@
 """Retentions API endpoint"""
 from datetime import datetime
+
+from .download import DownloadMixin
 from .http import BaseClient
+from .pagination import PaginatedClientMixin
 
 
-class RetentionsClient(BaseClient):
+class RetentionsClient(DownloadMixin, PaginatedClientMixin, BaseClient):
     """Retentions API client"""
 
     endpoint = "retentions"
@@ -18,7 +21,7 @@ class RetentionsClient(BaseClient):
             dict: Created retention object
         """
         url = self._get_request_url()
-        return self._execute_request("POST", url, json_data=data).json()
+        return self._decode_json(self._execute_request("POST", url, json_data=data))
 
     def all(
         self,
@@ -47,27 +50,12 @@ class RetentionsClient(BaseClient):
             dict: List of retentions
         """
 
-        params = {}
-        if search:
-            params.update({"q": search})
-
-        if customer_id:
-            params.update({"customer": customer_id})
-
-        if start_date:
-            params.update({"date[gt]": start_date.astimezone().isoformat()})
-
-        if end_date:
-            params.update({"date[lt]": end_date.astimezone().isoformat()})
-
-        if page:
-            params.update({"page": page})
-
-        if limit:
-            params.update({"limit": limit})
+        params = self._get_list_params(
+            search, customer_id, start_date, end_date, page, limit
+        )
 
         url = self._get_request_url()
-        return self._execute_request("GET", url, params).json()
+        return self._decode_json(self._execute_request("GET", url, params))
 
     def retrieve(self, retention_id: str) -> dict:
         """Retrieves a single retention object
@@ -79,7 +67,7 @@ class RetentionsClient(BaseClient):
             dict: Retention object
         """
         url = self._get_request_url([retention_id])
-        return self._execute_request("GET", url).json()
+        return self._decode_json(self._execute_request("GET", url))
 
     def cancel(self, retention_id: str) -> dict:
         """Cancels a retention.
@@ -91,7 +79,7 @@ class RetentionsClient(BaseClient):
             dict: Cancelled retention object
         """
         url = self._get_request_url([retention_id])
-        return self._execute_request("DELETE", url).json()
+        return self._decode_json(self._execute_request("DELETE", url))
 
     def download_pdf(self, retention_id: str) -> bytes:
         """Download retention PDF file
@@ -144,4 +132,4 @@ class RetentionsClient(BaseClient):
         """
         url = self._get_request_url([retention_id, "email"])
         data = {"email": email} if email else {}
-        return self._execute_request("POST", url, json_data=data).json()
+        return self._decode_json(self._execute_request("POST", url, json_data=data))
@@ -0,0 +1,229 @@
+"""Retry policy for failed requests"""
+import random
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, NamedTuple, Optional
+
+
+class RetryEvent(NamedTuple):
+    """Information about a request that is going to be retried"""
+
+    method: str
+    url: str
+    attempt: int
+    delay: float
+    status_code: int = None
+    error: Exception = None
+
+
+class RetryStats:
+    """Thread-safe retry counters"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.exhausted = 0
+        self.by_status = Counter()
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}: retries={self.retries} exhausted={self.exhausted}>"
+        )
+
+    def record_retry(self, event: RetryEvent) -> None:
+        """Counts a retry
+
+        Args:
+            event (RetryEvent): Retry information
+        """
+        with self._lock:
+            self.retries += 1
+            self.by_status[event.status_code or "error"] += 1
+
+    def record_exhausted(self) -> None:
+        """Counts a request that failed after using all its retries"""
+        with self._lock:
+            self.exhausted += 1
+
+
+class RetryPolicy:  # pylint: disable=too-many-instance-attributes
+    """Decides which failed requests are retried and how long to wait before retrying.
+    The delay grows exponentially with each attempt and uses full jitter. Requests with non
+    idempotent methods (POST) are only retried when the API rejected them with a 429 status,
+    because the API did not process them, unless retry_idempotent_posts is enabled and the
+    request carries an idempotency key.
+
+    Args:
+        max_retries (int, optional): Maximum retries per request. Defaults to 3.
+        backoff_factor (float, optional): Base delay in seconds. The delay of the n-th retry is
+            `backoff_factor * 2 ** n`. Defaults to 0.5.
+        max_backoff (float, optional): Maximum delay in seconds. Requests whose Retry-After
+            header asks for a longer wait are not retried. Defaults to 30.
+        jitter (bool, optional): Randomize the delays. Defaults to True.
+        retry_status_codes (Iterable[int], optional): Response statuses that are retried.
+            Defaults to RETRY_STATUS_CODES.
+        retry_methods (Iterable[str], optional): Methods retried on errors. Defaults to
+            IDEMPOTENT_METHODS.
+        respect_retry_after (bool, optional): Wait the time sent by the API in the Retry-After
+            header, as sent. Defaults to True.
+        on_retry (Iterable[Callable[[RetryEvent], None]], optional): Functions called before
+            each retry. Defaults to None.
+        retry_idempotent_posts (bool, optional): Retry POST requests sent with an idempotency
+            key like idempotent methods. Only enable it if the API deduplicates requests by
+            their Idempotency-Key header. Defaults to False.
+    """
+
+    STATUS_TOO_MANY_REQUESTS = 429
+    IDEMPOTENT_METHODS = frozenset({"GET", "PUT", "DELETE"})
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        jitter: bool = True,
+        retry_status_codes: Iterable[int] = RETRY_STATUS_CODES,
+        retry_methods: Iterable[str] = IDEMPOTENT_METHODS,
+        respect_retry_after: bool = True,
+        on_retry: Iterable[Callable[[RetryEvent], None]] = None,
+        retry_idempotent_posts: bool = False,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_status_codes = frozenset(retry_status_codes)
+        self.retry_methods = frozenset(m.upper() for m in retry_methods)
+        self.respect_retry_after = respect_retry_after
+        self.hooks = list(on_retry) if on_retry else []
+        self.retry_idempotent_posts = retry_idempotent_posts
+        self.stats = RetryStats()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: max_retries={self.max_retries}>"
+
+    def add_hook(self, hook: Callable[[RetryEvent], None]) -> None:
+        """Registers a function to be called before each retry
+
+        Args:
+            hook (Callable[[RetryEvent], None]): Function that receives the retry information
+        """
+        self.hooks.append(hook)
+
+    def is_retryable(
+        self,
+        method: str,
+        status_code: int = None,
+        error: Exception = None,
+        idempotency_key: str = None,
+    ) -> bool:
+        """Checks if a failed request can be retried, regardless of the attempts made
+
+        Args:
+            method (str): HTTP method
+            status_code (int, optional): Response status. Defaults to None.
+            error (Exception, optional): Error raised sending the request. Defaults to None.
+            idempotency_key (str, optional): Idempotency key sent. Defaults to None.
+
+        Returns:
+            bool: True if the request can be retried
+        """
+        if status_code == self.STATUS_TOO_MANY_REQUESTS:
+            return status_code in self.retry_status_codes
+        idempotent = idempotency_key is not None and self.retry_idempotent_posts
+        if method.upper() not in self.retry_methods and not idempotent:
+            return False
+        if error is not None:
+            return True
+        return status_code in self.retry_status_codes
+
+    def get_backoff(self, attempt: int, retry_after: float = None) -> float:
+        """Returns the seconds to wait before a retry
+
+        Args:
+            attempt (int): Number of retries already made
+            retry_after (float, optional): Seconds requested by the API, which are waited as
+                sent. Defaults to None.
+
+        Returns:
+            float: Seconds to wait
+        """
+        if retry_after is not None and self.respect_retry_after:
+            return retry_after
+
+        delay = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def get_retry_delay(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        url: str,
+        attempt: int,
+        response=None,
+        error: Exception = None,
+        idempotency_key: str = None,
+    ) -> Optional[float]:
+        """Decides if a request must be retried. If so, the retry hooks are called and the
+        retry is recorded in the stats. Requests whose Retry-After header asks for a wait longer
+        than max_backoff are not retried, since an earlier retry would be rejected again
+
+        Args:
+            method (str): HTTP method
+            url (str): URL of the request
+            attempt (int): Number of retries already made
+            response (Response, optional): Response received. Defaults to None.
+            error (Exception, optional): Error raised sending the request. Defaults to None.
+            idempotency_key (str, optional): Idempotency key sent. Defaults to None.
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying, or None if the request must not be
+            retried
+        """
+        status_code = response.status_code if response is not None else None
+        if status_code is not None and status_code not in self.retry_status_codes:
+            return None
+        if not self.is_retryable(method, status_code, error, idempotency_key):
+            return None
+        if attempt >= self.max_retries:
+            self.stats.record_exhausted()
+            return None
+
+        retry_after = None
+        if response is not None and self.respect_retry_after:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None and retry_after > self.max_backoff:
+                return None
+
+        delay = self.get_backoff(attempt, retry_after)
+        event = RetryEvent(method, url, attempt + 1, delay, status_code, error)
+        self.stats.record_retry(event)
+        for hook in self.hooks:
+            hook(event)
+        return delay
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Parses the value of a Retry-After header
+
+    Args:
+        value (str): Seconds or HTTP date
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
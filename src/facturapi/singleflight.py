@@ -0,0 +1,80 @@
+"""Coalescing of concurrent identical requests"""
+import threading
+from typing import Any, Callable, Dict
+
+
+class _Call:  # pylint: disable=too-few-public-methods
+    """Request in flight and the result shared with its waiters"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs a single call at a time for each key. Threads that ask for a key already in flight
+    wait for that call and receive its result or exception instead of making their own.
+    Safe to share between threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.coalesced = 0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {len(self)} in flight>"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: str, function: Callable[[], Any]) -> Any:
+        """Calls a function, or waits for the call of the same key that is in flight
+
+        Args:
+            key (str): Key of the call, e.g. the cache key of a GET request
+            function (Callable[[], Any]): Function to call
+
+        Returns:
+            Any: Result of the function
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def forget_prefix(self, prefix: str) -> None:
+        """Stops sharing the calls in flight whose key starts with a prefix, so the next callers
+        make a new call. Used after a write, so reads never receive a response older than it
+
+        Args:
+            prefix (str): Key prefix
+        """
+        with self._lock:
+            for key in [k for k in self._calls if k.startswith(prefix)]:
+                del self._calls[key]
@@ -0,0 +1,514 @@
+"""In-memory fake of the Facturapi API for offline tests, benchmarks and load tests.
+
+FakeFacturapi keeps customers, products, invoices, receipts and retentions in memory and answers
+the requests of the clients like the API does, with configurable latency, error rate and page
+size. Plug it into the clients with FakeTransport, or aio.testing.AsyncFakeTransport for the
+async clients:
+
+    server = FakeFacturapi(latency=0.05, error_rate=0.01, seed=1)
+    server.populate(customers=100, products=20, invoices=1000)
+    api = Facturapi("sk_test_fake", transport=FakeTransport(server))
+"""
+import io
+import json
+import math
+import random
+import threading
+import time
+import zipfile
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, NamedTuple, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+from requests import Response
+from requests.exceptions import ReadTimeout
+from requests.structures import CaseInsensitiveDict
+
+from .idempotency import IDEMPOTENCY_HEADER
+from .models import parse_date
+from .pagination import MAX_PAGE_SIZE
+from .transport import BaseTransport
+
+RESOURCES = ("customers", "products", "invoices", "receipts", "retentions")
+# Resources whose documents can be downloaded as PDF, XML or a ZIP with both
+DOWNLOADABLE_RESOURCES = ("invoices", "retentions")
+# Fields matched by the `q` parameter of the list endpoints
+SEARCH_FIELDS = {
+    "customers": ("legal_name", "tax_id", "email"),
+    "products": ("description", "sku", "product_key"),
+}
+CONTENT_TYPES = {
+    "json": "application/json",
+    "pdf": "application/pdf",
+    "xml": "application/xml",
+    "zip": "application/zip",
+}
+
+DEFAULT_TAXES = [{"rate": 0.16, "type": "IVA", "factor": "Tasa", "withholding": False}]
+
+
+class FakeResponse(NamedTuple):
+    """Response of the fake server, converted by the transports to their response class"""
+
+    status_code: int
+    content: bytes
+    headers: Dict[str, str]
+
+
+def _format_date(date: datetime) -> str:
+    return date.astimezone(timezone.utc).isoformat(timespec="milliseconds")[:-6] + "Z"
+
+
+class FakeFacturapi:  # pylint: disable=too-many-instance-attributes
+    """In-memory fake of the Facturapi API. Safe to share between threads and transports.
+
+    Args:
+        latency (Union[float, Tuple[float, float]], optional): Seconds every request takes, or
+            the range of a uniformly distributed latency. Defaults to 0.
+        error_rate (float, optional): Fraction of the requests answered with error_status.
+            Defaults to 0.
+        error_status (int, optional): Status of the injected errors. Defaults to 500.
+        max_page_size (int, optional): Maximum results per page of the list endpoints.
+            Defaults to MAX_PAGE_SIZE.
+        download_size (int, optional): Size in bytes of the PDF and XML files.
+            Defaults to 32 KiB.
+        api_key (str, optional): Only accept requests with this key. Defaults to None, any key.
+        seed (int, optional): Seed of the latency, errors and generated data. Defaults to None.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        latency: Union[float, Tuple[float, float]] = 0,
+        error_rate: float = 0,
+        error_status: int = 500,
+        max_page_size: int = MAX_PAGE_SIZE,
+        download_size: int = 32 * 1024,
+        api_key: str = None,
+        seed: int = None,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_page_size = max_page_size
+        self.download_size = download_size
+        self.api_key = api_key
+
+        self.records: Dict[str, Dict[str, dict]] = {r: {} for r in RESOURCES}
+        self.request_counts = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._folio = 0
+        self._idempotent_responses: Dict[str, FakeResponse] = {}
+
+    def __repr__(self) -> str:
+        counts = {resource: len(r) for resource, r in self.records.items() if r}
+        return f"<{self.__class__.__name__}: {counts}>"
+
+    def _new_id(self) -> str:
+        return f"{self._random.getrandbits(96):024x}"
+
+    def _new_uuid(self) -> str:
+        value = f"{self._random.getrandbits(128):032X}"
+        return f"{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}"
+
+    def begin_request(self) -> float:
+        """Counts a request in flight. Called by the transports before waiting the latency
+
+        Returns:
+            float: Seconds the request must take
+        """
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            if isinstance(self.latency, (tuple, list)):
+                return self._random.uniform(*self.latency)
+            return self.latency
+
+    def end_request(self) -> None:
+        """Counts a finished request. Called by the transports"""
+        with self._lock:
+            self.in_flight -= 1
+
+    def reset_stats(self) -> None:
+        """Clears the request counters"""
+        with self._lock:
+            self.request_counts.clear()
+            self.max_in_flight = self.in_flight
+
+    def _build_customer(self, data: dict, created_at: datetime) -> dict:
+        address = {"country": "MEX", **(data.get("address") or {})}
+        return {
+            "id": self._new_id(),
+            "created_at": _format_date(created_at),
+            "livemode": False,
+            "legal_name": data.get("legal_name"),
+            "tax_id": data.get("tax_id"),
+            "tax_system": data.get("tax_system"),
+            "email": data.get("email"),
+            "phone": data.get("phone"),
+            "address": address,
+        }
+
+    def _build_product(self, data: dict, created_at: datetime) -> dict:
+        return {
+            "id": self._new_id(),
+            "created_at": _format_date(created_at),
+            "livemode": False,
+            "description": data.get("description"),
+            "product_key": data.get("product_key"),
+            "price": data.get("price"),
+            "tax_included": data.get("tax_included", True),
+            "taxes": data.get("taxes", DEFAULT_TAXES),
+            "local_taxes": data.get("local_taxes", []),
+            "unit_key": data.get("unit_key", "H87"),
+            "unit_name": data.get("unit_name", "Pieza"),
+            "sku": data.get("sku"),
+            "taxability": data.get("taxability", "02"),
+        }
+
+    def _resolve(self, resource: str, value: Any) -> Any:
+        """Replaces the id of a customer or product by its record, like the API does"""
+        if isinstance(value, str):
+            return self.records[resource].get(value, {"id": value})
+        return value
+
+    def _build_items(self, data: dict) -> list:
+        return [
+            {
+                "quantity": item.get("quantity", 1),
+                "discount": item.get("discount", 0),
+                "product": self._resolve("products", item.get("product")) or {},
+            }
+            for item in data.get("items", [])
+        ]
+
+    def _build_document(self, resource: str, data: dict, created_at: datetime) -> dict:
+        items = self._build_items(data)
+        total = sum(
+            item["quantity"] * (item["product"].get("price") or 0) - item["discount"]
+            for item in items
+        )
+        self._folio += 1
+        document = {
+            "id": self._new_id(),
+            "created_at": _format_date(created_at),
+            "livemode": False,
+            "date": _format_date(created_at),
+            "folio_number": self._folio,
+            "total": round(total, 2),
+            "currency": data.get("currency", "MXN"),
+            "exchange": data.get("exchange", 1),
+            "payment_form": data.get("payment_form", "03"),
+            "items": items,
+        }
+        if resource == "receipts":
+            document.update(status="open", key=self._new_id()[:10], invoice=None)
+            return document
+
+        document.update(
+            status="valid",
+            cancellation_status="none",
+            customer=self._resolve("customers", data.get("customer")),
+            uuid=self._new_uuid(),
+        )
+        if resource == "invoices":
+            document.update(
+                type=data.get("type", "I"),
+                payment_method=data.get("payment_method", "PUE"),
+                use=data.get("use", "G03"),
+                series=data.get("series", "F"),
+            )
+        return document
+
+    def add(self, resource: str, data: dict, created_at: datetime = None) -> dict:
+        """Creates a record as the API would, without a request
+
+        Args:
+            resource (str): One of RESOURCES
+            data (dict): Request body
+            created_at (datetime, optional): Creation date. Defaults to now.
+
+        Returns:
+            dict: Record created
+        """
+        created_at = created_at or datetime.now(timezone.utc)
+        if resource == "customers":
+            record = self._build_customer(data, created_at)
+        elif resource == "products":
+            record = self._build_product(data, created_at)
+        else:
+            record = self._build_document(resource, data, created_at)
+        self.records[resource][record["id"]] = record
+        return record
+
+    def populate(  # pylint: disable=too-many-arguments
+        self,
+        customers: int = 0,
+        products: int = 0,
+        invoices: int = 0,
+        receipts: int = 0,
+        retentions: int = 0,
+        days: int = 365,
+    ) -> None:
+        """Generates records with creation dates evenly spread over the last days. Documents
+        belong to random customers and products
+
+        Args:
+            customers (int, optional): Customers to create. Defaults to 0.
+            products (int, optional): Products to create. Defaults to 0.
+            invoices (int, optional): Invoices to create. Defaults to 0.
+            receipts (int, optional): Receipts to create. Defaults to 0.
+            retentions (int, optional): Retentions to create. Defaults to 0.
+            days (int, optional): Days covered by the creation dates. Defaults to 365.
+        """
+        now = datetime.now(timezone.utc)
+        start = now - timedelta(days=days)
+
+        def get_dates(count: int):
+            step = (now - start) / max(count, 1)
+            return [start + step * number for number in range(count)]
+
+        with self._lock:
+            for number, date in enumerate(get_dates(customers)):
+                data = {
+                    "legal_name": f"CUSTOMER {number:06d} SA DE CV",
+                    "tax_id": f"CUS{number:06d}AB{number % 10}",
+                    "tax_system": "601",
+                    "email": f"customer{number}@example.com",
+                    "address": {"zip": f"{number % 100000:05d}"},
+                }
+                self.add("customers", data, date)
+            for number, date in enumerate(get_dates(products)):
+                data = {
+                    "description": f"Product {number:06d}",
+                    "product_key": "43232408",
+                    "price": round(self._random.uniform(10, 5000), 2),
+                    "sku": f"SKU-{number:06d}",
+                }
+                self.add("products", data, date)
+
+            customer_ids = list(self.records["customers"]) or [None]
+            product_ids = list(self.records["products"]) or [None]
+            documents = (
+                ("invoices", invoices),
+                ("receipts", receipts),
+                ("retentions", retentions),
+            )
+            for resource, count in documents:
+                for date in get_dates(count):
+                    items = [
+                        {
+                            "quantity": self._random.randint(1, 5),
+                            "product": self._random.choice(product_ids),
+                        }
+                        for _ in range(self._random.randint(1, 4))
+                    ]
+                    customer_id = self._random.choice(customer_ids)
+                    self.add(resource, {"customer": customer_id, "items": items}, date)
+
+    def _json(self, body: Any, status_code: int = 200) -> FakeResponse:
+        headers = {"Content-Type": CONTENT_TYPES["json"]}
+        return FakeResponse(status_code, json.dumps(body).encode(), headers)
+
+    def _error(self, status_code: int, message: str) -> FakeResponse:
+        return self._json({"message": message}, status_code)
+
+    def _matches(self, resource: str, record: dict, params: dict) -> bool:
+        search = params.get("q")
+        if search:
+            customer = record.get("customer") or {}
+            fields = SEARCH_FIELDS.get(resource, ("id", "uuid"))
+            values = [record.get(field) for field in fields]
+            values += [customer.get("legal_name"), customer.get("tax_id")]
+            text = " ".join(str(value) for value in values if value)
+            if search.lower() not in text.lower():
+                return False
+        customer_id = params.get("customer")
+        if customer_id and (record.get("customer") or {}).get("id") != customer_id:
+            return False
+        if params.get("date[gt]") or params.get("date[lt]"):
+            created_at = parse_date(record["created_at"])
+            if params.get("date[gt]") and created_at <= parse_date(params["date[gt]"]):
+                return False
+            if params.get("date[lt]") and created_at >= parse_date(params["date[lt]"]):
+                return False
+        return True
+
+    def _list(self, resource: str, params: dict) -> FakeResponse:
+        records = [
+            record
+            for record in self.records[resource].values()
+            if self._matches(resource, record, params)
+        ]
+        records.sort(key=lambda r: r["created_at"], reverse=True)
+        limit = min(int(params.get("limit") or self.max_page_size), self.max_page_size)
+        page = int(params.get("page") or 1)
+        return self._json(
+            {
+                "page": page,
+                "total_pages": max(1, math.ceil(len(records) / limit)),
+                "total_results": len(records),
+                "data": records[(page - 1) * limit : page * limit],
+            }
+        )
+
+    def _download(self, resource: str, record: dict, file_format: str) -> FakeResponse:
+        """Generates the files of a document, padded to download_size"""
+        uuid = record.get("uuid") or record["id"]
+        pdf = f"%PDF-1.4\n% {resource} {uuid}\n".encode()
+        pdf = pdf.ljust(self.download_size, b"0")
+        xml = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<cfdi:Comprobante Folio="{record.get("folio_number")}" '
+            f'Total="{record.get("total")}" UUID="{uuid}"><!--'
+        ).encode()
+        closing = b"--></cfdi:Comprobante>"
+        xml = xml.ljust(self.download_size - len(closing), b" ") + closing
+        if file_format == "pdf":
+            content = pdf
+        elif file_format == "xml":
+            content = xml
+        else:
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr(f"{uuid}.pdf", pdf)
+                archive.writestr(f"{uuid}.xml", xml)
+            content = buffer.getvalue()
+        return FakeResponse(200, content, {"Content-Type": CONTENT_TYPES[file_format]})
+
+    def _route(  # pylint: disable=too-many-return-statements
+        self, method: str, path: list, params: dict, data: dict
+    ) -> FakeResponse:
+        resource = path[0] if path else ""
+        if resource == "check":
+            return self._json({"ok": True})
+        if resource == "tools":
+            return self._json({"efos": {"is_valid": True, "data": []}})
+        if resource not in RESOURCES:
+            return self._error(404, f"Resource {resource} not found")
+
+        records = self.records[resource]
+        if len(path) == 1:
+            if method == "GET":
+                return self._list(resource, params)
+            if method == "POST":
+                return self._json(self.add(resource, data))
+            return self._error(405, "Method not allowed")
+
+        record = records.get(path[1])
+        if record is None:
+            return self._error(404, f"No {resource[:-1]} was found with this id")
+
+        action = path[2] if len(path) > 2 else None
+        if action is None and method == "GET":
+            return self._json(record)
+        if action is None and method == "PUT":
+            address = {**record.get("address", {}), **data.pop("address", {})}
+            record.update(data)
+            if resource == "customers":
+                record["address"] = address
+            return self._json(record)
+        if action is None and method == "DELETE":
+            if resource in ("customers", "products"):
+                return self._json(records.pop(path[1]))
+            record["status"] = "canceled"
+            record["cancellation_status"] = "accepted"
+            return self._json(record)
+        if action == "email" and method == "POST":
+            return self._json({"ok": True})
+        if action in ("pdf", "xml", "zip") and resource in DOWNLOADABLE_RESOURCES:
+            return self._download(resource, record, action)
+        return self._error(404, "Not found")
+
+    def handle(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        url: str,
+        params: dict = None,
+        body: Union[bytes, str] = None,
+        headers: dict = None,
+        auth: tuple = None,
+    ) -> FakeResponse:
+        """Answers a request like the API. Latency is left to the transports
+
+        Args:
+            method (str): HTTP method
+            url (str): URL for the request, e.g. "https://www.facturapi.io/v2/customers/"
+            params (dict, optional): Query parameters. Defaults to None.
+            body (Union[bytes, str], optional): JSON request body. Defaults to None.
+            headers (dict, optional): Request headers. Defaults to None.
+            auth (tuple, optional): Basic auth credentials, the API key and an empty password.
+                Defaults to None.
+
+        Returns:
+            FakeResponse: Response
+        """
+        url_parts = urlsplit(url)
+        path = [part for part in url_parts.path.split("/") if part][1:]
+        params = {**dict(parse_qsl(url_parts.query)), **(params or {})}
+        data = json.loads(body) if body else {}
+        idempotency_key = (headers or {}).get(IDEMPOTENCY_HEADER)
+
+        with self._lock:
+            self.request_counts[f"{method} {path[0] if path else ''}"] += 1
+            if self.api_key is not None and (not auth or auth[0] != self.api_key):
+                return self._error(401, "Wrong API key")
+            if self.error_rate and self._random.random() < self.error_rate:
+                return self._error(self.error_status, "Injected error")
+            if idempotency_key in self._idempotent_responses:
+                return self._idempotent_responses[idempotency_key]
+
+            response = self._route(method.upper(), path, params, data)
+            if idempotency_key:
+                self._idempotent_responses[idempotency_key] = response
+            return response
+
+
+class FakeTransport(BaseTransport):
+    """Transport that sends the requests of the clients to a FakeFacturapi instead of the
+    network. Latency is simulated with time.sleep, so concurrent requests overlap like real ones.
+    Requests slower than their read timeout raise ReadTimeout
+
+    Args:
+        server (FakeFacturapi, optional): Fake server. Defaults to a new empty one.
+    """
+
+    def __init__(self, server: FakeFacturapi = None) -> None:
+        self.server = server if server is not None else FakeFacturapi()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.server}>"
+
+    def request(self, method: str, url: str, **kwargs) -> Response:
+        latency = self.server.begin_request()
+        try:
+            read_timeout = kwargs["timeout"][1] if kwargs.get("timeout") else None
+            if read_timeout is not None and latency > read_timeout:
+                time.sleep(read_timeout)
+                raise ReadTimeout(f"Read timed out. (read timeout={read_timeout})")
+            if latency > 0:
+                time.sleep(latency)
+            fake_response = self.server.handle(
+                method,
+                url,
+                params=kwargs.get("params"),
+                body=kwargs.get("data"),
+                headers=kwargs.get("headers"),
+                auth=kwargs.get("auth"),
+            )
+        finally:
+            self.server.end_request()
+
+        response = Response()
+        response.elapsed = timedelta(seconds=latency)
+        response.status_code = fake_response.status_code
+        response.headers = CaseInsensitiveDict(fake_response.headers)
+        response.url = url
+        response.encoding = "utf-8"
+        response._content = fake_response.content  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        return response
@@ -0,0 +1,105 @@
+"""Request timeouts and deadlines shared by every request of a call, retries and pages included"""
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Iterator, NamedTuple, Union
+
+
+class Timeout(NamedTuple):
+    """Seconds to wait for a connection and between bytes of the response"""
+
+    connect: float
+    read: float
+
+
+# Timeout of the requests without a more specific one
+DEFAULT_TIMEOUT = Timeout(connect=5, read=30)
+# Timeouts by "METHOD endpoint", endpoint, or "download" for the file downloads, which take
+# longer than retrieves. Creating documents waits for the SAT stamp
+DEFAULT_TIMEOUTS = {
+    "download": Timeout(connect=5, read=120),
+    "POST invoices": Timeout(connect=5, read=90),
+    "POST receipts": Timeout(connect=5, read=90),
+    "POST retentions": Timeout(connect=5, read=90),
+}
+
+_deadline = ContextVar("facturapi_deadline", default=None)
+
+
+def to_timeout(value: Union[float, tuple, Timeout]) -> Timeout:
+    """Converts a number of seconds or a (connect, read) tuple to a Timeout
+
+    Args:
+        value (Union[float, tuple, Timeout]): Seconds for both timeouts, or a (connect, read)
+            tuple
+
+    Returns:
+        Timeout: Timeout
+    """
+    if isinstance(value, tuple):
+        return Timeout(*value)
+    return Timeout(value, value)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Bounds in wall clock time every request sent inside the block, e.g. a whole `iter_all`
+    scan or bulk job. Requests, retries and pages fail with DeadlineExceeded once it passes, and
+    their timeouts are shortened to the time left. Nested deadlines keep the earliest one.
+
+    The deadline follows the context: asyncio tasks and the pages fetched by background threads
+    inherit it.
+
+    Args:
+        seconds (float): Seconds from now
+
+    Example:
+        >>> with deadline(30):
+        ...     invoices = list(api.invoices.iter_all(max_workers=4))
+    """
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_deadline() -> float:
+    """Returns the deadline of the current context
+
+    Returns:
+        float: time.monotonic() value of the deadline, or None without a deadline
+    """
+    return _deadline.get()
+
+
+def get_remaining_time() -> float:
+    """Returns the seconds left before the deadline of the current context
+
+    Returns:
+        float: Seconds, negative if the deadline passed, or None without a deadline
+    """
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def submit_in_context(executor: Executor, function: Callable, *args: Any) -> Future:
+    """Submits a call to an executor in a copy of the current context, so the call shares the
+    caller's deadline
+
+    Args:
+        executor (Executor): Executor
+        function (Callable): Function to call
+        *args (Any): Arguments of the function
+
+    Returns:
+        Future: Future of the call
+    """
+    return executor.submit(copy_context().run, function, *args)
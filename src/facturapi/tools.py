@@ -1,20 +1,52 @@
 """Various utility endpoints"""
+from .exceptions import DeadlineExceeded, FacturapiException
+from .health import CircuitBreaker
 from .http import BaseClient
+from .ratelimit import TokenBucket
+from .retry import RetryPolicy
 
 
 class HealthCheck(BaseClient):
-    """Healthcheck service"""
+    """Healthcheck service. It ignores the circuit breaker, so checks can find out that the API
+    recovered while the circuit is open, and the rate limiter and retry policy, so the probes
+    don't use up the request budget of the other clients
+    """
 
     endpoint = "check"
 
+    def __init__(  # pylint: disable=unused-argument,too-many-arguments
+        self,
+        api_key: str,
+        circuit_breaker: CircuitBreaker = None,
+        rate_limiter: TokenBucket = None,
+        retry_policy: RetryPolicy = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(api_key, **kwargs)
+
     def check_status(self) -> bool:
         """Checks service status
 
         Returns:
-            bool: True if status is ok
+            bool: True if status is ok, False if the API is unreachable or answers with a 5xx
+
+        Raises:
+            FacturapiException: If the check is inconclusive, e.g. a 429 or 401 response or
+                an exceeded deadline
         """
         url = self._get_request_url()
-        return self._execute_request("GET", url).json()["ok"]
+        self.last_status = None
+        try:
+            response = self._execute_request("GET", url)
+        except DeadlineExceeded:
+            raise
+        except FacturapiException:
+            # Only errors sending the request and 5xx responses mean the API is down
+            status = self.last_status
+            if status is None or status >= self.STATUS_INTERNAL_SERVER_ERROR:
+                return False
+            raise
+        return self._decode_json(response)["ok"]
 
 
 class ToolsClient(BaseClient):
@@ -37,4 +69,5 @@ class ToolsClient(BaseClient):
             can consult the data property to see the raw values of the SAT query.
         """
         url = self._get_request_url()
-        return self._execute_request("GET", url, {"tax_id": tax_id}).json()["efos"]
+        response = self._execute_request("GET", url, {"tax_id": tax_id})
+        return self._decode_json(response)["efos"]
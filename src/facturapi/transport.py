@@ -0,0 +1,99 @@
+"""HTTP transport shared by the API clients"""
+from abc import ABC, abstractmethod
+
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+
+
+class BaseTransport(ABC):
+    """Sends the requests of the API clients. Implement it to use another HTTP library or to
+    answer the requests without network, e.g. testing.FakeTransport
+    """
+
+    closed = False
+
+    def __enter__(self) -> "BaseTransport":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @abstractmethod
+    def request(self, method: str, url: str, **kwargs) -> Response:
+        """Sends a HTTP request
+
+        Args:
+            method (str): HTTP method
+            url (str): URL for the request
+            **kwargs: params, data, headers, auth, stream and timeout, as accepted by
+                requests.Session.request
+
+        Returns:
+            Response: HTTP response
+        """
+
+    def close(self) -> None:
+        """Releases the resources of the transport"""
+        self.closed = True
+
+
+class HTTPTransport(BaseTransport):
+    """Connection pool shared by every API client of a Facturapi instance.
+    The transport does not hold credentials, so it can also be shared between several API keys.
+
+    Args:
+        pool_connections (int, optional): Number of host pools to keep. Defaults to 10.
+        pool_maxsize (int, optional): Maximum number of connections kept per host.
+            Defaults to 10.
+        pool_block (bool, optional): If True, wait for a free connection instead of opening
+            connections over pool_maxsize. Defaults to False.
+        keep_alive (bool, optional): Reuse connections between requests. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+    ) -> None:
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.closed = False
+
+        self.session = Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        if not keep_alive:
+            self.session.headers.update({"Connection": "close"})
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def __repr__(self) -> str:
+        status = "closed" if self.closed else "open"
+        return f"<{self.__class__.__name__}: {status}, pool_maxsize={self.pool_maxsize}>"
+
+    def request(self, method: str, url: str, **kwargs) -> Response:
+        """Sends a HTTP request through the connection pool
+
+        Args:
+            method (str): HTTP method
+            url (str): URL for the request
+            **kwargs: Keyword arguments accepted by requests.Session.request
+
+        Returns:
+            Response: HTTP response
+        """
+        return self.session.request(method, url, **kwargs)
+
+    def close(self) -> None:
+        """Closes all the pooled connections"""
+        self.session.close()
+        self.closed = True
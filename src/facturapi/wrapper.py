@@ -1,37 +1,193 @@
 """Facturapi API Client"""
+from typing import TYPE_CHECKING, Union
 
-from .catalogs import CatalogsClient
-from .customers import CustomersClient
-from .invoices import InvoicesClient
-from .organizations import OrganizationsClient
-from .products import ProductsClient
-from .receipts import ReceiptsClient
-from .retentions import RetentionsClient
-from .tools import HealthCheck, ToolsClient
+from .cache import BaseCache
+from .health import CircuitBreaker, HealthMonitor, HealthStatus
+from .idempotency import IdempotencyJournal
+from .lazy import LazyClient
+from .ratelimit import TokenBucket
+from .retry import RetryPolicy
+from .timeouts import DEFAULT_TIMEOUT, Timeout
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .catalog_index import CatalogIndex
+    from .codec import JSONCodec
+    from .instrumentation import Instrumentation
+    from .mirror import MirrorStore
+    from .transport import BaseTransport
 
 
 class Facturapi:  # pylint: disable=too-many-instance-attributes
-    """Facturapi wrapper"""
+    """Facturapi wrapper. All the API clients share a single connection pool and
+    are created on first access
+
+    Args:
+        facturapi_key (str): Facturapi secret key
+        transport (BaseTransport, optional): Transport to use. If None, a new one is created
+            and owned by this instance. Defaults to None.
+        retry_policy (RetryPolicy, optional): Policy to retry failed requests. If None,
+            requests are not retried. Defaults to None.
+        rate_limiter (TokenBucket, optional): Rate limiter shared by all the clients. Use
+            ratelimit.get_shared_rate_limiter or FileTokenBucket.for_key to share it with other
+            instances or processes that use the same key. Defaults to None.
+        idempotency_journal (IdempotencyJournal, optional): Journal of the idempotency keys of
+            the POST requests in flight. Defaults to None.
+        cache (BaseCache, optional): Cache for the responses of the read-mostly endpoints
+            (customers, products and organizations retrieve and catalog searches).
+            Defaults to None.
+        cache_ttls (dict, optional): TTL in seconds by client method, e.g.
+            `{"catalogs.search_products": 86400}`. A TTL of 0 disables the cache for that
+            method. Defaults to None.
+        catalog_index (CatalogIndex, optional): Local SAT catalogs index used by the catalogs
+            client before searching the API. Defaults to None.
+        json_codec (Union[str, JSONCodec], optional): Codec used to encode request bodies and
+            decode responses: "orjson", "ujson" or "json". Defaults to the fastest installed.
+        mirror (MirrorStore, optional): Local mirror of customers and products, used to answer
+            retrieve without network according to its policy. Defaults to None.
+        coalesce_requests (bool, optional): Share a single request between concurrent identical
+            GET requests. Defaults to True.
+        instrumentation (Instrumentation, optional): Hooks and metrics of every request sent by
+            the clients. Defaults to None.
+        circuit_breaker (CircuitBreaker, optional): Circuit breaker shared by the clients, which
+            fails requests fast with ServiceUnavailable while the API is down. Defaults to None.
+        health_check_interval (float, optional): Seconds between background health checks.
+            Their last status is cached in `health_monitor` and drives the circuit breaker.
+            If None, the API is not monitored. Defaults to None.
+        timeout (Union[float, tuple, Timeout], optional): Connect and read timeouts of the
+            requests, in seconds. Defaults to DEFAULT_TIMEOUT.
+        timeouts (dict, optional): Timeouts by "METHOD endpoint", endpoint, or "download" for
+            the file downloads, e.g. `{"POST invoices": Timeout(5, 120)}`. They are merged with
+            timeouts.DEFAULT_TIMEOUTS. Defaults to None.
+
+    Kwargs:
+        pool_connections (int, optional): Number of host pools to keep. Defaults to 10.
+        pool_maxsize (int, optional): Maximum number of connections kept per host.
+            Defaults to 10.
+        pool_block (bool, optional): Wait for a free connection instead of opening connections
+            over pool_maxsize. Defaults to False.
+        keep_alive (bool, optional): Reuse connections between requests. Defaults to True.
+    """
 
     BASE_URL = "https://www.facturapi.io/"
 
+    customers = LazyClient("customers", "CustomersClient", "mirror")
+    products = LazyClient("products", "ProductsClient", "mirror")
+    invoices = LazyClient("invoices", "InvoicesClient")
+    receipts = LazyClient("receipts", "ReceiptsClient")
+    retentions = LazyClient("retentions", "RetentionsClient")
+    withholdings = retentions
+    organizations = LazyClient("organizations", "OrganizationsClient")
+    healthcheck = LazyClient("tools", "HealthCheck")
+    tools = LazyClient("tools", "ToolsClient")
+    catalogs = LazyClient("catalogs", "CatalogsClient", "catalog_index")
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}: {self}>"
 
     def __str__(self) -> str:
-        healthcheck = self.healthcheck.check_status()
-        if not healthcheck:
+        status = self.health_status
+        if status is None:
+            return "Service status unknown"
+        if not status.ok:
             return "Service down!"
         return "Service is ok"
 
-    def __init__(self, facturapi_key: str) -> None:
-        self.customers = CustomersClient(facturapi_key)
-        self.products = ProductsClient(facturapi_key)
-        self.invoices = InvoicesClient(facturapi_key)
-        self.withholdings = RetentionsClient(facturapi_key)
-        self.receipts = ReceiptsClient(facturapi_key)
-        self.retentions = RetentionsClient(facturapi_key)
-        self.organizations = OrganizationsClient(facturapi_key)
-        self.healthcheck = HealthCheck(facturapi_key)
-        self.tools = ToolsClient(facturapi_key)
-        self.catalogs = CatalogsClient(facturapi_key)
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        facturapi_key: str,
+        transport: "BaseTransport" = None,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: TokenBucket = None,
+        idempotency_journal: IdempotencyJournal = None,
+        cache: BaseCache = None,
+        cache_ttls: dict = None,
+        catalog_index: "CatalogIndex" = None,
+        json_codec: Union[str, "JSONCodec"] = None,
+        mirror: "MirrorStore" = None,
+        coalesce_requests: bool = True,
+        instrumentation: "Instrumentation" = None,
+        circuit_breaker: CircuitBreaker = None,
+        health_check_interval: float = None,
+        timeout: Union[float, tuple, Timeout] = DEFAULT_TIMEOUT,
+        timeouts: dict = None,
+        **transport_kwargs,
+    ) -> None:
+        self._owns_transport = transport is None
+        if transport is None:
+            # Imported on first use, so a client with its own transport never loads it
+            from .transport import HTTPTransport  # pylint: disable=import-outside-toplevel
+
+            transport = HTTPTransport(**transport_kwargs)
+        self.transport = transport
+
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.idempotency_journal = idempotency_journal
+        self.cache = cache
+        self.mirror = mirror
+        self.catalog_index = catalog_index
+        self.instrumentation = instrumentation
+        self.circuit_breaker = circuit_breaker
+
+        options = {
+            "transport": self.transport,
+            "retry_policy": retry_policy,
+            "rate_limiter": rate_limiter,
+            "idempotency_journal": idempotency_journal,
+            "cache": cache,
+            "cache_ttls": cache_ttls,
+            "json_codec": json_codec,
+            "coalesce_requests": coalesce_requests,
+            "instrumentation": instrumentation,
+            "circuit_breaker": circuit_breaker,
+            "timeout": timeout,
+            "timeouts": timeouts,
+        }
+        self._facturapi_key = facturapi_key
+        self._client_options = options
+
+        self.health_monitor = None
+        if health_check_interval is not None:
+            self.health_monitor = HealthMonitor(
+                self.healthcheck.check_status, health_check_interval, circuit_breaker
+            )
+            self.health_monitor.start()
+
+    def _create_client(self, client_class: type, **kwargs):
+        """Creates an API client with the options of this instance. Used by LazyClient
+
+        Args:
+            client_class (type): Client class
+
+        Kwargs:
+            Options of the client, e.g. mirror
+
+        Returns:
+            Client instance
+        """
+        return client_class(self._facturapi_key, **self._client_options, **kwargs)
+
+    @property
+    def health_status(self) -> HealthStatus:
+        """Last status cached by the health monitor. Never sends a request
+
+        Returns:
+            HealthStatus: Status and the time it was checked, or None if the API is not
+                monitored or the first check didn't finish
+        """
+        return self.health_monitor.status if self.health_monitor else None
+
+    def __enter__(self) -> "Facturapi":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stops the health monitor and closes the connection pool shared by the API clients.
+        A transport passed by the caller is left open
+        """
+        if self.health_monitor is not None:
+            self.health_monitor.stop()
+        if self._owns_transport:
+            self.transport.close()
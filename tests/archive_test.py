@@ -0,0 +1,72 @@
+"""Document archiver tests"""
+import tarfile
+import zipfile
+
+import pytest
+
+from facturapi import DocumentArchiver, Facturapi
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+
+@pytest.fixture(name="invoices")
+def fixture_invoices():
+    """Invoices client of a fake API with 3 invoices"""
+    server = FakeFacturapi(seed=0, download_size=1024)
+    server.populate(customers=1, products=1, invoices=3)
+    api = Facturapi("sk_test_archive", transport=FakeTransport(server))
+    return api.invoices, sorted(server.records["invoices"])
+
+
+def get_names(path: str) -> list:
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            return sorted(archive.namelist())
+    with tarfile.open(path) as archive:
+        return sorted(archive.getnames())
+
+
+class TestDocumentArchiver:
+    """Document archiver tests group"""
+
+    @pytest.mark.parametrize("extension", ["zip", "tar"])
+    def test_resume(self, tmp_path, invoices, extension):
+        """Test that resuming a closed archive keeps the files of the previous runs"""
+        client, ids = invoices
+        path = str(tmp_path / f"invoices.{extension}")
+        with DocumentArchiver(client, path, file_formats=["xml"]) as archiver:
+            archiver.archive(ids[:2])
+
+        with DocumentArchiver(client, path, file_formats=["xml"]) as archiver:
+            stats = archiver.archive(ids)
+
+        # Check only the missing file was downloaded and the archive has all of them
+        assert stats.skipped == 2 and stats.files == 1
+        assert get_names(path) == [f"{object_id}.xml" for object_id in ids]
+
+    def test_interrupted_run(self, tmp_path, invoices):
+        """Test that an archive that was not closed is not resumed"""
+        client, ids = invoices
+        path = str(tmp_path / "invoices.zip")
+        with DocumentArchiver(client, path, file_formats=["xml"]) as archiver:
+            archiver.archive(ids[:1])
+
+        # Interrupted run: files are added but the archive is never closed
+        archiver = DocumentArchiver(client, path, file_formats=["xml"])
+        archiver.archive(ids[1:2])
+        archiver.writer._archive.fp.flush()  # pylint: disable=protected-access
+
+        # Check the next run refuses to append to the broken archive
+        with pytest.raises(ValueError, match="changed after it was closed"):
+            DocumentArchiver(client, path, file_formats=["xml"])
+
+    def test_compressed_tar(self, tmp_path, invoices):
+        """Test that compressed tar archives are not resumed"""
+        client, ids = invoices
+        path = str(tmp_path / "invoices.tar.gz")
+        with DocumentArchiver(client, path, file_formats=["xml"]) as archiver:
+            archiver.archive(ids[:1])
+
+        # Check the archive is left untouched
+        with pytest.raises(ValueError, match="compressed tar"):
+            DocumentArchiver(client, path, file_formats=["xml"])
+        assert get_names(path) == [f"{ids[0]}.xml"]
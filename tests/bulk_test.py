@@ -0,0 +1,171 @@
+"""Bulk operations tests"""
+import asyncio
+import time
+
+from requests.exceptions import ConnectionError as RequestConnectionError
+
+from facturapi import Facturapi, IdempotencyJournal
+from facturapi.aio import AsyncFacturapi
+from facturapi.aio.bulk import run_bulk as async_run_bulk
+from facturapi.aio.testing import AsyncFakeTransport
+from facturapi.bulk import run_bulk
+from facturapi.exceptions import FacturapiException
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+INVOICES = [{"customer": f"customer_{number}", "items": []} for number in range(6)]
+INVOICES[2] = INVOICES[4] = {"customer": None, "items": []}
+
+
+class ValidatingServer(FakeFacturapi):
+    """Fake server that rejects invoices without a customer"""
+
+    def _route(self, method, path, params, data):
+        if method == "POST" and path == ["invoices"] and not data.get("customer"):
+            return self._error(400, "customer is required")
+        return super()._route(method, path, params, data)
+
+
+class LostResponseTransport(FakeTransport):
+    """Transport that loses the response of the first request after the server handled it"""
+
+    lost = False
+
+    def request(self, method, url, **kwargs):
+        response = super().request(method, url, **kwargs)
+        if not self.lost:
+            self.lost = True
+            raise RequestConnectionError("Connection reset")
+        return response
+
+
+def check_payload(payload: int) -> int:
+    """Slow bulk function that fails for odd payloads"""
+    time.sleep(0.02 * (5 - payload))
+    if payload % 2:
+        raise FacturapiException(f"Invalid payload {payload}")
+    return payload * 10
+
+
+class TestRunBulk:
+    """run_bulk tests group"""
+
+    def test_partial_failures(self):
+        """Test that failed payloads don't stop the batch"""
+        results = sorted(run_bulk(check_payload, range(6)), key=lambda r: r.index)
+
+        # Check every payload got its result or its error
+        assert [result.ok for result in results] == [True, False] * 3
+        assert [result.result for result in results[::2]] == [0, 20, 40]
+        assert str(results[1].error) == "Invalid payload 1"
+        assert [result.payload for result in results] == list(range(6))
+
+    def test_ordered(self):
+        """Test that ordered results follow the payloads and unordered ones the completion"""
+        ordered = list(run_bulk(check_payload, range(6), max_workers=6, ordered=True))
+        unordered = list(run_bulk(check_payload, range(6), max_workers=6))
+
+        # Check the order of the indexes
+        assert [result.index for result in ordered] == list(range(6))
+        assert [result.index for result in unordered] == list(range(5, -1, -1))
+
+    def test_unexpected_error(self):
+        """Test that errors other than FacturapiException are captured too"""
+        results = list(run_bulk(lambda payload: 1 / payload, range(3), ordered=True))
+
+        # Check only the failed payload got the error
+        assert isinstance(results[0].error, ZeroDivisionError)
+        assert [result.result for result in results[1:]] == [1, 0.5]
+
+    def test_rate_limit(self):
+        """Test that the rate limit spaces the calls"""
+        started = time.monotonic()
+        results = list(run_bulk(lambda payload: payload, range(6), rate_limit=50))
+
+        # Check 5 calls waited for a token after the first one
+        assert len(results) == 6
+        assert time.monotonic() - started >= 0.09
+
+    def test_lazy(self):
+        """Test that payloads are consumed as the results are yielded"""
+        consumed = []
+
+        def payloads():
+            for number in range(100):
+                consumed.append(number)
+                yield number
+
+        results = run_bulk(lambda payload: payload, payloads(), max_workers=2)
+        next(results)
+        results.close()
+
+        # Check only the first window of payloads was taken
+        assert len(consumed) <= 5
+
+
+class TestCreateMany:
+    """create_many tests group"""
+
+    def test_partial_failures(self):
+        """Test that rejected invoices are returned as errors and the rest are created"""
+        server = ValidatingServer()
+        api = Facturapi("sk_test_bulk", transport=FakeTransport(server))
+        results = list(api.invoices.create_many(INVOICES, ordered=True))
+
+        # Check the results of each payload
+        assert [i for i, result in enumerate(results) if not result.ok] == [2, 4]
+        assert "customer is required" in str(results[2].error)
+        assert results[0].result["customer"] == {"id": "customer_0"}
+        assert len(server.records["invoices"]) == 4
+
+    def test_separate_batches(self):
+        """Test that identical payloads of separate batches don't share idempotency keys"""
+        server = FakeFacturapi()
+        journal = IdempotencyJournal()
+        api = Facturapi(
+            "sk_test_bulk",
+            transport=LostResponseTransport(server),
+            idempotency_journal=journal,
+        )
+        lost = list(api.invoices.create_many(INVOICES[:1]))
+        created = list(api.invoices.create_many(INVOICES[:1]))
+
+        # Check the second batch created its own invoice instead of getting the lost one
+        assert not lost[0].ok and created[0].ok
+        assert len(server.records["invoices"]) == 2
+        assert created[0].result["id"] == list(server.records["invoices"])[1]
+
+    def test_async(self):
+        """Test that the async client creates the invoices concurrently"""
+        server = ValidatingServer(latency=0.01)
+
+        async def main():
+            async with AsyncFacturapi(
+                "sk_test_bulk", transport=AsyncFakeTransport(server)
+            ) as api:
+                return [
+                    result
+                    async for result in api.invoices.create_many(
+                        INVOICES, max_concurrency=3
+                    )
+                ]
+
+        results = asyncio.run(main())
+
+        # Check the failures and the concurrency
+        assert sorted(r.index for r in results if not r.ok) == [2, 4]
+        assert len(server.records["invoices"]) == 4
+        assert 1 < server.max_in_flight <= 3
+
+    def test_async_run_bulk(self):
+        """Test that the async run_bulk captures the API errors"""
+
+        async def check(payload: int) -> int:
+            return check_payload(payload)
+
+        async def main():
+            return [result async for result in async_run_bulk(check, range(4))]
+
+        results = asyncio.run(main())
+
+        # Check the failed payloads
+        assert sorted(r.index for r in results if not r.ok) == [1, 3]
@@ -0,0 +1,57 @@
+"""Response cache tests"""
+import time
+
+import pytest
+
+from facturapi.cache import DiskCache, MemoryCache
+
+
+@pytest.fixture(params=["memory", "disk"])
+def cache(request, tmp_path):
+    """Cache backends to test"""
+    if request.param == "memory":
+        return MemoryCache(maxsize=2, default_ttl=60)
+    return DiskCache(str(tmp_path / "cache.sqlite"), maxsize=2, default_ttl=60)
+
+
+class TestCache:
+    """Cache tests group"""
+
+    def test_get_and_set(self, cache):
+        """Test a stored value is returned"""
+        cache.set("a", {"id": "a"})
+
+        # Check if the value is returned and a missing one is None
+        assert cache.get("a") == {"id": "a"}
+        assert cache.get("b") is None
+
+    def test_expiration(self, cache):
+        """Test expired values are not returned"""
+        cache.set("a", {"id": "a"}, ttl=0.01)
+        time.sleep(0.02)
+
+        # Check if the expired value is gone
+        assert cache.get("a") is None
+
+    def test_lru_eviction(self, cache):
+        """Test the least recently used value is evicted"""
+        cache.set("a", 1)
+        time.sleep(0.01)
+        cache.set("b", 2)
+        time.sleep(0.01)
+        cache.get("a")
+        time.sleep(0.01)
+        cache.set("c", 3)
+
+        # Check if "b" was evicted
+        assert [cache.get(k) for k in ["a", "b", "c"]] == [1, None, 3]
+
+    def test_invalidate_prefix(self, cache):
+        """Test invalidation by key prefix"""
+        cache.set("customers/1", 1)
+        cache.set("products/1", 2)
+        cache.invalidate_prefix("customers/")
+
+        # Check if only the customer was removed
+        assert cache.get("customers/1") is None
+        assert cache.get("products/1") == 2
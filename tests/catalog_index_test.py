@@ -0,0 +1,148 @@
+"""Offline catalog index tests"""
+import math
+import sqlite3
+
+import pytest
+
+from facturapi import CatalogIndex
+from facturapi.catalogs import CatalogsClient
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+PRODUCTS = [
+    {"key": "43231500", "description": "Software funcional específico de la empresa"},
+    {"key": "43232300", "description": "Software de consultas y gestion de datos"},
+    {"key": "81112100", "description": "Servicios de internet"},
+    {"key": "81111500", "description": "Ingeniería de software o hardware"},
+]
+
+
+class CatalogServer(FakeFacturapi):
+    """Fake server that searches the products catalog by description"""
+
+    def __init__(self, entries: list) -> None:
+        super().__init__()
+        self.entries = entries
+        self.searches = []
+
+    def handle(self, method, url, params=None, **kwargs):
+        self.searches.append(params["q"])
+        search = params["q"].lower()
+        page = int(params.get("page", 1))
+        limit = int(params.get("limit", 10))
+        results = [e for e in self.entries if search in e["description"].lower()]
+        return self._json(
+            {
+                "page": page,
+                "total_pages": math.ceil(len(results) / limit),
+                "total_results": len(results),
+                "data": results[(page - 1) * limit : page * limit],
+            }
+        )
+
+
+@pytest.fixture(name="index")
+def fixture_index(tmp_path):
+    """Empty catalog index"""
+    index = CatalogIndex(str(tmp_path / "catalogs.db"))
+    yield index
+    index.close()
+
+
+def get_client(server: CatalogServer, index: CatalogIndex) -> CatalogsClient:
+    """Catalogs client that sends its requests to the fake server"""
+    return CatalogsClient(
+        "sk_test_catalogs", transport=FakeTransport(server), catalog_index=index
+    )
+
+
+class TestCatalogIndex:
+    """Catalog index tests group"""
+
+    def test_partial_index(self, index):
+        """Test that a partial index doesn't answer searches with its own results"""
+        server = CatalogServer(PRODUCTS)
+        client = get_client(server, index)
+        client.search_products("consultas")
+
+        # Check a search with a local match still uses the API and its totals
+        result = client.search_products("software")
+        assert server.searches == ["consultas", "software"]
+        assert result["total_results"] == 3
+        assert [entry["key"] for entry in result["data"]] == [
+            "43231500",
+            "43232300",
+            "81111500",
+        ]
+
+        # Check a stored key is answered locally
+        result = client.search_products("43232300")
+        assert result["data"] == [PRODUCTS[1]]
+        assert len(server.searches) == 2
+
+    def test_complete_catalog(self, index, tmp_path):
+        """Test that a complete catalog answers every search locally"""
+        path = tmp_path / "products.csv"
+        lines = ["key,description"] + [f"{e['key']},{e['description']}" for e in PRODUCTS]
+        path.write_text("\n".join(lines), encoding="utf-8")
+        index.load_csv("products", str(path), complete=True)
+        server = CatalogServer(PRODUCTS)
+        client = get_client(server, index)
+
+        # Check results and misses come from the index, with key matches first
+        result = client.search_products("software")
+        assert result["total_results"] == 3
+        assert {entry["key"] for entry in result["data"]} == {
+            "43231500",
+            "43232300",
+            "81111500",
+        }
+        assert client.search_products("8111")["data"][0]["key"] == "81111500"
+        assert client.search_products("nada")["data"] == []
+        assert not server.searches
+        assert index.is_complete("products")
+        assert not index.is_complete("units")
+
+    def test_sync(self, index):
+        """Test that sync downloads the entries even when the index already has some"""
+        index.upsert("products", PRODUCTS[:1])
+        server = CatalogServer(PRODUCTS)
+        client = get_client(server, index)
+
+        # Check the API is searched and every result is stored
+        assert index.sync(client, "products", ["software"]) == 3
+        assert server.searches == ["software"]
+        assert index.get("products", "81111500") == PRODUCTS[3]
+
+    def test_wildcards(self, index):
+        """Test that LIKE wildcards in a search match only themselves"""
+        units = [
+            {"key": "E48", "description": "Unidad de servicio"},
+            {"key": "E_1", "description": "Unidad al 100%"},
+            {"key": "H87", "description": "Pieza"},
+        ]
+        index.upsert("units", units)
+
+        # Check "_" and "%" don't match every key
+        assert [e["key"] for e in index.search("units", "E_")["data"]] == ["E_1"]
+        assert index.search("units", "%")["total_results"] == 0
+
+    def test_existing_entries(self, tmp_path):
+        """Test that entries stored before the full-text index existed are searchable"""
+        path = str(tmp_path / "catalogs.db")
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute(
+                "CREATE TABLE entries (catalog TEXT, key TEXT, "
+                "description TEXT, PRIMARY KEY (catalog, key))"
+            )
+            connection.executemany(
+                "INSERT INTO entries VALUES ('products', ?, ?)",
+                [(e["key"], e["description"]) for e in PRODUCTS],
+            )
+        connection.close()
+        index = CatalogIndex(path)
+
+        # Check the old entries were indexed
+        if index.full_text:
+            assert index.search("products", "software")["total_results"] == 3
+        index.close()
@@ -0,0 +1,54 @@
+"""JSON codecs tests"""
+import json
+from datetime import datetime, timezone
+from uuid import UUID
+
+import pytest
+
+from facturapi import Facturapi, IdempotencyJournal
+from facturapi.codec import JSON_CODECS
+from facturapi.constants import TaxSystem
+from facturapi.exceptions import FacturapiException
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+BODY = {
+    "date": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    "tax_system": TaxSystem.GENERAL_LEY_DE_PERSONAS_MORALES,
+    "id": UUID("12345678-1234-5678-1234-567812345678"),
+    "name": "Público en General",
+}
+
+
+class TestJSONCodecs:
+    """JSON codecs tests group"""
+
+    @pytest.mark.parametrize("name", list(JSON_CODECS))
+    def test_encoded_types(self, name):
+        """Test that every codec encodes dates, enums and UUIDs the same way"""
+        body = json.loads(JSON_CODECS[name].dumps(BODY))
+
+        # Check the encoded values
+        assert body == {
+            "date": "2024-01-02T03:04:05+00:00",
+            "tax_system": "601",
+            "id": "12345678-1234-5678-1234-567812345678",
+            "name": "Público en General",
+        }
+
+    @pytest.mark.parametrize("name", list(JSON_CODECS))
+    def test_invalid_body(self, name):
+        """Test that bodies that can't be encoded raise FacturapiException"""
+        server = FakeFacturapi()
+        journal = IdempotencyJournal()
+        api = Facturapi(
+            "sk_test_codec",
+            transport=FakeTransport(server),
+            json_codec=name,
+            idempotency_journal=journal,
+        )
+
+        # Check the request is not sent and no idempotency key is left
+        with pytest.raises(FacturapiException):
+            api.invoices.create({"customer": object()})
+        assert not server.request_counts
+        assert not journal.pending()
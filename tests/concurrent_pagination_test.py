@@ -0,0 +1,91 @@
+"""Concurrent pagination tests"""
+import asyncio
+
+import pytest
+
+from facturapi import Facturapi
+from facturapi.aio import AsyncFacturapi
+from facturapi.aio.testing import AsyncFakeTransport
+from facturapi.exceptions import FacturapiException
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    """Slow fake server with 120 invoices, 12 pages of 10"""
+    server = FakeFacturapi(latency=0.01, seed=0)
+    server.populate(customers=5, products=5, invoices=120)
+    return server
+
+
+def get_ids(invoices: list) -> list:
+    """Ids of the invoices"""
+    return [invoice["id"] for invoice in invoices]
+
+
+class TestConcurrentIterAll:
+    """iter_all with max_workers tests group"""
+
+    def test_ordered(self, server):
+        """Test that parallel pages are yielded in the same order as sequential ones"""
+        api = Facturapi("sk_test_pagination", transport=FakeTransport(server))
+        expected = get_ids(api.invoices.iter_all(page_size=10))
+        server.reset_stats()
+        invoices = get_ids(api.invoices.iter_all(page_size=10, max_workers=3))
+
+        # Check the order, the pages requested and the parallelism
+        assert invoices == expected
+        assert server.request_counts["GET invoices"] == 12
+        assert 1 < server.max_in_flight <= 3
+
+    def test_unordered(self, server):
+        """Test that unordered pages yield every item once"""
+        api = Facturapi("sk_test_pagination", transport=FakeTransport(server))
+        invoices = get_ids(
+            api.invoices.iter_all(page_size=10, max_workers=4, ordered=False)
+        )
+
+        # Check the items, regardless of their order
+        assert len(invoices) == 120
+        assert set(invoices) == set(server.records["invoices"])
+
+    def test_error(self, server):
+        """Test that a failed page raises from the iterator"""
+        api = Facturapi("sk_test_pagination", transport=FakeTransport(server))
+        invoices = api.invoices.iter_all(page_size=10, max_workers=3)
+        next(invoices)
+        server.error_rate = 1
+
+        # Check the error of a later page is raised
+        with pytest.raises(FacturapiException):
+            list(invoices)
+
+
+class TestAsyncConcurrentIterAll:
+    """Async iter_all with max_concurrency tests group"""
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_max_concurrency(self, server, ordered):
+        """Test that concurrent pages yield every item with bounded concurrency"""
+        api = Facturapi("sk_test_pagination", transport=FakeTransport(server))
+        expected = get_ids(api.invoices.iter_all(page_size=10))
+        server.reset_stats()
+
+        async def main():
+            async with AsyncFacturapi(
+                "sk_test_pagination", transport=AsyncFakeTransport(server)
+            ) as api:
+                return [
+                    invoice["id"]
+                    async for invoice in api.invoices.iter_all(
+                        page_size=10, max_concurrency=3, ordered=ordered
+                    )
+                ]
+
+        invoices = asyncio.run(main())
+
+        # Check the items and the concurrency
+        if ordered:
+            assert invoices == expected
+        assert sorted(invoices) == sorted(expected)
+        assert 1 < server.max_in_flight <= 3
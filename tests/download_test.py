@@ -0,0 +1,175 @@
+"""Streaming downloads tests"""
+import asyncio
+import io
+
+import pytest
+
+from facturapi import Facturapi
+from facturapi.aio import AsyncFacturapi
+from facturapi.aio.testing import AsyncFakeTransport
+from facturapi.download import write_chunks
+from facturapi.exceptions import FacturapiException
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+
+class ClosingTransport(FakeTransport):
+    """Transport that records the responses closed by the client"""
+
+    def __init__(self, server: FakeFacturapi = None) -> None:
+        super().__init__(server)
+        self.opened = 0
+        self.closed = 0
+
+    def request(self, method, url, **kwargs):
+        response = super().request(method, url, **kwargs)
+        close = response.close
+
+        def record_close():
+            self.closed += 1
+            close()
+
+        self.opened += 1
+        response.close = record_close
+        return response
+
+
+class AsyncClosingTransport(AsyncFakeTransport):
+    """Async transport that records the responses closed by the client"""
+
+    def __init__(self, server: FakeFacturapi = None) -> None:
+        super().__init__(server)
+        self.opened = 0
+        self.closed = 0
+
+    async def request(self, method, url, **kwargs):
+        response = await super().request(method, url, **kwargs)
+        aclose = response.aclose
+
+        async def record_aclose():
+            self.closed += 1
+            await aclose()
+
+        self.opened += 1
+        response.aclose = record_aclose
+        return response
+
+
+class FailingFile(io.BytesIO):
+    """File object whose second write fails, like a full disk"""
+
+    def write(self, data):
+        if self.tell():
+            raise OSError("No space left on device")
+        return super().write(data)
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    """Fake server with an invoice of 100 KB files"""
+    server = FakeFacturapi(download_size=100 * 1024, seed=0)
+    server.populate(customers=1, products=1, invoices=1)
+    return server
+
+
+def get_invoice_id(server: FakeFacturapi) -> str:
+    """Id of the only invoice of the server"""
+    return next(iter(server.records["invoices"]))
+
+
+class TestDownload:
+    """Streaming downloads tests group"""
+
+    def test_chunks(self, server):
+        """Test that the file is yielded in chunks of at most chunk_size bytes"""
+        transport = ClosingTransport(server)
+        api = Facturapi("sk_test_download", transport=transport)
+        invoice_id = get_invoice_id(server)
+        chunks = list(api.invoices.iter_download(invoice_id, "PDF", chunk_size=30000))
+
+        # Check the chunks add up to the file and the response was closed
+        assert [len(chunk) for chunk in chunks] == [30000, 30000, 30000, 12400]
+        assert b"".join(chunks) == api.invoices.download_pdf(invoice_id)
+        assert transport.closed == 1
+
+    def test_download_to_path(self, server, tmp_path):
+        """Test that the file is written to the path and no partial file is left"""
+        api = Facturapi("sk_test_download", transport=FakeTransport(server))
+        path = tmp_path / "invoice.xml"
+        size = api.invoices.download_to(get_invoice_id(server), "xml", str(path))
+
+        # Check the written file
+        assert size == path.stat().st_size == 100 * 1024
+        assert path.read_bytes().endswith(b"</cfdi:Comprobante>")
+        assert [file.name for file in tmp_path.iterdir()] == ["invoice.xml"]
+
+    def test_write_error(self, server):
+        """Test that the response is closed when writing a chunk fails"""
+        transport = ClosingTransport(server)
+        api = Facturapi("sk_test_download", transport=transport)
+        with pytest.raises(OSError):
+            api.invoices.download_to(
+                get_invoice_id(server), "pdf", FailingFile(), chunk_size=1024
+            )
+
+        # Check the response was closed right away
+        assert transport.closed == transport.opened == 1
+
+    def test_partial_file(self, tmp_path):
+        """Test that an interrupted download to a path leaves no file"""
+
+        def chunks():
+            yield b"%PDF"
+            raise FacturapiException("Connection reset")
+
+        with pytest.raises(FacturapiException):
+            write_chunks(chunks(), str(tmp_path / "invoice.pdf"))
+
+        # Check neither the file nor the temporary file were left
+        assert not list(tmp_path.iterdir())
+
+    def test_invalid_format(self, server):
+        """Test that unsupported formats are rejected before the request"""
+        api = Facturapi("sk_test_download", transport=FakeTransport(server))
+
+        # Check the error and that nothing was requested
+        with pytest.raises(ValueError):
+            list(api.invoices.iter_download(get_invoice_id(server), "html"))
+        assert not server.request_counts
+
+
+class TestAsyncDownload:
+    """Async streaming downloads tests group"""
+
+    def test_download_to(self, server):
+        """Test that the file is written chunk by chunk and the response is closed"""
+        transport = AsyncClosingTransport(server)
+        file = io.BytesIO()
+
+        async def main():
+            async with AsyncFacturapi("sk_test_download", transport=transport) as api:
+                return await api.invoices.download_to(
+                    get_invoice_id(server), "pdf", file, chunk_size=1024
+                )
+
+        size = asyncio.run(main())
+
+        # Check the written file
+        assert size == len(file.getvalue()) == 100 * 1024
+        assert file.getvalue().startswith(b"%PDF")
+        assert transport.closed == 1
+
+    def test_write_error(self, server):
+        """Test that the response is closed when writing a chunk fails"""
+        transport = AsyncClosingTransport(server)
+
+        async def main():
+            async with AsyncFacturapi("sk_test_download", transport=transport) as api:
+                with pytest.raises(OSError):
+                    await api.invoices.download_to(
+                        get_invoice_id(server), "pdf", FailingFile(), chunk_size=1024
+                    )
+
+                # Check the response was closed right away
+                assert transport.closed == transport.opened == 1
+
+        asyncio.run(main())
@@ -0,0 +1,88 @@
+"""Export tests"""
+import csv
+import io
+
+import pytest
+
+from facturapi.export import (
+    INVOICE_ITEMS,
+    INVOICES,
+    export_csv,
+    iter_batches,
+    iter_record_batches,
+)
+
+INVOICE = {
+    "id": "invoice_1",
+    "date": "2023-06-01T18:02:33.467Z",
+    "total": 400.9,
+    "items": [
+        {
+            "quantity": 2,
+            "product": {
+                "description": "Ukelele",
+                "price": 200,
+                "taxes": [
+                    {"type": "IVA", "rate": 0.16},
+                    {"type": "ISR", "rate": 0.1, "withholding": True},
+                ],
+            },
+        },
+        {"product": "product_2"},
+    ],
+}
+
+
+class TestExport:
+    """Columnar export tests group"""
+
+    def test_flatten_items(self):
+        """Test flattening invoice items and their taxes"""
+        rows = [row for batch in iter_batches([INVOICE], INVOICE_ITEMS) for row in batch]
+        first = dict(zip(INVOICE_ITEMS.column_names, rows[0]))
+
+        # Check there is a row per item, with the tax rates as columns
+        assert len(rows) == 2
+        assert first["line"] == 1
+        assert first["iva_rate"] == 0.16
+        assert first["isr_withholding_rate"] == 0.1
+        assert first["ieps_rate"] is None
+
+    def test_batches(self):
+        """Test the rows are split in batches"""
+        batches = list(iter_batches([INVOICE] * 5, "invoices", batch_size=2))
+
+        # Check the batches are bounded by the batch size
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    def test_export_csv(self):
+        """Test exporting to CSV"""
+        file = io.StringIO()
+        total = export_csv([INVOICE] * 3, "invoices", file, batch_size=2)
+        rows = list(csv.DictReader(io.StringIO(file.getvalue())))
+
+        # Check a single header and every row are written
+        assert total == 3
+        assert len(rows) == 3
+        assert rows[0]["id"] == "invoice_1"
+        assert rows[0]["item_count"] == "2"
+
+    def test_empty_export_csv(self, tmp_path):
+        """Test that an export without records writes the header row"""
+        path = tmp_path / "invoices-{part:02d}.csv"
+        total = export_csv([], "invoices", str(path), rows_per_file=10)
+
+        # Check a single file with just the header was written
+        assert total == 0
+        assert [file.name for file in tmp_path.iterdir()] == ["invoices-01.csv"]
+        lines = (tmp_path / "invoices-01.csv").read_text(encoding="utf-8").splitlines()
+        assert lines == [",".join(INVOICES.column_names)]
+
+    def test_record_batches(self):
+        """Test converting to Arrow record batches"""
+        pytest.importorskip("pyarrow")
+        batch = next(iter_record_batches([INVOICE], "invoice_items"))
+
+        # Check the schema types are applied
+        assert batch.num_rows == 2
+        assert str(batch.schema.field("invoice_date").type) == "timestamp[ms, tz=UTC]"
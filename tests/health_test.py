@@ -0,0 +1,198 @@
+"""Health monitor and circuit breaker tests"""
+import asyncio
+import time
+
+import pytest
+
+from facturapi import CircuitBreaker, Facturapi, RetryPolicy, TokenBucket, deadline
+from facturapi.aio import AsyncFacturapi
+from facturapi.aio.testing import AsyncFakeTransport
+from facturapi.exceptions import (
+    DeadlineExceeded,
+    FacturapiException,
+    ServiceUnavailable,
+)
+from facturapi.health import CLOSED, HALF_OPEN, OPEN, HealthMonitor
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+
+class TestCircuitBreaker:
+    """Circuit breaker tests group"""
+
+    def test_fail_fast(self):
+        """Test that the circuit opens after consecutive failures and recovers after a trial"""
+        server = FakeFacturapi(error_rate=1)
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+        api = Facturapi(
+            "sk_test_health", transport=FakeTransport(server), circuit_breaker=breaker
+        )
+        for _ in range(2):
+            with pytest.raises(FacturapiException):
+                api.invoices.all()
+
+        # Check requests fail fast without reaching the API while the circuit is open
+        assert breaker.state == OPEN
+        with pytest.raises(ServiceUnavailable):
+            api.invoices.all()
+        assert server.request_counts["GET invoices"] == 2
+
+        # Check a successful trial request closes the circuit
+        time.sleep(0.05)
+        assert breaker.state == HALF_OPEN
+        server.error_rate = 0
+        api.invoices.all()
+        assert breaker.state == CLOSED
+
+    def test_client_errors(self):
+        """Test that 4xx responses don't count as failures"""
+        breaker = CircuitBreaker(failure_threshold=1)
+        api = Facturapi(
+            "sk_test_health",
+            transport=FakeTransport(FakeFacturapi()),
+            circuit_breaker=breaker,
+        )
+        with pytest.raises(FacturapiException):
+            api.customers.retrieve("missing")
+
+        # Check the circuit stays closed
+        assert breaker.state == CLOSED
+
+    def test_trial_not_sent(self):
+        """Test that a trial request that fails before being sent doesn't block the next ones"""
+        breaker = CircuitBreaker(recovery_timeout=0.05)
+        api = Facturapi(
+            "sk_test_health",
+            transport=FakeTransport(FakeFacturapi()),
+            circuit_breaker=breaker,
+        )
+        breaker.trip()
+        time.sleep(0.05)
+        with pytest.raises(DeadlineExceeded):
+            with deadline(0):
+                api.invoices.all()
+
+        # Check the trial slot is still available and a later request closes the circuit
+        assert breaker.state == HALF_OPEN
+        api.invoices.all()
+        assert breaker.state == CLOSED
+
+    def test_release(self):
+        """Test that releasing the trial request lets another one through"""
+        breaker = CircuitBreaker(recovery_timeout=0)
+        breaker.trip()
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        # Check the trial slot is given back without closing the circuit
+        breaker.release()
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request()
+
+
+class TestHealthMonitor:
+    """Health monitor tests group"""
+
+    def test_background_checks(self):
+        """Test that the monitor caches the status and drives the circuit breaker"""
+        server = FakeFacturapi()
+        breaker = CircuitBreaker(failure_threshold=2)
+        api = Facturapi(
+            "sk_test_health",
+            transport=FakeTransport(server),
+            circuit_breaker=breaker,
+            health_check_interval=60,
+        )
+        with api:
+            while api.health_status is None:
+                time.sleep(0.01)
+
+            # Check the cached status is used without requests
+            assert str(api) == "Service is ok"
+            assert api.health_status.ok and api.health_status.checked_at
+            assert server.request_counts["GET check"] == 1
+
+            # Check failed checks open the circuit at the threshold
+            server.error_rate = 1
+            assert not api.health_monitor.check().ok
+            assert breaker.state == CLOSED
+            assert not api.health_monitor.check().ok
+            assert breaker.state == OPEN
+
+            # Check a successful one closes it
+            server.error_rate = 0
+            assert api.health_monitor.check().ok
+            assert breaker.state == CLOSED
+        assert not api.health_monitor.running
+
+    @pytest.mark.parametrize("status", [401, 429])
+    def test_inconclusive_checks(self, status):
+        """Test that checks rejected by the API don't open the circuit"""
+        server = FakeFacturapi(error_rate=1, error_status=status)
+        breaker = CircuitBreaker(failure_threshold=1)
+        api = Facturapi(
+            "sk_test_health",
+            transport=FakeTransport(server),
+            circuit_breaker=breaker,
+            health_check_interval=60,
+        )
+        with api:
+            while api.health_status is None:
+                time.sleep(0.01)
+            status = api.health_monitor.check()
+
+        # Check the error is cached without marking the API down
+        assert status.ok and status.error
+        assert breaker.state == CLOSED
+
+    def test_probe_budget(self):
+        """Test that checks skip the rate limiter and the retry policy"""
+        server = FakeFacturapi(error_rate=1)
+        limiter = TokenBucket(rate=1)
+        api = Facturapi(
+            "sk_test_health",
+            transport=FakeTransport(server),
+            retry_policy=RetryPolicy(max_retries=3, backoff_factor=0),
+            rate_limiter=limiter,
+        )
+        monitor = HealthMonitor(api.healthcheck.check_status)
+
+        # Check every probe sent a single request and no token was taken
+        for _ in range(3):
+            assert not monitor.check().ok
+        assert server.request_counts["GET check"] == 3
+        assert limiter.reserve() == 0
+
+    def test_str_without_monitor(self):
+        """Test that the string of an unmonitored client doesn't send requests"""
+        server = FakeFacturapi()
+        api = Facturapi("sk_test_health", transport=FakeTransport(server))
+
+        # Check the status is unknown
+        assert str(api) == "Service status unknown"
+        assert not server.request_counts
+
+    def test_async_monitor(self):
+        """Test that the async monitor runs while the client is open"""
+        server = FakeFacturapi(error_rate=1)
+        breaker = CircuitBreaker(failure_threshold=1)
+
+        async def main():
+            api = AsyncFacturapi(
+                "sk_test_health",
+                transport=AsyncFakeTransport(server),
+                circuit_breaker=breaker,
+                health_check_interval=0.01,
+            )
+            async with api:
+                while api.health_status is None:
+                    await asyncio.sleep(0.01)
+                with pytest.raises(ServiceUnavailable):
+                    await api.invoices.all()
+            return api
+
+        api = asyncio.run(main())
+
+        # Check the failed check opened the circuit and the monitor stopped
+        assert str(api) == "Service down!"
+        assert breaker.state == OPEN
+        assert not api.health_monitor.running
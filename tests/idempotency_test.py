@@ -0,0 +1,113 @@
+"""Idempotency keys tests"""
+import json
+import time
+
+import pytest
+from requests.exceptions import ConnectionError as RequestConnectionError
+
+from facturapi import Facturapi, FileIdempotencyJournal, IdempotencyJournal
+from facturapi.exceptions import FacturapiException
+from facturapi.idempotency import get_fingerprint
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+URL = "https://www.facturapi.io/v2/invoices"
+INVOICE = {"customer": "customer_1", "items": []}
+
+
+class LostResponseTransport(FakeTransport):
+    """Transport that loses the response of the first request after the server handled it"""
+
+    lost = False
+
+    def request(self, method, url, **kwargs):
+        response = super().request(method, url, **kwargs)
+        if not self.lost:
+            self.lost = True
+            raise RequestConnectionError("Connection reset")
+        return response
+
+
+class TestIdempotencyJournal:
+    """Idempotency journal tests group"""
+
+    def test_reuse_and_complete(self):
+        """Test that in-flight keys are reused until the request is completed"""
+        journal = IdempotencyJournal()
+        fingerprint = get_fingerprint("POST", URL, INVOICE, "sk_test")
+        key = journal.begin(fingerprint)
+
+        # Check the key is reused and removed once completed
+        assert journal.begin(fingerprint) == key
+        assert journal.pending() == {fingerprint: key}
+        journal.complete(fingerprint)
+        assert journal.begin(fingerprint) != key
+
+    def test_nonce(self):
+        """Test that the nonce tells apart identical requests"""
+        fingerprint = get_fingerprint("POST", URL, INVOICE, "sk_test")
+
+        # Check the fingerprints differ only with different nonces
+        assert get_fingerprint("POST", URL, INVOICE, "sk_test", "1") != fingerprint
+        assert get_fingerprint("POST", URL, INVOICE, "sk_test", "") == fingerprint
+
+    def test_expiration(self):
+        """Test that expired keys are not reused and are removed"""
+        journal = IdempotencyJournal(ttl=0.01)
+        key = journal.begin("a")
+        time.sleep(0.02)
+
+        # Check the key is expired
+        assert not journal.pending()
+        assert journal.begin("a") != key
+        assert len(journal) == 1
+
+    def test_file_journal(self, tmp_path):
+        """Test that the file journal keeps the keys across restarts until they expire"""
+        path = str(tmp_path / "journal.json")
+        key = FileIdempotencyJournal(path).begin("a")
+
+        # Check the key is reused after a restart
+        assert FileIdempotencyJournal(path).begin("a") == key
+
+        # Check an expired key is dropped from the file
+        journal = FileIdempotencyJournal(path, ttl=0)
+        time.sleep(0.01)
+        journal.pending()
+        with open(path, encoding="utf-8") as file:
+            assert json.load(file) == {}
+
+
+class TestIdempotentRequests:
+    """Idempotent requests tests group"""
+
+    def test_create_many_duplicates(self):
+        """Test that identical payloads of a batch create one invoice each"""
+        server = FakeFacturapi(latency=0.02)
+        journal = IdempotencyJournal()
+        api = Facturapi(
+            "sk_test_idempotency",
+            transport=FakeTransport(server),
+            idempotency_journal=journal,
+        )
+        results = list(api.invoices.create_many([INVOICE] * 3, max_workers=3))
+
+        # Check every invoice was created with its own key
+        assert all(result.ok for result in results)
+        assert len({result.result["id"] for result in results}) == 3
+        assert len(server.records["invoices"]) == 3
+        assert not journal.pending()
+
+    def test_lost_response(self):
+        """Test that resending a request whose response was lost reuses its key"""
+        server = FakeFacturapi()
+        api = Facturapi(
+            "sk_test_idempotency",
+            transport=LostResponseTransport(server),
+            idempotency_journal=IdempotencyJournal(),
+        )
+        with pytest.raises(FacturapiException):
+            api.invoices.create(INVOICE)
+        invoice = api.invoices.create(INVOICE)
+
+        # Check the API answered the resent request with the first invoice
+        assert list(server.records["invoices"]) == [invoice["id"]]
@@ -0,0 +1,92 @@
+"""Incremental sync tests"""
+from datetime import datetime, timedelta, timezone
+
+from facturapi.incremental import (
+    FileWatermarkStore,
+    IncrementalSync,
+    MemorySink,
+    WatermarkStore,
+)
+from facturapi.pagination import PaginatedClientMixin
+
+START = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeClient(PaginatedClientMixin):
+    """List endpoint that returns the records from newest to oldest"""
+
+    def __init__(self) -> None:
+        self.records = []
+        self.requested_pages = 0
+
+    def add(self, record_id: str, seconds: float) -> None:
+        """Adds a record created some seconds after START"""
+        created_at = (START + timedelta(seconds=seconds)).isoformat()
+        self.records.append({"id": record_id, "created_at": created_at})
+
+    def all(self, start_date=None, page=None, limit=None):  # pylint: disable=unused-argument
+        """Returns a page of records, newest first"""
+        self.requested_pages += 1
+        records = sorted(self.records, key=lambda r: r["created_at"], reverse=True)
+        total_pages = max(1, -(-len(records) // limit))
+        data = records[(page - 1) * limit : page * limit]
+        return {"page": page, "total_pages": total_pages, "data": data}
+
+
+class TestIncrementalSync:
+    """Incremental sync tests group"""
+
+    def test_incremental_runs(self):
+        """Test that only new records are synced and boundaries are de-duplicated"""
+        client = FakeClient()
+        for number in range(120):
+            client.add(f"record_{number}", number * 10)
+        sink = MemorySink()
+        engine = IncrementalSync(WatermarkStore(), sink)
+
+        # Check the first run syncs everything
+        stats = engine.sync("records", client)
+        assert stats.inserted == 120
+        assert len(sink.records["records"]) == 120
+
+        # Check a record created at the watermark instant is synced and its twin is skipped
+        client.add("same_instant", 119 * 10)
+        client.add("new", 2000)
+        client.requested_pages = 0
+        stats = engine.sync("records", client)
+        assert (stats.inserted, stats.skipped) == (2, 1)
+        assert stats.watermark.date == START + timedelta(seconds=2000)
+
+        # Check the run stopped at the first page
+        assert client.requested_pages == 1
+
+        # Check a run without new records does nothing
+        stats = engine.sync("records", client)
+        assert (stats.inserted, stats.updated) == (0, 0)
+
+    def test_lookback(self):
+        """Test that records of the lookback period are emitted as updates"""
+        client = FakeClient()
+        for number in range(10):
+            client.add(f"record_{number}", number * 60)
+        engine = IncrementalSync(WatermarkStore(), MemorySink(), lookback=timedelta(minutes=3))
+        engine.sync("records", client)
+
+        stats = engine.sync("records", client)
+
+        # Check the last three minutes are emitted again as updates
+        assert stats.inserted == 0
+        assert stats.updated == 4
+
+    def test_file_store(self, tmp_path):
+        """Test that watermarks survive a restart"""
+        path = str(tmp_path / "watermarks.json")
+        client = FakeClient()
+        client.add("record_1", 0)
+        IncrementalSync(FileWatermarkStore(path), MemorySink()).sync("records", client)
+
+        watermark = FileWatermarkStore(path).get("records")
+
+        # Check the date and boundary ids are loaded
+        assert watermark.date == START
+        assert watermark.ids == {"record_1"}
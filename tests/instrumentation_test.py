@@ -0,0 +1,92 @@
+"""Instrumentation tests"""
+import pytest
+
+from facturapi import CircuitBreaker, Facturapi, Instrumentation, RetryPolicy, deadline
+from facturapi.exceptions import DeadlineExceeded, ServiceUnavailable
+from facturapi.instrumentation import LatencyHistogram
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+
+class TestInstrumentation:
+    """Instrumentation tests group"""
+
+    def test_hooks_and_metrics(self):
+        """Test that every attempt calls the hooks and is recorded"""
+        server = FakeFacturapi(latency=0.01, error_rate=0.5, seed=3)
+        server.populate(customers=1)
+        customer_id = next(iter(server.records["customers"]))
+        before, after = [], []
+        instrumentation = Instrumentation(before_request=[before.append])
+        instrumentation.add_after_hook(after.append)
+        api = Facturapi(
+            "sk_test_fake",
+            transport=FakeTransport(server),
+            retry_policy=RetryPolicy(max_retries=20, backoff_factor=0),
+            instrumentation=instrumentation,
+        )
+        api.customers.retrieve(customer_id)
+
+        # Check the hooks got every attempt, the last one successful
+        assert len(before) == len(after) == sum(server.request_counts.values())
+        assert [m.attempt for m in after] == list(range(len(after)))
+        assert after[-1].status_code == 200
+        assert after[-1].response_bytes > 0
+        assert after[-1].elapsed >= 0.01
+
+        # Check the registry aggregates the attempts by endpoint and method
+        histogram = instrumentation.metrics.latency[("customers", "GET")]
+        assert histogram.count == len(after)
+        error_rate = instrumentation.metrics.get_error_rate("customers", "GET")
+        assert error_rate == (len(after) - 1) / len(after)
+
+    def test_local_rejections(self):
+        """Test that requests rejected by the open circuit or the deadline are not recorded"""
+        server = FakeFacturapi()
+        before, after = [], []
+        instrumentation = Instrumentation(before_request=[before.append])
+        instrumentation.add_after_hook(after.append)
+        breaker = CircuitBreaker()
+        api = Facturapi(
+            "sk_test_fake",
+            transport=FakeTransport(server),
+            circuit_breaker=breaker,
+            instrumentation=instrumentation,
+        )
+        with pytest.raises(DeadlineExceeded):
+            with deadline(0):
+                api.invoices.all()
+        breaker.trip()
+        with pytest.raises(ServiceUnavailable):
+            api.invoices.all()
+
+        # Check nothing was sent, called the hooks or was counted
+        assert not server.request_counts
+        assert not before and not after
+        assert not instrumentation.metrics.latency
+
+    def test_prometheus(self):
+        """Test the Prometheus text format"""
+        instrumentation = Instrumentation()
+        api = Facturapi(
+            "sk_test_fake", transport=FakeTransport(), instrumentation=instrumentation
+        )
+        api.healthcheck.check_status()
+        text = instrumentation.to_prometheus()
+
+        # Check the histogram buckets, sum and count and the counters
+        labels = 'endpoint="check",method="GET"'
+        assert "# TYPE facturapi_request_duration_seconds histogram" in text
+        assert f'facturapi_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+        assert f"facturapi_request_duration_seconds_count{{{labels}}} 1" in text
+        assert f'facturapi_requests_total{{{labels},status="200"}} 1' in text
+
+    def test_histogram_quantile(self):
+        """Test the quantile estimation"""
+        histogram = LatencyHistogram(buckets=(0.1, 0.2, 0.4))
+        for value in (0.05, 0.15, 0.15, 0.3):
+            histogram.observe(value)
+
+        # Check quantiles are interpolated inside their bucket
+        assert histogram.quantile(0.5) == pytest.approx(0.15)
+        assert histogram.quantile(1) == 0.4
+        assert LatencyHistogram().quantile(0.5) is None
@@ -0,0 +1,80 @@
+"""Lazy clients and imports tests"""
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from facturapi import Facturapi, MirrorStore
+from facturapi.retentions import RetentionsClient
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+
+class TestLazyClients:
+    """Lazy clients tests group"""
+
+    def test_first_access(self):
+        """Test that the clients are created once, on first access"""
+        mirror = MirrorStore()
+        api = Facturapi(
+            "sk_test_lazy", transport=FakeTransport(FakeFacturapi()), mirror=mirror
+        )
+
+        # Check no client exists before the first access
+        assert "customers" not in vars(api)
+        customers = api.customers
+        assert api.customers is customers
+        assert customers.mirror is mirror
+        assert customers.transport is api.transport
+
+        # Check the aliases share a single client
+        assert isinstance(api.withholdings, RetentionsClient)
+        assert api.withholdings is api.retentions
+
+    def test_concurrent_access(self):
+        """Test that concurrent first accesses get the same client"""
+        api = Facturapi("sk_test_lazy", transport=FakeTransport(FakeFacturapi()))
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(lambda _: api.invoices, range(32)))
+
+        # Check a single client was created
+        assert all(client is clients[0] for client in clients)
+
+
+class TestLazyImports:
+    """Lazy imports tests group"""
+
+    def test_import(self):
+        """Test that importing the package doesn't import its modules"""
+        code = (
+            "import sys, facturapi\n"
+            "prefixes = ('facturapi.', 'dateutil')\n"
+            "print(sorted(m for m in sys.modules if m.startswith(prefixes)))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+            env={"PYTHONPATH": ":".join(sys.path)},
+        ).stdout
+
+        # Check only the lazy loader is imported
+        assert output.strip() == "['facturapi.lazy']"
+
+    def test_client_startup(self):
+        """Test that creating a client doesn't import the optional features it doesn't use"""
+        code = (
+            "import sys, facturapi\n"
+            "facturapi.Facturapi('sk_test_lazy').customers\n"
+            "modules = ('facturapi.instrumentation', 'opentelemetry', 'dateutil')\n"
+            "print(sorted(m for m in modules if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+            env={"PYTHONPATH": ":".join(sys.path)},
+        ).stdout
+
+        # Check instrumentation and dates are only imported when used
+        assert output.strip() == "[]"
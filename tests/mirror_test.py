@@ -0,0 +1,162 @@
+"""Local mirror tests"""
+import time
+
+import pytest
+
+from facturapi import Facturapi, MemoryCache
+from facturapi.exceptions import FacturapiException
+from facturapi.mirror import (
+    READ_THROUGH,
+    STALE_WHILE_REVALIDATE,
+    STRICT,
+    MirrorStore,
+)
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+CUSTOMER = {"id": "customer_1", "legal_name": "Público en General", "tax_id": "XAXX010101000"}
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    """Fake server with a customer"""
+    server = FakeFacturapi()
+    server.add(
+        "customers",
+        {
+            "legal_name": "Público en General",
+            "tax_id": "XAXX010101000",
+            "tax_system": "616",
+            "address": {"zip": "03000"},
+        },
+    )
+    return server
+
+
+def get_customer(server: FakeFacturapi) -> dict:
+    """Record of the first customer of the server"""
+    return next(iter(server.records["customers"].values()))
+
+
+def get_api(server: FakeFacturapi, mirror: MirrorStore, api_key: str = "sk_test_a"):
+    """Client of the fake server with a mirror"""
+    return Facturapi(api_key, transport=FakeTransport(server), mirror=mirror)
+
+
+class TestMirror:
+    """Local mirror tests group"""
+
+    @pytest.mark.parametrize("policy", [READ_THROUGH, STALE_WHILE_REVALIDATE, STRICT])
+    def test_miss_and_hit(self, server, policy):
+        """Test that the first retrieve is fetched and the next one is served locally"""
+        api = get_api(server, MirrorStore(policy=policy))
+        customer_id = get_customer(server)["id"]
+        api.customers.retrieve(customer_id)
+        get_customer(server)["legal_name"] = "Acme"
+
+        # Check only the first retrieve goes to the API
+        assert api.customers.retrieve(customer_id).legal_name == "Público en General"
+        assert server.request_counts["GET customers"] == 1
+
+    def test_stale_policies(self, server):
+        """Test how every policy handles stale records"""
+        customer_id = get_customer(server)["id"]
+
+        # Check read-through serves stale records
+        api = get_api(server, MirrorStore(policy=READ_THROUGH, max_age=0))
+        api.customers.retrieve(customer_id)
+        get_customer(server)["legal_name"] = "Acme 1"
+        assert api.customers.retrieve(customer_id).legal_name == "Público en General"
+        assert server.request_counts["GET customers"] == 1
+
+        # Check strict fetches stale records before returning
+        server.reset_stats()
+        api = get_api(server, MirrorStore(policy=STRICT, max_age=0))
+        api.customers.retrieve(customer_id)
+        get_customer(server)["legal_name"] = "Acme 2"
+        assert api.customers.retrieve(customer_id).legal_name == "Acme 2"
+        assert server.request_counts["GET customers"] == 2
+
+        # Check stale-while-revalidate serves the stale record and refreshes it
+        server.reset_stats()
+        mirror = MirrorStore(policy=STALE_WHILE_REVALIDATE, max_age=0)
+        api = get_api(server, mirror)
+        api.customers.retrieve(customer_id)
+        get_customer(server)["legal_name"] = "Acme 3"
+        assert api.customers.retrieve(customer_id).legal_name == "Acme 2"
+        mirror.close()
+        assert server.request_counts["GET customers"] == 2
+
+    def test_revalidation_errors(self):
+        """Test that a failed refresh keeps the stale record"""
+        mirror = MirrorStore(policy=STALE_WHILE_REVALIDATE)
+        mirror.put("customers", CUSTOMER)
+
+        def fail():
+            raise FacturapiException("Request error")
+
+        mirror.revalidate("customers", "customer_1", fail)
+        time.sleep(0.05)
+
+        # Check the record is still mirrored
+        assert mirror.get("customers", "customer_1")[0] == CUSTOMER
+
+    def test_write_through_and_search(self, server):
+        """Test that created, listed and updated records are mirrored and deleted ones removed"""
+        api = get_api(server, MirrorStore())
+        created = api.customers.create("Acme", "AAA010101AAA", "601", "03000")
+        api.customers.all()
+        api.customers.update(created.id, legal_name="Acme Updated")
+
+        # Check the records are served locally with the last changes
+        assert api.customers.retrieve(created.id).legal_name == "Acme Updated"
+        customer_id = get_customer(server)["id"]
+        assert api.customers.retrieve(customer_id).tax_id == "XAXX010101000"
+        assert server.request_counts["GET customers"] == 1
+
+        # Check searches match every word, case insensitive
+        assert api.customers.search_mirror("acme updated")[0].id == created.id
+        assert len(api.customers.search_mirror("público general")) == 1
+        assert len(api.customers.search_mirror("XAXX01")) == 1
+        assert api.customers.search_mirror("globex") == []
+
+        # Check deleted records are removed and retrieving them goes to the API
+        api.customers.delete(created.id)
+        assert api.customers.search_mirror("acme") == []
+        with pytest.raises(FacturapiException):
+            api.customers.retrieve(created.id)
+        assert server.request_counts["GET customers"] == 2
+
+    def test_api_keys(self, server):
+        """Test that clients of different API keys don't share records"""
+        mirror = MirrorStore()
+        api = get_api(server, mirror)
+        other_api = get_api(server, mirror, "sk_test_b")
+        customer_id = get_customer(server)["id"]
+        api.customers.retrieve(customer_id)
+
+        # Check the other key fetches its own record and can't search or delete the first one
+        assert not other_api.customers.search_mirror("público")
+        other_api.customers.retrieve(customer_id)
+        assert server.request_counts["GET customers"] == 2
+        other_api.customers.delete(customer_id)
+        assert not other_api.customers.search_mirror("público")
+        assert api.customers.retrieve(customer_id).id == customer_id
+        assert len(api.customers.search_mirror("público")) == 1
+        assert server.request_counts["GET customers"] == 2
+        assert len(mirror) == 1
+
+    def test_strict_skips_cache(self, server):
+        """Test that strict refreshes aren't served from the response cache"""
+        customer = get_customer(server)
+        api = Facturapi(
+            "sk_test_mirror",
+            transport=FakeTransport(server),
+            cache=MemoryCache(),
+            mirror=MirrorStore(policy=STRICT, max_age=0),
+        )
+        api.customers.retrieve(customer["id"])
+        customer["legal_name"] = "Acme Updated"
+
+        # Check the stale record is fetched from the API
+        assert api.customers.retrieve(customer["id"]).legal_name == "Acme Updated"
+        assert server.request_counts["GET customers"] == 2
@@ -0,0 +1,285 @@
+"""Models tests"""
+import pytest
+
+from facturapi.constants import PaymentForm, TaxSystem, TaxType
+from facturapi.models import (
+    CustomerList,
+    Invoice,
+    InvoiceList,
+    LazyCustomer,
+    LazyField,
+    LazyModel,
+    LazyProduct,
+    Organization,
+    OrganizationList,
+    Receipt,
+    ReceiptList,
+    Retention,
+    RetentionList,
+    build_customer,
+    build_customer_list,
+    build_invoice,
+    build_invoice_list,
+    build_organization,
+    build_organization_list,
+    build_product,
+    build_receipt,
+    build_receipt_list,
+    build_retention,
+    build_retention_list,
+)
+
+CUSTOMER = {
+    "id": "customer_1",
+    "created_at": "2023-01-01T10:00:00.000Z",
+    "livemode": False,
+    "legal_name": "PÚBLICO EN GENERAL",
+    "tax_id": "XAXX010101000",
+    "tax_system": "616",
+    "address": {"zip": "03000", "country": "MEX"},
+    "email": "customer@example.com",
+}
+
+PRODUCT = {
+    "id": "product_1",
+    "created_at": "2023-01-01T10:00:00.000Z",
+    "livemode": False,
+    "description": "Ukelele",
+    "product_key": "60131324",
+    "price": 345.6,
+    "tax_included": True,
+    "taxes": [
+        {
+            "rate": 0.16,
+            "type": "IVA",
+            "factor": "Tasa",
+            "withholding": False,
+            "ieps_mode": "sum_before_taxes",
+        }
+    ],
+    "unit_key": "H87",
+    "unit_name": "Pieza",
+    "sku": "UKE-1",
+}
+
+INVOICE = {
+    "id": "invoice_1",
+    "created_at": "2023-06-01T18:02:33.467Z",
+    "livemode": False,
+    "status": "valid",
+    "type": "I",
+    "date": "2023-06-01T18:02:33.467Z",
+    "customer": {"id": "customer_1", "legal_name": "PÚBLICO EN GENERAL"},
+    "total": 400.9,
+    "payment_form": "03",
+    "payment_method": "PUE",
+    "use": "ZZZ",
+    "series": "F",
+    "folio_number": 12,
+    "items": [{"quantity": 2, "product": PRODUCT}, {"product": "product_2"}],
+}
+
+RECEIPT = {
+    "id": "receipt_1",
+    "created_at": "2023-06-02T10:00:00.000Z",
+    "livemode": False,
+    "status": "invoiced_to_customer",
+    "date": "2023-06-02T10:00:00.000Z",
+    "total": 400.9,
+    "payment_form": "01",
+    "folio_number": 3,
+    "branch": "Centro",
+    "key": "a1b2c3d4e5",
+    "self_invoice_url": "https://factura.space/a1b2c3d4e5",
+    "invoice": {"id": "invoice_1"},
+    "items": [{"quantity": 2, "product": PRODUCT}],
+}
+
+RETENTION = {
+    "id": "retention_1",
+    "created_at": "2023-06-03T10:00:00.000Z",
+    "livemode": False,
+    "status": "valid",
+    "date": "2023-06-03T10:00:00.000Z",
+    "customer": {"id": "customer_1", "legal_name": "PÚBLICO EN GENERAL"},
+    "uuid": "8E4B5E5A-1234-5678-9ABC-DEF012345678",
+    "folio_number": 7,
+    "cancellation_status": "none",
+}
+
+ORGANIZATION = {
+    "id": "organization_1",
+    "created_at": "2023-01-01T10:00:00.000Z",
+    "is_production_ready": False,
+    "pending_steps": [{"type": "certificate"}, "customization"],
+    "legal": {
+        "name": "Ukeleles",
+        "legal_name": "UKELELES SA DE CV",
+        "tax_id": "UKE010101AAA",
+        "tax_system": "601",
+    },
+    "certificate": {"expires_at": "2027-01-01T00:00:00.000Z"},
+}
+
+
+def get_list_response(item: dict) -> dict:
+    """List response with a single item"""
+    return {"page": 1, "total_pages": 1, "total_results": 1, "data": [item]}
+
+
+class TestLazyModels:
+    """Lazy models tests group"""
+
+    def test_lazy_customer(self):
+        """Test that a lazy customer parses its fields like build_customer"""
+        customer = LazyCustomer(CUSTOMER)
+
+        # Check the raw response is wrapped, not copied
+        assert customer.raw is CUSTOMER
+
+        # Check the fields are parsed on access and memoized
+        assert "tax_system" not in vars(customer)
+        assert customer.tax_system == TaxSystem.SIN_OBLIGACIONES_FISCALES
+        assert vars(customer)["tax_system"] is customer.tax_system
+
+        # Check the eager model is the same as the one built by build_customer
+        assert customer.to_model() == build_customer(CUSTOMER)
+        assert str(customer) == CUSTOMER["legal_name"]
+
+    def test_lazy_product(self):
+        """Test that a lazy product parses its fields like build_product"""
+        product = LazyProduct(PRODUCT)
+
+        # Check taxes are parsed and missing lists default to empty
+        assert product.taxes[0].type == TaxType.IVA
+        assert product.local_taxes == []
+
+        # Check the eager model is the same as the one built by build_product
+        assert product.to_model() == build_product(PRODUCT)
+
+    def test_lazy_list(self):
+        """Test building a lazy list"""
+        response = {"page": 1, "total_pages": 1, "total_results": 2, "data": [CUSTOMER] * 2}
+        customers = build_customer_list(response, lazy=True)
+
+        # Check the list holds lazy models
+        assert isinstance(customers, CustomerList)
+        assert all(isinstance(c, LazyCustomer) for c in customers)
+        assert [c.id for c in customers] == ["customer_1", "customer_1"]
+
+    def test_missing_model(self):
+        """Test that a lazy model without an eager model can't be converted"""
+
+        class LazyNote(LazyModel):
+            """Lazy model without an eager model"""
+
+            id = LazyField()
+
+        note = LazyNote({"id": "note_1"})
+
+        # Check the fields are read and the conversion fails clearly
+        assert note.id == "note_1"
+        with pytest.raises(TypeError, match="LazyNote.model is not set"):
+            note.to_model()
+
+
+class TestDocumentModels:
+    """Invoice, receipt, retention and organization models tests group"""
+
+    def test_build_invoice(self):
+        """Test building an invoice"""
+        invoice = build_invoice(INVOICE)
+
+        # Check the fields are parsed
+        assert isinstance(invoice, Invoice)
+        assert invoice.created_at.year == 2023
+        assert invoice.customer_legal_name == "PÚBLICO EN GENERAL"
+        assert invoice.payment_form == PaymentForm.TRANSFERENCIA_ELECTRONICA_DE_FONDOS
+
+        # Check unknown codes are kept as they are
+        assert invoice.use == "ZZZ"
+
+        # Check the items, with full products and product ids
+        assert invoice.items[0].quantity == 2
+        assert invoice.items[0].taxes[0].type == TaxType.IVA
+        assert invoice.items[1].product_id == "product_2"
+
+        # Check the raw response is only kept on request
+        assert invoice.raw is None
+        assert build_invoice(INVOICE, keep_raw=True).raw is INVOICE
+
+    def test_build_invoice_list(self):
+        """Test building an invoice list"""
+        invoices = build_invoice_list(get_list_response(INVOICE), keep_raw=True)
+
+        # Check the list holds invoices with their raw response
+        assert isinstance(invoices, InvoiceList)
+        assert invoices.total_results == 1
+        assert invoices[0].raw is INVOICE
+
+    def test_build_receipt(self):
+        """Test building a receipt"""
+        receipt = build_receipt(RECEIPT)
+
+        # Check the fields are parsed
+        assert isinstance(receipt, Receipt)
+        assert receipt.date.day == 2
+        assert receipt.payment_form == PaymentForm.EFECTIVO
+        assert receipt.items[0].description == "Ukelele"
+        assert str(receipt) == "3 invoiced_to_customer"
+
+        # Check the invoice may be an object or just its id
+        assert receipt.invoice_id == "invoice_1"
+        receipt_2 = build_receipt({**RECEIPT, "invoice": "invoice_2"})
+        assert receipt_2.invoice_id == "invoice_2"
+        assert build_receipt({**RECEIPT, "invoice": None}).invoice_id is None
+
+        # Check the raw response is only kept on request
+        assert receipt.raw is None
+        assert build_receipt(RECEIPT, keep_raw=True).raw is RECEIPT
+
+    def test_build_retention(self):
+        """Test building a retention"""
+        retention = build_retention(RETENTION)
+
+        # Check the fields are parsed
+        assert isinstance(retention, Retention)
+        assert retention.customer_id == "customer_1"
+        assert retention.customer_tax_id is None
+        assert str(retention) == "7 PÚBLICO EN GENERAL"
+
+        # Check the raw response is only kept on request
+        assert retention.raw is None
+        assert build_retention(RETENTION, keep_raw=True).raw is RETENTION
+
+    def test_build_organization(self):
+        """Test building an organization"""
+        organization = build_organization(ORGANIZATION)
+
+        # Check the legal data, the pending steps and the certificate are flattened
+        assert isinstance(organization, Organization)
+        assert organization.tax_system == TaxSystem.GENERAL_LEY_DE_PERSONAS_MORALES
+        assert organization.pending_steps == ("certificate", "customization")
+        assert organization.certificate_expires_at.year == 2027
+        assert str(organization) == "UKELELES SA DE CV"
+
+        # Check missing legal data and certificate
+        organization = build_organization({"id": "organization_2"}, keep_raw=True)
+        assert organization.certificate_expires_at is None
+        assert str(organization) == "organization_2"
+        assert organization.raw == {"id": "organization_2"}
+
+    def test_build_lists(self):
+        """Test building receipt, retention and organization lists"""
+        receipts = build_receipt_list(get_list_response(RECEIPT))
+        retentions = build_retention_list(get_list_response(RETENTION), keep_raw=True)
+        organizations = build_organization_list(get_list_response(ORGANIZATION))
+
+        # Check the list classes and their items
+        assert isinstance(receipts, ReceiptList)
+        assert isinstance(retentions, RetentionList)
+        assert isinstance(organizations, OrganizationList)
+        assert receipts[0].raw is None
+        assert retentions[0].raw is RETENTION
+        assert organizations.total_results == 1
+        assert organizations[0].id == "organization_1"
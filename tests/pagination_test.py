@@ -0,0 +1,108 @@
+"""Auto-pagination tests"""
+import asyncio
+import time
+
+import pytest
+
+from facturapi import Facturapi
+from facturapi.aio import AsyncFacturapi
+from facturapi.aio.testing import AsyncFakeTransport
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    """Fake server with 120 invoices, 3 pages of 50"""
+    server = FakeFacturapi(seed=0)
+    server.populate(customers=5, products=5, invoices=120)
+    return server
+
+
+def get_newest_ids(server: FakeFacturapi) -> list:
+    """Ids of the invoices, newest first like the API lists them"""
+    records = sorted(
+        server.records["invoices"].values(), key=lambda i: i["created_at"], reverse=True
+    )
+    return [record["id"] for record in records]
+
+
+class TestIterAll:
+    """iter_all tests group"""
+
+    @pytest.mark.parametrize("prefetch", [False, True])
+    def test_all_items(self, server, prefetch):
+        """Test that every item is yielded once, in the order of the pages"""
+        api = Facturapi("sk_test_pagination", transport=FakeTransport(server))
+        invoices = list(api.invoices.iter_all(prefetch=prefetch))
+
+        # Check the items and the pages requested
+        assert [invoice["id"] for invoice in invoices] == get_newest_ids(server)
+        assert server.request_counts["GET invoices"] == 3
+
+    def test_page_size_and_search(self, server):
+        """Test that the page size and the search arguments are sent with every page"""
+        customer_id = next(iter(server.records["customers"]))
+        expected = [
+            invoice_id
+            for invoice_id in get_newest_ids(server)
+            if server.records["invoices"][invoice_id]["customer"]["id"] == customer_id
+        ]
+        api = Facturapi("sk_test_pagination", transport=FakeTransport(server))
+        invoices = list(api.invoices.iter_all(page_size=5, customer_id=customer_id))
+
+        # Check only the customer's invoices were listed, 5 per page
+        assert [invoice["id"] for invoice in invoices] == expected
+        assert server.request_counts["GET invoices"] == -(-len(expected) // 5)
+
+    def test_empty(self):
+        """Test that an empty list stops after the first page"""
+        server = FakeFacturapi()
+        api = Facturapi("sk_test_pagination", transport=FakeTransport(server))
+
+        # Check nothing is yielded
+        assert not list(api.invoices.iter_all(prefetch=True))
+        assert server.request_counts["GET invoices"] == 1
+
+    def test_prefetch(self, server):
+        """Test that the next page is requested while the current one is consumed"""
+        api = Facturapi("sk_test_pagination", transport=FakeTransport(server))
+        invoices = api.invoices.iter_all(prefetch=True)
+        next(invoices)
+        started = time.monotonic()
+        while server.request_counts["GET invoices"] < 2:
+            assert time.monotonic() - started < 1
+            time.sleep(0.001)
+
+        # Check the page after the last one is never requested
+        assert len(list(invoices)) == 119
+        assert server.request_counts["GET invoices"] == 3
+
+    def test_lazy(self, server):
+        """Test that pages are only requested when their items are needed"""
+        api = Facturapi("sk_test_pagination", transport=FakeTransport(server))
+        invoices = api.invoices.iter_all()
+        for _ in range(50):
+            next(invoices)
+
+        # Check the second page was not requested yet
+        assert server.request_counts["GET invoices"] == 1
+
+
+class TestAsyncIterAll:
+    """Async iter_all tests group"""
+
+    @pytest.mark.parametrize("prefetch", [False, True])
+    def test_all_items(self, server, prefetch):
+        """Test that every item is yielded once, in the order of the pages"""
+
+        async def main():
+            async with AsyncFacturapi(
+                "sk_test_pagination", transport=AsyncFakeTransport(server)
+            ) as api:
+                return [i async for i in api.invoices.iter_all(prefetch=prefetch)]
+
+        invoices = asyncio.run(main())
+
+        # Check the items and the pages requested
+        assert [invoice["id"] for invoice in invoices] == get_newest_ids(server)
+        assert server.request_counts["GET invoices"] == 3
@@ -0,0 +1,113 @@
+"""Rate limiting tests"""
+import multiprocessing
+import time
+
+import pytest
+
+from facturapi import Facturapi, FileTokenBucket, TokenBucket
+from facturapi.ratelimit import fcntl, get_shared_rate_limiter
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+
+def reserve_tokens(path: str) -> list:
+    """Takes 5 tokens from a file bucket of 10 tokens per second"""
+    bucket = FileTokenBucket(path, rate=10)
+    return [bucket.reserve() for _ in range(5)]
+
+
+class TestTokenBucket:
+    """Token bucket tests group"""
+
+    def test_burst(self):
+        """Test that the burst is available at once and later tokens wait for the rate"""
+        bucket = TokenBucket(rate=10, burst=3)
+        delays = [bucket.reserve() for _ in range(5)]
+
+        # Check the burst didn't wait and the debt grows 1 / rate per token
+        assert delays[:3] == [0, 0, 0]
+        assert delays[3] == pytest.approx(0.1, abs=0.01)
+        assert delays[4] == pytest.approx(0.2, abs=0.01)
+
+    def test_refill(self):
+        """Test that the bucket refills at the rate up to the burst"""
+        bucket = TokenBucket(rate=100, burst=2)
+        bucket.reserve()
+        bucket.reserve()
+        time.sleep(0.1)
+
+        # Check only the burst was refilled after the sleep
+        assert [bucket.reserve() for _ in range(2)] == [0, 0]
+        assert bucket.reserve() > 0
+
+    def test_invalid(self):
+        """Test that invalid rates and bursts are rejected"""
+        # Check the errors
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+        with pytest.raises(ValueError):
+            TokenBucket(1, burst=0)
+
+    def test_shared_limiter(self):
+        """Test that the clients of an API key share its in-process bucket"""
+        limiter = get_shared_rate_limiter("sk_test_ratelimit", 5)
+
+        # Check the same bucket is returned, ignoring the new rate
+        assert get_shared_rate_limiter("sk_test_ratelimit", 50) is limiter
+        assert limiter.rate == 5
+
+    def test_client(self):
+        """Test that the requests of a client wait for the rate limiter"""
+        server = FakeFacturapi()
+        api = Facturapi(
+            "sk_test_ratelimit",
+            transport=FakeTransport(server),
+            rate_limiter=TokenBucket(rate=50),
+        )
+        started = time.monotonic()
+        for _ in range(4):
+            api.invoices.all()
+
+        # Check 3 requests waited for a token
+        assert time.monotonic() - started >= 0.05
+        assert server.request_counts["GET invoices"] == 4
+
+
+@pytest.mark.skipif(fcntl is None, reason="FileTokenBucket requires a POSIX system")
+class TestFileTokenBucket:
+    """File token bucket tests group"""
+
+    def test_unsupported_system(self, monkeypatch, tmp_path):
+        """Test that systems without file locks are rejected"""
+        monkeypatch.setattr("facturapi.ratelimit.fcntl", None)
+
+        # Check the error
+        with pytest.raises(OSError, match="POSIX"):
+            FileTokenBucket(str(tmp_path / "bucket"), rate=1)
+
+    def test_restart(self, tmp_path):
+        """Test that the bucket state survives new instances"""
+        path = str(tmp_path / "bucket")
+        FileTokenBucket(path, rate=10).reserve()
+
+        # Check the token taken by the first instance is still missing
+        assert FileTokenBucket(path, rate=10).reserve() == pytest.approx(0.1, abs=0.01)
+
+    def test_processes(self, tmp_path):
+        """Test that processes using the same file share the bucket"""
+        path = str(tmp_path / "bucket")
+        with multiprocessing.get_context("fork").Pool(2) as pool:
+            delays = sorted(sum(pool.map(reserve_tokens, [path, path]), []))
+
+        # Check the 10 tokens were taken in turns from one bucket of 1 token
+        assert delays[0] == 0
+        assert delays[-1] == pytest.approx(0.9, abs=0.05)
+
+    def test_for_key(self, tmp_path):
+        """Test that the state file is derived from the API key"""
+        bucket = FileTokenBucket.for_key("sk_test_a", 1, directory=str(tmp_path))
+
+        # Check the same key gets the same file and another key a different one
+        same = FileTokenBucket.for_key("sk_test_a", 1, directory=str(tmp_path))
+        other = FileTokenBucket.for_key("sk_test_b", 1, directory=str(tmp_path))
+        assert same.path == bucket.path != other.path
+        assert "sk_test_a" not in bucket.path
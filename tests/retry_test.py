@@ -0,0 +1,144 @@
+"""Retry policy tests"""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from facturapi import Facturapi
+from facturapi.exceptions import FacturapiException
+from facturapi.retry import RetryPolicy
+from facturapi.testing import FakeFacturapi, FakeResponse, FakeTransport
+
+URL = "https://www.facturapi.io/v2/invoices"
+
+
+class GatewayErrorServer(FakeFacturapi):
+    """Fake server behind a gateway that answers with HTML error pages"""
+
+    def handle(self, method, url, **kwargs):
+        return FakeResponse(502, b"<html>Bad Gateway</html>", {})
+
+
+def get_response(status_code: int, retry_after: str = None) -> FakeResponse:
+    """Response with a status and an optional Retry-After header"""
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return FakeResponse(status_code, b"", headers)
+
+
+class TestRetryPolicy:
+    """Retry policy tests group"""
+
+    def test_backoff(self):
+        """Test that the delay grows exponentially up to max_backoff"""
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+
+        # Check the delays without jitter
+        delays = [policy.get_backoff(attempt) for attempt in range(5)]
+        assert delays == [0.5, 1, 2, 3, 3]
+
+    def test_jitter(self):
+        """Test that jittered delays stay between 0 and the exponential delay"""
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=3)
+
+        # Check the bounds of many random delays
+        for attempt in range(5):
+            bound = min(3, 0.5 * 2**attempt)
+            delays = [policy.get_backoff(attempt) for _ in range(100)]
+            assert all(0 <= delay <= bound for delay in delays)
+            assert len(set(delays)) > 1
+
+    def test_retry_after(self):
+        """Test that the Retry-After header sets the delay"""
+        policy = RetryPolicy(max_backoff=10, jitter=False)
+
+        # Check seconds and dates are waited as sent
+        assert policy.get_retry_delay("GET", URL, 0, get_response(429, "2")) == 2
+        assert policy.get_retry_delay("GET", URL, 0, get_response(503, "10")) == 10
+        date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=5))
+        delay = policy.get_retry_delay("GET", URL, 0, get_response(503, date))
+        assert 3 < delay <= 5
+
+        # Check waits longer than max_backoff give up instead of retrying early
+        assert policy.get_retry_delay("GET", URL, 0, get_response(503, "60")) is None
+        assert policy.stats.retries == 3
+
+        # Check the header is ignored when disabled
+        policy = RetryPolicy(jitter=False, respect_retry_after=False)
+        assert policy.get_retry_delay("GET", URL, 0, get_response(429, "2")) == 0.5
+
+    def test_methods(self):
+        """Test that POST requests are only retried when the API didn't process them"""
+        policy = RetryPolicy()
+
+        # Check server errors are retried for GET but not POST, and 429 for both
+        assert policy.get_retry_delay("GET", URL, 0, get_response(503)) is not None
+        assert policy.get_retry_delay("POST", URL, 0, get_response(503)) is None
+        assert policy.get_retry_delay("POST", URL, 0, get_response(429)) is not None
+        error = ConnectionError("reset")
+        assert policy.get_retry_delay("GET", URL, 0, error=error) is not None
+        assert policy.get_retry_delay("POST", URL, 0, error=error) is None
+
+        # Check client errors are never retried
+        assert policy.get_retry_delay("GET", URL, 0, get_response(400)) is None
+
+    def test_idempotent_posts(self):
+        """Test that POST requests with an idempotency key are retried when enabled"""
+        response = get_response(503)
+
+        # Check the key is required and the option must be enabled
+        policy = RetryPolicy(retry_idempotent_posts=True)
+        assert policy.get_retry_delay("POST", URL, 0, response, idempotency_key="a")
+        assert policy.get_retry_delay("POST", URL, 0, response) is None
+        policy = RetryPolicy()
+        delay = policy.get_retry_delay("POST", URL, 0, response, idempotency_key="a")
+        assert delay is None
+
+    def test_exhaustion(self):
+        """Test that requests are not retried after max_retries"""
+        events = []
+        policy = RetryPolicy(max_retries=2, on_retry=[events.append])
+        response = get_response(503)
+
+        # Check the hooks and stats
+        assert policy.get_retry_delay("GET", URL, 1, response) is not None
+        assert policy.get_retry_delay("GET", URL, 2, response) is None
+        assert [event.attempt for event in events] == [2]
+        assert policy.stats.retries == 1
+        assert policy.stats.exhausted == 1
+
+
+class TestRetries:
+    """Client retries tests group"""
+
+    @pytest.mark.parametrize("status", [500, 502, 503, 504])
+    def test_exhausted_server_errors(self, status):
+        """Test that server errors left after the retries raise an exception"""
+        server = FakeFacturapi(error_rate=1, error_status=status)
+        policy = RetryPolicy(max_retries=2, backoff_factor=0)
+        api = Facturapi(
+            "sk_test_retry", transport=FakeTransport(server), retry_policy=policy
+        )
+        with pytest.raises(FacturapiException, match="Injected error"):
+            api.invoices.all()
+
+        # Check the request was sent once and retried twice
+        assert server.request_counts["GET invoices"] == 3
+        assert api.invoices.last_status == status
+
+    def test_unmapped_client_error(self):
+        """Test that 4xx statuses without a specific message raise an exception"""
+        server = FakeFacturapi(error_rate=1, error_status=422)
+        api = Facturapi("sk_test_retry", transport=FakeTransport(server))
+
+        # Check the error is raised without retries
+        with pytest.raises(FacturapiException, match="Injected error"):
+            api.invoices.all()
+        assert server.request_counts["GET invoices"] == 1
+
+    def test_gateway_error_page(self):
+        """Test that error responses without a JSON body raise an exception"""
+        api = Facturapi("sk_test_retry", transport=FakeTransport(GatewayErrorServer()))
+
+        # Check the status is used as the message
+        with pytest.raises(FacturapiException, match="HTTP error 502"):
+            api.invoices.all()
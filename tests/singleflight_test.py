@@ -0,0 +1,78 @@
+"""Request coalescing tests"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from facturapi.aio.singleflight import AsyncSingleFlight
+from facturapi.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Request coalescing tests group"""
+
+    def test_concurrent_calls(self):
+        """Test that concurrent calls of the same key share a single call"""
+        group = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def function():
+            calls.append(1)
+            release.wait()
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            futures = [executor.submit(group.do, "key", function) for _ in range(10)]
+            while group.coalesced < 9:
+                pass
+            release.set()
+            results = [future.result() for future in futures]
+
+        # Check the function ran once and every caller got its result
+        assert calls == [1]
+        assert results == ["result"] * 10
+        assert len(group) == 0
+
+    def test_errors_and_forget(self):
+        """Test that errors are shared and forgotten calls are not joined"""
+        group = SingleFlight()
+        release = threading.Event()
+
+        def fail():
+            release.wait()
+            raise ValueError("Request error")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(group.do, "customers/1", fail)
+            while len(group) == 0:
+                pass
+
+            # Check calls are not joined after their key is forgotten
+            group.forget_prefix("customers/")
+            assert group.do("customers/1", lambda: "fresh") == "fresh"
+            release.set()
+
+            # Check the caller gets the exception
+            with pytest.raises(ValueError):
+                first.result()
+
+    def test_async_calls(self):
+        """Test that concurrent tasks of the same key share a single call"""
+        group = AsyncSingleFlight()
+        calls = []
+
+        async def function():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def main():
+            return await asyncio.gather(*[group.do("key", function) for _ in range(10)])
+
+        # Check the coroutine ran once and every task got its result
+        assert asyncio.run(main()) == ["result"] * 10
+        assert calls == [1]
+        assert group.coalesced == 9
+        assert len(group) == 0
@@ -0,0 +1,91 @@
+"""Fake Facturapi server tests"""
+import asyncio
+import io
+import zipfile
+
+import pytest
+
+from facturapi import Facturapi, RetryPolicy
+from facturapi.aio import AsyncFacturapi
+from facturapi.aio.testing import AsyncFakeTransport
+from facturapi.exceptions import FacturapiException
+from facturapi.models import Customer
+from facturapi.testing import FakeFacturapi, FakeTransport
+
+
+class TestFakeFacturapi:
+    """Fake Facturapi server tests group"""
+
+    def test_customers(self):
+        """Test creating, listing, updating and deleting customers offline"""
+        server = FakeFacturapi(seed=1)
+        api = Facturapi("sk_test_fake", transport=FakeTransport(server))
+        customer = api.customers.create(
+            "PÚBLICO EN GENERAL", "XAXX010101000", "616", "03000"
+        )
+
+        # Check the API models are built from the fake responses
+        assert isinstance(customer, Customer)
+        assert api.customers.retrieve(customer.id) == customer
+        assert api.customers.all(search="xaxx").total_results == 1
+
+        # Check updates and deletes
+        customer = api.customers.update(customer.id, email="a@example.com")
+        assert customer.email == "a@example.com"
+        api.customers.delete(customer.id)
+        with pytest.raises(FacturapiException):
+            api.customers.retrieve(customer.id)
+
+    def test_pagination(self):
+        """Test that list endpoints are paginated newest first"""
+        server = FakeFacturapi(max_page_size=10, seed=1)
+        server.populate(customers=5, products=3, invoices=95)
+        api = Facturapi("sk_test_fake", transport=FakeTransport(server))
+
+        # Check every invoice is returned once, in 10 pages
+        invoices = list(api.invoices.iter_all())
+        assert len({invoice["id"] for invoice in invoices}) == 95
+        assert server.request_counts["GET invoices"] == 10
+        dates = [invoice["created_at"] for invoice in invoices]
+        assert dates == sorted(dates, reverse=True)
+
+    def test_errors_and_downloads(self):
+        """Test injected errors, retries and downloads"""
+        server = FakeFacturapi(error_rate=0.5, download_size=1024, seed=1)
+        server.populate(customers=1, products=1, invoices=1)
+        invoice_id = next(iter(server.records["invoices"]))
+
+        # Check injected errors are raised without retries
+        api = Facturapi("sk_test_fake", transport=FakeTransport(server))
+        with pytest.raises(FacturapiException):
+            for _ in range(10):
+                api.invoices.download_pdf(invoice_id)
+
+        # Check retries get through and the ZIP has both files
+        retry_policy = RetryPolicy(max_retries=10, backoff_factor=0)
+        api = Facturapi(
+            "sk_test_fake", transport=FakeTransport(server), retry_policy=retry_policy
+        )
+        content = api.invoices.download_zip(invoice_id)
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            assert len(archive.namelist()) == 2
+        assert len(api.invoices.download_xml(invoice_id)) == 1024
+
+    def test_async_latency(self):
+        """Test that async requests overlap their latency"""
+        server = FakeFacturapi(latency=0.05, seed=1)
+        server.populate(products=1)
+        product_id = next(iter(server.records["products"]))
+
+        async def main():
+            api = AsyncFacturapi(
+                "sk_test_fake",
+                transport=AsyncFakeTransport(server),
+                coalesce_requests=False,
+            )
+            requests = [api.products.retrieve(product_id) for _ in range(20)]
+            await asyncio.gather(*requests)
+
+        # Check all the requests were in flight at the same time
+        asyncio.run(main())
+        assert server.max_in_flight == 20
@@ -0,0 +1,132 @@
+"""Timeouts and deadlines tests"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from facturapi import Facturapi, RetryPolicy, Timeout, deadline
+from facturapi.aio import AsyncFacturapi
+from facturapi.aio.testing import AsyncFakeTransport
+from facturapi.bulk import run_bulk
+from facturapi.exceptions import DeadlineExceeded, FacturapiException
+from facturapi.testing import FakeFacturapi, FakeTransport
+from facturapi.timeouts import get_remaining_time
+
+
+class TestTimeouts:
+    """Timeouts tests group"""
+
+    def test_endpoint_timeouts(self):
+        """Test that the most specific timeout of a request is used"""
+        api = Facturapi(
+            "sk_test_timeouts",
+            transport=FakeTransport(),
+            timeout=10,
+            timeouts={"invoices": (3, 20), "download": Timeout(5, 300)},
+        )
+        # pylint: disable=protected-access
+
+        # Check the order: download, "METHOD endpoint", endpoint and client timeout
+        assert api.customers._get_timeout("GET") == Timeout(10, 10)
+        assert api.invoices._get_timeout("GET") == Timeout(3, 20)
+        assert api.invoices._get_timeout("POST") == Timeout(5, 90)
+        assert api.invoices._get_timeout("GET", stream=True) == Timeout(5, 300)
+
+    def test_read_timeout(self):
+        """Test that a request slower than its read timeout fails"""
+        server = FakeFacturapi(latency=0.2)
+        api = Facturapi(
+            "sk_test_timeouts", transport=FakeTransport(server), timeout=(1, 0.02)
+        )
+        started = time.monotonic()
+        with pytest.raises(FacturapiException, match="timed out"):
+            api.customers.all()
+
+        # Check the request didn't wait for the response
+        assert time.monotonic() - started < 0.15
+
+
+class TestDeadline:
+    """Deadline tests group"""
+
+    def test_retries(self):
+        """Test that a deadline bounds the retries of a request"""
+        server = FakeFacturapi(error_rate=1)
+        api = Facturapi(
+            "sk_test_timeouts",
+            transport=FakeTransport(server),
+            retry_policy=RetryPolicy(max_retries=10, backoff_factor=0.02, jitter=False),
+        )
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded), deadline(0.1):
+            api.customers.all()
+
+        # Check the retries stopped before the deadline instead of sleeping past it
+        assert time.monotonic() - started < 0.1
+        assert get_remaining_time() is None
+
+    def test_nested(self):
+        """Test that nested deadlines keep the earliest one"""
+        with deadline(1):
+            with deadline(10):
+                # Check the inner deadline doesn't extend the outer one
+                assert get_remaining_time() <= 1
+
+    def test_concurrent_pages(self):
+        """Test that the pages fetched by background threads share the deadline"""
+        server = FakeFacturapi(latency=0.05, seed=0)
+        server.populate(invoices=500)
+        api = Facturapi("sk_test_timeouts", transport=FakeTransport(server))
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded), deadline(0.08):
+            list(api.invoices.iter_all(max_workers=2, page_size=10))
+
+        # Check the scan stopped at the deadline
+        assert time.monotonic() - started < 0.2
+
+    def test_bulk(self):
+        """Test that bulk calls share the deadline"""
+        api = Facturapi(
+            "sk_test_timeouts", transport=FakeTransport(FakeFacturapi(latency=0.05))
+        )
+        with deadline(0.01):
+            results = list(run_bulk(lambda _: api.customers.all(), range(4)))
+
+        # Check every call failed with the deadline
+        assert all(isinstance(result.error, DeadlineExceeded) for result in results)
+
+    def test_coalesced_requests(self):
+        """Test that concurrent identical requests with different deadlines aren't shared"""
+        server = FakeFacturapi(latency=0.1)
+        api = Facturapi("sk_test_timeouts", transport=FakeTransport(server))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(api.customers.all)
+            while not server.in_flight:
+                time.sleep(0.001)
+            started = time.monotonic()
+            with pytest.raises(DeadlineExceeded), deadline(0.02):
+                api.customers.all()
+
+            # Check the request with a deadline was sent on its own and didn't wait
+            assert time.monotonic() - started < 0.08
+            assert server.max_in_flight == 2
+            assert future.result().total_results == 0
+
+    def test_async(self):
+        """Test that a deadline shortens the timeout of async requests"""
+        server = FakeFacturapi(latency=0.2)
+
+        async def main():
+            async with AsyncFacturapi(
+                "sk_test_timeouts", transport=AsyncFakeTransport(server)
+            ) as api:
+                with deadline(0.05):
+                    await api.customers.all()
+
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(main())
+
+        # Check the request was abandoned at the deadline
+        assert time.monotonic() - started < 0.15